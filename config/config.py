@@ -10,7 +10,7 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 if getattr(sys, 'frozen', False):
@@ -31,9 +31,59 @@ DEFAULT_DB_CONFIG: Dict[str, Any] = {
     'password': '1234',  # Cambiar por tu contraseña
     'database': 'sobretiempos',  # Base de datos del sistema de asistencias
     'charset': 'utf8mb4',
-    'collation': 'utf8mb4_general_ci'
+    'collation': 'utf8mb4_general_ci',
+    'backend': 'mysql',  # 'mysql' o 'sqlite' (base local que emula los procedimientos)
+    'sqlite_path': ':memory:',  # Archivo de la base SQLite cuando backend = 'sqlite'
+    'pool_enabled': True,  # Reutilizar conexiones en lugar de conectar por cada llamada
+    'pool_size': 5,
+    'pool_idle_timeout': 300,  # Segundos antes de cerrar una conexión ociosa
+    'slow_query_ms': 1000,  # Umbral del log de consultas lentas (0 lo desactiva)
+    'slow_query_log': 'slow_queries.log',  # Relativo a la carpeta de configuración
+    'retry_attempts': 3,  # Reintentos ante errores transitorios (0 los desactiva)
+    'retry_backoff_ms': 200,  # Espera inicial; se duplica en cada reintento
+    'write_retry_policy': 'safe',  # 'never', 'safe' (solo si no llegó al servidor) o 'always'
+    'cache_enabled': True,  # Caché de lecturas invalidada por las escrituras
+    'cache_ttl': 60,  # Segundos de vida de un resultado cacheado (0 desactiva la caché)
+    'cache_max_entries': 512,
+    'cache_max_mb': 16,
+    'local_infile': False  # Importar con LOAD DATA LOCAL INFILE (requiere local_infile=ON en el servidor)
 }
 
+# Parámetros numéricos y su rango válido (mínimo, máximo)
+_INT_RANGES: Dict[str, tuple] = {
+    'port': (1, 65535),
+    'pool_size': (1, 32),
+    'pool_idle_timeout': (1, 86400),
+    'slow_query_ms': (0, 3600000),
+    'retry_attempts': (0, 10),
+    'retry_backoff_ms': (0, 60000),
+    'cache_ttl': (0, 86400),
+    'cache_max_entries': (1, 100000),
+    'cache_max_mb': (1, 1024),
+}
+
+_WRITE_RETRY_POLICIES = ('never', 'safe', 'always')
+
+# Parámetros booleanos y los textos aceptados en db_config.json editado a mano
+_BOOL_KEYS = ('pool_enabled', 'cache_enabled', 'local_infile')
+_TRUE_VALUES = frozenset({'true', '1', 'yes', 'si', 'sí'})
+_FALSE_VALUES = frozenset({'false', '0', 'no'})
+
+
+def _parse_bool(value: Any) -> Optional[bool]:
+    """Booleano de un valor de configuración, o None si no se reconoce."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+    return None
+
 
 def _normalize_config(raw_config: Dict[str, Any]) -> Dict[str, Any]:
     """Combina los valores recibidos con los predeterminados de forma segura."""
@@ -42,13 +92,22 @@ def _normalize_config(raw_config: Dict[str, Any]) -> Dict[str, Any]:
         if key not in raw_config:
             continue
         value = raw_config[key]
-        if key == 'port':
+        if key in _INT_RANGES:
+            low, high = _INT_RANGES[key]
             try:
-                port_val = int(value)
-                if 1 <= port_val <= 65535:
-                    normalized[key] = port_val
+                int_val = int(value)
+                if low <= int_val <= high:
+                    normalized[key] = int_val
             except (TypeError, ValueError):
                 continue
+        elif key in _BOOL_KEYS:
+            # bool('false') es True: solo se aceptan valores reconocibles
+            parsed = _parse_bool(value)
+            if parsed is not None:
+                normalized[key] = parsed
+        elif key == 'write_retry_policy':
+            if value in _WRITE_RETRY_POLICIES:
+                normalized[key] = value
         elif value is not None:
             normalized[key] = value
     return normalized
@@ -0,0 +1,371 @@
+"""
+Lote columnar de asistencias
+Descripción: Contenedor compacto para resultados grandes de asistencias.
+             Cada columna se guarda en un array tipado en lugar de un
+             diccionario por fila con objetos date/timedelta:
+
+             - fechas como ordinal de día (int32)
+             - turnos y marcas como segundos desde medianoche (int32, -1 = sin valor)
+             - horas como float32
+             - código de empleado, turno y día codificados con diccionario
+
+             Las filas se leen con vistas (AttendanceRowView) que ofrecen la
+             misma interfaz que los registros de RowFormat.RECORD, por lo que
+             las vistas existentes pueden consumirlas sin cambios. Con NumPy
+             instalado los filtros y ordenamientos operan sobre los arrays.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from database.attendance_keys import date_ordinal
+from database.overtime import to_seconds
+from database.row_format import ColumnBatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Columnas de sp_listar_asistencias / sp_filtrar_asistencias
+ATTENDANCE_COLUMNS: Tuple[str, ...] = (
+    'fecha_asistencia', 'codigo_empleado', 'nombre_empleado', 'codigo_turno',
+    'turno_entrada', 'turno_salida', 'dia', 'marca_entrada', 'marca_salida',
+    'horas_trabajadas', 'h25', 'h35', 'h100',
+)
+
+_TIME_COLUMNS = ('turno_entrada', 'turno_salida', 'marca_entrada', 'marca_salida')
+_HOUR_COLUMNS = ('horas_trabajadas', 'h25', 'h35', 'h100')
+_NO_TIME = -1
+
+_NUMPY_TYPES = {'i': 'int32', 'I': 'uint32', 'H': 'uint16', 'f': 'float32'}
+
+
+class AttendanceRowView:
+    """Vista de solo lectura de una fila del lote (interfaz de diccionario)."""
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: "AttendanceBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._batch.COLUMN_INDEX:
+            raise KeyError(key)
+        return self._batch.value(key, self._index)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._batch.COLUMN_INDEX:
+            return default
+        return self._batch.value(key, self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._batch.COLUMN_INDEX
+
+    def keys(self) -> Tuple[str, ...]:
+        return ATTENDANCE_COLUMNS
+
+    def values(self) -> List[Any]:
+        return [self[name] for name in ATTENDANCE_COLUMNS]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(name, self[name]) for name in ATTENDANCE_COLUMNS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"AttendanceRow({self.get('fecha_asistencia')}, {self.get('codigo_empleado')})"
+
+
+class AttendanceBatch:
+    """Asistencias en columnas tipadas; ver la descripción del módulo."""
+
+    COLUMN_INDEX = {name: index for index, name in enumerate(ATTENDANCE_COLUMNS)}
+
+    __slots__ = (
+        'fechas', 'empleados', 'turnos', 'dias',
+        'turno_entrada', 'turno_salida', 'marca_entrada', 'marca_salida',
+        'horas_trabajadas', 'h25', 'h35', 'h100',
+        'codes', 'names', 'shifts', 'days', '_code_ids', '_shift_ids', '_day_ids',
+    )
+
+    def __init__(self) -> None:
+        self.fechas = array('i')
+        self.empleados = array('I')
+        self.turnos = array('I')
+        self.dias = array('H')
+        self.turno_entrada = array('i')
+        self.turno_salida = array('i')
+        self.marca_entrada = array('i')
+        self.marca_salida = array('i')
+        self.horas_trabajadas = array('f')
+        self.h25 = array('f')
+        self.h35 = array('f')
+        self.h100 = array('f')
+        # Diccionarios: valor -> índice y los valores por índice
+        self.codes: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.shifts: List[Optional[str]] = []
+        self.days: List[Optional[str]] = []
+        self._code_ids: Dict[str, int] = {}
+        self._shift_ids: Dict[Optional[str], int] = {}
+        self._day_ids: Dict[Optional[str], int] = {}
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> "AttendanceBatch":
+        """Crea el lote desde filas tipo diccionario (dict, registros o vistas)."""
+        batch = cls()
+        batch.extend_rows(rows)
+        return batch
+
+    def extend_rows(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def extend_columns(self, columns: ColumnBatch) -> None:
+        """
+        Agrega un ColumnBatch (p.ej. un bloque de iter_procedure con
+        RowFormat.COLUMNS) pasando cada columna directamente a su array, sin
+        construir una fila por registro.
+        """
+        count = len(columns)
+
+        def source(*names: str) -> Sequence[Any]:
+            for name in names:
+                if name in columns.columns:
+                    return columns.column(name)
+            return [None] * count
+
+        names = source('nombre_empleado')
+        for codigo, nombre in zip(source('codigo_empleado'), names):
+            codigo = str(codigo or '')
+            code_id = self._code_ids.get(codigo)
+            if code_id is None:
+                code_id = self._code_ids[codigo] = len(self.codes)
+                self.codes.append(codigo)
+                self.names.append(nombre)
+            self.empleados.append(code_id)
+        self.fechas.extend(date_ordinal(value) or 0 for value in source('fecha_asistencia', 'fecha'))
+        self.turnos.extend(self._encode(self._shift_ids, self.shifts, value) for value in source('codigo_turno'))
+        self.dias.extend(self._encode(self._day_ids, self.days, value) for value in source('dia'))
+        for name in _TIME_COLUMNS:
+            getattr(self, name).extend(
+                _NO_TIME if seconds is None else seconds for seconds in map(to_seconds, source(name))
+            )
+        for name in _HOUR_COLUMNS:
+            getattr(self, name).extend(float(value or 0) for value in source(name))
+
+    def append(self, row: Any) -> None:
+        get = row.get
+        codigo = str(get('codigo_empleado') or '')
+        code_id = self._code_ids.get(codigo)
+        if code_id is None:
+            code_id = self._code_ids[codigo] = len(self.codes)
+            self.codes.append(codigo)
+            self.names.append(get('nombre_empleado'))
+        self.fechas.append(date_ordinal(get('fecha_asistencia') or get('fecha')) or 0)
+        self.empleados.append(code_id)
+        self.turnos.append(self._encode(self._shift_ids, self.shifts, get('codigo_turno')))
+        self.dias.append(self._encode(self._day_ids, self.days, get('dia')))
+        for name in _TIME_COLUMNS:
+            seconds = to_seconds(get(name))
+            getattr(self, name).append(_NO_TIME if seconds is None else seconds)
+        for name in _HOUR_COLUMNS:
+            getattr(self, name).append(float(get(name) or 0))
+
+    @staticmethod
+    def _encode(ids: Dict[Optional[str], int], values: List[Optional[str]], value: Any) -> int:
+        value = None if value is None else str(value)
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(values)
+            values.append(value)
+        return index
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.fechas)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[AttendanceRowView, "AttendanceBatch"]:
+        if isinstance(item, slice):
+            return self.take(range(*item.indices(len(self))))
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError(item)
+        return AttendanceRowView(self, item)
+
+    def __iter__(self) -> Iterator[AttendanceRowView]:
+        for index in range(len(self)):
+            yield AttendanceRowView(self, index)
+
+    def value(self, column: str, index: int) -> Any:
+        """Valor decodificado de una celda, con los tipos del conector MySQL."""
+        if column == 'fecha_asistencia':
+            ordinal = self.fechas[index]
+            return date.fromordinal(ordinal) if ordinal else None
+        if column == 'codigo_empleado':
+            return self.codes[self.empleados[index]]
+        if column == 'nombre_empleado':
+            return self.names[self.empleados[index]]
+        if column == 'codigo_turno':
+            return self.shifts[self.turnos[index]]
+        if column == 'dia':
+            return self.days[self.dias[index]]
+        if column in _TIME_COLUMNS:
+            seconds = getattr(self, column)[index]
+            return None if seconds == _NO_TIME else timedelta(seconds=seconds)
+        if column in _HOUR_COLUMNS:
+            return round(getattr(self, column)[index], 2)
+        raise KeyError(column)
+
+    def column(self, name: str) -> List[Any]:
+        """Columna completa decodificada."""
+        return [self.value(name, index) for index in range(len(self))]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [row.to_dict() for row in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Tamaño aproximado en memoria de las columnas y los diccionarios."""
+        total = sum(
+            getattr(self, name).buffer_info()[1] * getattr(self, name).itemsize
+            for name in ('fechas', 'empleados', 'turnos', 'dias') + _TIME_COLUMNS + _HOUR_COLUMNS
+        )
+        for values in (self.codes, self.names, self.shifts, self.days):
+            total += sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values if value is not None)
+        return total
+
+    def totals(self) -> Dict[str, float]:
+        """Suma de horas trabajadas y extras del lote."""
+        return {name: round(sum(getattr(self, name)), 2) for name in _HOUR_COLUMNS}
+
+    # ------------------------------------------------------------------
+    # Selección, filtros y orden
+    # ------------------------------------------------------------------
+    def take(self, indexes: Iterable[int]) -> "AttendanceBatch":
+        """Nuevo lote con las filas indicadas (comparte los diccionarios)."""
+        indexes = list(indexes)
+        batch = AttendanceBatch.__new__(AttendanceBatch)
+        positions = np.asarray(indexes, dtype=np.intp) if np is not None else None
+        for name in ('fechas', 'empleados', 'turnos', 'dias') + _TIME_COLUMNS + _HOUR_COLUMNS:
+            source = getattr(self, name)
+            if positions is not None and len(source):
+                target = array(source.typecode)
+                target.frombytes(self.as_numpy(name)[positions].tobytes())
+            else:
+                target = array(source.typecode, [source[index] for index in indexes])
+            setattr(batch, name, target)
+        for name in ('codes', 'names', 'shifts', 'days', '_code_ids', '_shift_ids', '_day_ids'):
+            setattr(batch, name, getattr(self, name))
+        return batch
+
+    def filter(self, condition: Union[Callable[[AttendanceRowView], bool], Sequence[bool]]) -> "AttendanceBatch":
+        """Filtra con una función sobre cada fila o con una máscara booleana."""
+        if callable(condition):
+            return self.take(index for index, row in enumerate(self) if condition(row))
+        if len(condition) != len(self):
+            raise ValueError("La máscara debe tener una posición por fila")
+        return self.take(index for index, keep in enumerate(condition) if keep)
+
+    def where(self, fecha_inicio: Any = None, fecha_fin: Any = None,
+              codigo_empleado: Optional[str] = None,
+              incomplete: Optional[bool] = None) -> "AttendanceBatch":
+        """
+        Filtra por rango de fechas, empleado y/o marcas incompletas comparando
+        directamente los arrays codificados.
+        """
+        start = date_ordinal(fecha_inicio) if fecha_inicio else None
+        end = date_ordinal(fecha_fin) if fecha_fin else None
+        code_id = None
+        if codigo_empleado is not None:
+            code_id = self._code_ids.get(str(codigo_empleado))
+            if code_id is None:
+                return self.take(())
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            fechas = self.as_numpy('fechas')
+            if start is not None:
+                mask &= fechas >= start
+            if end is not None:
+                mask &= fechas <= end
+            if code_id is not None:
+                mask &= self.as_numpy('empleados') == code_id
+            if incomplete is not None:
+                missing = (self.as_numpy('marca_entrada') == _NO_TIME) | (self.as_numpy('marca_salida') == _NO_TIME)
+                mask &= missing if incomplete else ~missing
+            return self.take(np.flatnonzero(mask).tolist())
+
+        def keep(index: int) -> bool:
+            fecha = self.fechas[index]
+            if start is not None and fecha < start:
+                return False
+            if end is not None and fecha > end:
+                return False
+            if code_id is not None and self.empleados[index] != code_id:
+                return False
+            if incomplete is not None:
+                missing = self.marca_entrada[index] == _NO_TIME or self.marca_salida[index] == _NO_TIME
+                return missing == incomplete
+            return True
+
+        return self.take(index for index in range(len(self)) if keep(index))
+
+    def sort_by(self, *columns: str, reverse: bool = False) -> "AttendanceBatch":
+        """
+        Nuevo lote ordenado por una o más columnas (por defecto fecha y
+        empleado). Las columnas codificadas se ordenan por su valor, no por
+        el índice del diccionario.
+        """
+        columns = columns or ('fecha_asistencia', 'codigo_empleado')
+        keys = [self._sort_key(name) for name in columns]
+        if np is not None:
+            # lexsort usa la última clave como principal
+            order = np.lexsort([np.asarray(key) for key in reversed(keys)])
+            if reverse:
+                order = order[::-1]
+            return self.take(order.tolist())
+        order = sorted(range(len(self)), key=lambda index: tuple(key[index] for key in keys), reverse=reverse)
+        return self.take(order)
+
+    def _sort_key(self, column: str) -> Sequence[Any]:
+        if column == 'fecha_asistencia':
+            return self.fechas
+        if column in ('codigo_empleado', 'nombre_empleado', 'codigo_turno', 'dia'):
+            source, codes = {
+                'codigo_empleado': (self.empleados, self.codes),
+                'nombre_empleado': (self.empleados, self.names),
+                'codigo_turno': (self.turnos, self.shifts),
+                'dia': (self.dias, self.days),
+            }[column]
+            # Rango de cada valor del diccionario en orden alfabético
+            ranking = {index: rank for rank, index in
+                       enumerate(sorted(range(len(codes)), key=lambda i: codes[i] or ''))}
+            return [ranking[value] for value in source]
+        if column in _TIME_COLUMNS or column in _HOUR_COLUMNS:
+            return getattr(self, column)
+        raise KeyError(column)
+
+    def as_numpy(self, name: str) -> Any:
+        """Vista NumPy (sin copia) de una columna interna, p.ej. 'fechas' o 'h25'."""
+        if np is None:
+            raise RuntimeError("NumPy no está instalado")
+        source = getattr(self, name)
+        return np.frombuffer(source, dtype=_NUMPY_TYPES[source.typecode]) if len(source) else \
+            np.zeros(0, dtype=_NUMPY_TYPES[source.typecode])
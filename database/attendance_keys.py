@@ -0,0 +1,87 @@
+"""
+Conjunto compacto de claves de asistencia
+Descripción: Guarda claves (fecha, codigo_empleado) empaquetadas en un solo
+             entero: el ordinal de la fecha en los bits altos y un índice
+             interno del código de empleado en los 24 bits bajos. Un entero
+             ocupa menos de la mitad que una tupla de dos cadenas, por lo que
+             las claves existentes de un periodo completo caben en memoria
+             para descartar duplicados antes de escribir.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_CODE_BITS = 24
+_CODE_MASK = (1 << _CODE_BITS) - 1
+
+
+def date_ordinal(fecha: Any) -> Optional[int]:
+    """Ordinal de una fecha (date, datetime o texto 'YYYY-MM-DD'); None si no es válida."""
+    if isinstance(fecha, datetime):
+        return fecha.date().toordinal()
+    if isinstance(fecha, date):
+        return fecha.toordinal()
+    if not fecha:
+        return None
+    try:
+        return date.fromisoformat(str(fecha)[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+class AttendanceKeySet:
+    """Conjunto de claves (fecha, codigo_empleado) empaquetadas como enteros."""
+
+    __slots__ = ('_keys', '_codes', '_names')
+
+    def __init__(self, keys: Iterable[Tuple[Any, Any]] = ()):
+        self._keys: Set[int] = set()
+        self._codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        for fecha, codigo in keys:
+            self.add(fecha, codigo)
+
+    def _code_id(self, codigo: Any, create: bool) -> Optional[int]:
+        codigo = str(codigo)
+        code_id = self._codes.get(codigo)
+        if code_id is None and create:
+            code_id = len(self._names)
+            if code_id > _CODE_MASK:
+                raise OverflowError("Demasiados códigos de empleado distintos")
+            self._codes[codigo] = code_id
+            self._names.append(codigo)
+        return code_id
+
+    def pack(self, fecha: Any, codigo: Any, create: bool = False) -> Optional[int]:
+        """Clave empaquetada, o None si la fecha no es válida o el código no se conoce."""
+        ordinal = date_ordinal(fecha)
+        if ordinal is None:
+            return None
+        code_id = self._code_id(codigo, create)
+        if code_id is None:
+            return None
+        return (ordinal << _CODE_BITS) | code_id
+
+    def add(self, fecha: Any, codigo: Any) -> bool:
+        """Agrega una clave. Retorna False si ya estaba (o la fecha no es válida)."""
+        key = self.pack(fecha, codigo, create=True)
+        if key is None or key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def contains(self, fecha: Any, codigo: Any) -> bool:
+        key = self.pack(fecha, codigo)
+        return key is not None and key in self._keys
+
+    def __contains__(self, item: Tuple[Any, Any]) -> bool:
+        return self.contains(*item)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for key in self._keys:
+            yield date.fromordinal(key >> _CODE_BITS).isoformat(), self._names[key & _CODE_MASK]
@@ -1,12 +1,62 @@
 """Servicio para gestión de asistencias respaldado por procedimientos almacenados."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Sequence, Set, Tuple, Union
+import csv
+import os
+import tempfile
+from database.attendance_batch import AttendanceBatch
+from database.attendance_keys import AttendanceKeySet
+from database.batch_result import RangeDeleteSummary, RecomputeSummary, RowStatus, UpsertSummary
+from database.change_sync import ChangeSet, query_since
 from database.database import DatabaseConnection
+from database.overtime import OvertimeBatch, compute_overtime
 from database.operation_result import OperationResult, OperationStatus
+from database.pagination import Page, decode_token, encode_token
+from database.row_format import RowFormat
 import logging
 
 logger = logging.getLogger(__name__)
 
+AttendanceKey = Tuple[str, str]
+
+# Columnas de una asistencia en el orden de sp_insertar_asistencia
+ATTENDANCE_FIELDS = ('fecha', 'codigo_empleado', 'codigo_turno', 'dia', 'marca_entrada', 'marca_salida')
+
+_INSERT_ATTENDANCE_SQL = (
+    "INSERT INTO reporte_asistencia "
+    "(fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+
+ON_CONFLICT_MODES = ('skip', 'update', 'error')
+
+# Carga a la tabla de paso (ver database/sql/carga_masiva_asistencias.sql).
+# Los campos vacíos del CSV se guardan como NULL.
+_LOAD_STAGING_SQL = (
+    "LOAD DATA LOCAL INFILE %s INTO TABLE carga_asistencia "
+    "CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+    "LINES TERMINATED BY '\\n' "
+    "(linea, @fecha, @codigo, @turno, @dia, @entrada, @salida) "
+    "SET id_carga = CONNECTION_ID(), "
+    "fecha = NULLIF(@fecha, ''), "
+    "codigo_empleado = NULLIF(@codigo, ''), "
+    "codigo_turno = NULLIF(@turno, ''), "
+    "dia = @dia, "
+    "marca_entrada = NULLIF(@entrada, ''), "
+    "marca_salida = NULLIF(@salida, '')"
+)
+
+# Estado de una línea de la carga que no se insertó -> estado de la fila
+_STAGING_STATUS = {
+    'R': RowStatus.INVALID,
+    'D': RowStatus.SKIPPED,
+    'E': RowStatus.SKIPPED,
+}
+
+# Avance de un proceso por lotes: (filas procesadas, total)
+ProgressCallback = Callable[[int, int], None]
+
 
 class AttendanceService:
     """Servicio para operaciones CRUD de asistencias mediante procedimientos almacenados"""
@@ -20,15 +70,19 @@ class AttendanceService:
         """
         self.db = db_connection
     
-    def get_all_attendance(self) -> Optional[List[Dict[str, Any]]]:
+    def get_all_attendance(self) -> Optional[List[Any]]:
         """
         Obtiene todos los registros de asistencia.
+        Las filas son registros compactos (RowFormat.RECORD) que se leen igual
+        que un diccionario: att.get('campo') o att['campo'].
         
         Returns:
             Lista de asistencias o None si hay error
         """
         try:
-            success, message, results = self.db.execute_procedure("sp_listar_asistencias")
+            success, message, results = self.db.execute_procedure(
+                "sp_listar_asistencias", row_format=RowFormat.RECORD
+            )
             if success:
                 return results
             logger.error(f"Error al listar asistencias: {message}")
@@ -40,9 +94,10 @@ class AttendanceService:
     def filter_attendance(self, search_term: Optional[str] = None,
                          fecha_inicio: Optional[str] = None,
                          fecha_fin: Optional[str] = None,
-                         codigo_empleado: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+                         codigo_empleado: Optional[str] = None) -> Optional[List[Any]]:
         """
         Filtra registros de asistencia según criterios.
+        Las filas se entregan como registros compactos (RowFormat.RECORD).
         
         Args:
             search_term: Término de búsqueda (código o nombre)
@@ -60,7 +115,9 @@ class AttendanceService:
                 fecha_fin,
                 codigo_empleado,
             )
-            success, message, results = self.db.execute_procedure("sp_filtrar_asistencias", params)
+            success, message, results = self.db.execute_procedure(
+                "sp_filtrar_asistencias", params, row_format=RowFormat.RECORD
+            )
             if success:
                 return results
             logger.error(f"Error al filtrar asistencias: {message}")
@@ -69,6 +126,180 @@ class AttendanceService:
             logger.error(f"Excepción al filtrar asistencias: {str(e)}")
             return None
     
+    def summarize(self, search_term: Optional[str] = None,
+                  fecha_inicio: Optional[str] = None,
+                  fecha_fin: Optional[str] = None,
+                  codigo_empleado: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Resume las asistencias que cumplen los mismos criterios que
+        filter_attendance sin transferir las filas: el servidor agrega con
+        sp_reporte_resumen_asistencias y devuelve una sola fila.
+        
+        Args:
+            search_term: Término de búsqueda (código o nombre)
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD)
+            fecha_fin: Fecha de fin (YYYY-MM-DD)
+            codigo_empleado: Código de empleado específico
+            
+        Returns:
+            Diccionario con registros, empleados, h25, h35, h100 y
+            marcas_incompletas, o None si hay error
+        """
+        try:
+            params = (
+                f"%{search_term}%" if search_term else None,
+                fecha_inicio,
+                fecha_fin,
+                codigo_empleado,
+            )
+            success, message, results = self.db.execute_procedure("sp_reporte_resumen_asistencias", params)
+            if not success:
+                logger.error(f"Error al resumir asistencias: {message}")
+                return None
+            row = results[0] if results else {}
+            return {
+                'registros': int(row.get('registros') or 0),
+                'empleados': int(row.get('empleados') or 0),
+                'h25': round(float(row.get('h25') or 0), 2),
+                'h35': round(float(row.get('h35') or 0), 2),
+                'h100': round(float(row.get('h100') or 0), 2),
+                'marcas_incompletas': int(row.get('marcas_incompletas') or 0),
+            }
+        except Exception as e:
+            logger.error(f"Excepción al resumir asistencias: {str(e)}")
+            return None
+    
+    def get_attendance_page(self, page_size: int = 200, token: Optional[str] = None,
+                            search_term: Optional[str] = None,
+                            fecha_inicio: Optional[str] = None,
+                            fecha_fin: Optional[str] = None,
+                            codigo_empleado: Optional[str] = None) -> Optional[Page]:
+        """
+        Obtiene una página de asistencias ordenadas por la clave primaria
+        descendente (fecha y código). La página siguiente se busca a partir
+        de la clave de la última fila recorriendo el índice, por lo que
+        cualquier página cuesta lo mismo que la primera.
+        
+        Args:
+            page_size: Filas por página
+            token: Token de continuación de la página anterior (None = primera)
+            search_term: Término de búsqueda (código o nombre)
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD)
+            fecha_fin: Fecha de fin (YYYY-MM-DD)
+            codigo_empleado: Código de empleado específico
+            
+        Returns:
+            Page con las filas y el token de la siguiente, o None si hay error
+        """
+        try:
+            page_size = max(1, int(page_size))
+            cursor_fecha, cursor_codigo = decode_token(token)
+            params = (
+                f"%{search_term}%" if search_term else None,
+                fecha_inicio,
+                fecha_fin,
+                codigo_empleado,
+                cursor_fecha,
+                cursor_codigo,
+                page_size + 1,  # Una fila extra indica si hay más páginas
+            )
+            success, message, results = self.db.execute_procedure(
+                "sp_listar_asistencias_pagina", params, row_format=RowFormat.RECORD
+            )
+            if not success:
+                logger.error(f"Error al paginar asistencias: {message}")
+                return None
+            rows = list(results[:page_size])
+            next_token = None
+            if len(results) > page_size:
+                last = rows[-1]
+                next_token = encode_token(last.get('fecha_asistencia'), last.get('codigo_empleado'))
+            return Page(rows, next_token)
+        except Exception as e:
+            logger.error(f"Excepción al paginar asistencias: {str(e)}")
+            return None
+
+    def iter_all_attendance(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre todos los registros de asistencia a medida que llegan del servidor,
+        sin cargar el historial completo en memoria.
+        
+        Args:
+            batch_size: Filas leídas por cada viaje al servidor
+            
+        Yields:
+            Cada registro de asistencia
+            
+        Raises:
+            Error: Si falla la conexión o el procedimiento
+        """
+        return self.db.iter_procedure("sp_listar_asistencias", batch_size=batch_size)
+
+    def iter_filtered_attendance(self, search_term: Optional[str] = None,
+                                 fecha_inicio: Optional[str] = None,
+                                 fecha_fin: Optional[str] = None,
+                                 codigo_empleado: Optional[str] = None,
+                                 batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Versión en streaming de filter_attendance.
+        
+        Args:
+            search_term: Término de búsqueda (código o nombre)
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD)
+            fecha_fin: Fecha de fin (YYYY-MM-DD)
+            codigo_empleado: Código de empleado específico
+            batch_size: Filas leídas por cada viaje al servidor
+            
+        Yields:
+            Cada registro de asistencia que cumple el filtro
+            
+        Raises:
+            Error: Si falla la conexión o el procedimiento
+        """
+        params = (
+            f"%{search_term}%" if search_term else None,
+            fecha_inicio,
+            fecha_fin,
+            codigo_empleado,
+        )
+        return self.db.iter_procedure("sp_filtrar_asistencias", params, batch_size=batch_size)
+    
+    def get_attendance_batch(self, search_term: Optional[str] = None,
+                             fecha_inicio: Optional[str] = None,
+                             fecha_fin: Optional[str] = None,
+                             codigo_empleado: Optional[str] = None,
+                             batch_size: int = 5000) -> Optional[AttendanceBatch]:
+        """
+        Igual que filter_attendance, pero el resultado se lee en streaming
+        hacia un AttendanceBatch columnar, varias veces más pequeño que la
+        lista de diccionarios para periodos grandes.
+        
+        Args:
+            search_term: Término de búsqueda (código o nombre)
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD)
+            fecha_fin: Fecha de fin (YYYY-MM-DD)
+            codigo_empleado: Código de empleado específico
+            batch_size: Filas leídas por cada viaje al servidor
+            
+        Returns:
+            AttendanceBatch con las asistencias o None si hay error
+        """
+        params = (
+            f"%{search_term}%" if search_term else None,
+            fecha_inicio,
+            fecha_fin,
+            codigo_empleado,
+        )
+        batch = AttendanceBatch()
+        try:
+            for columns in self.db.iter_procedure("sp_filtrar_asistencias", params,
+                                                  batch_size=batch_size, row_format=RowFormat.COLUMNS):
+                batch.extend_columns(columns)
+        except Exception as e:
+            logger.error(f"Excepción al cargar el lote de asistencias: {str(e)}")
+            return None
+        return batch
+    
     def create_attendance(
         self,
         fecha: str,
@@ -174,6 +405,532 @@ class AttendanceService:
             logger.error(error_msg)
             return OperationResult.failure(OperationStatus.ERROR, error_msg)
 
+    def bulk_upsert_attendance(self, records: Sequence[Union[Dict[str, Any], Sequence[Any]]],
+                               on_conflict: str = 'skip',
+                               chunk_size: int = 1000,
+                               employee_codes: Optional[Set[str]] = None) -> UpsertSummary:
+        """
+        Registra muchas asistencias con INSERT multi-fila (un round trip por
+        bloque) en lugar de una llamada a sp_insertar_asistencia por fila.
+        Las horas extras las sigue calculando el trigger de inserción: en modo
+        'update' las filas existentes se eliminan y se vuelven a insertar en
+        la misma transacción para que el trigger las recalcule.
+        
+        Args:
+            records: Diccionarios con las claves de ATTENDANCE_FIELDS o tuplas en ese orden
+            on_conflict: 'skip' conserva las existentes, 'update' las reemplaza y
+                'error' las reporta como duplicadas
+            chunk_size: Filas por sentencia
+            employee_codes: Códigos de empleado válidos ya consultados (ver
+                get_employee_codes); None los consulta en cada llamada
+            
+        Returns:
+            UpsertSummary con un estado por fila de entrada
+            
+        Raises:
+            ValueError: Si on_conflict no es válido
+        """
+        if on_conflict not in ON_CONFLICT_MODES:
+            raise ValueError(f"on_conflict debe ser uno de {ON_CONFLICT_MODES}, no {on_conflict!r}")
+
+        rows = [self._normalize_attendance_record(record) for record in records]
+        summary = UpsertSummary.pending(len(rows))
+        if not rows:
+            return summary
+
+        # 1. Validar datos mínimos y que el empleado exista
+        employees = employee_codes if employee_codes is not None else self.get_employee_codes()
+        candidates: Dict[AttendanceKey, int] = {}
+        for index, row in enumerate(rows):
+            fecha, codigo, turno = row[0], row[1], row[2]
+            if not fecha or not codigo or not turno:
+                summary.mark(index, RowStatus.INVALID, "Faltan fecha, código de empleado o turno")
+                continue
+            if employees is not None and codigo not in employees:
+                summary.mark(index, RowStatus.INVALID, f"No se encontró el empleado {codigo}")
+                continue
+            key = (fecha, codigo)
+            previous = candidates.get(key)
+            if previous is not None:
+                # Clave repetida en la misma carga: en 'update' gana la última
+                if on_conflict == 'update':
+                    summary.mark(previous, RowStatus.SKIPPED, "Reemplazada por una fila posterior de la carga")
+                else:
+                    summary.mark(index, RowStatus.SKIPPED if on_conflict == 'skip' else RowStatus.DUPLICATE,
+                                 "Fila repetida en la carga")
+                    continue
+            candidates[key] = index
+
+        # 2. Separar las claves que ya existen en la base
+        existing = AttendanceKeySet()
+        if candidates:
+            try:
+                existing = self.prefetch_attendance_keys(
+                    min(key[0] for key in candidates),
+                    max(key[0] for key in candidates),
+                    {key[1] for key in candidates},
+                )
+            except RuntimeError as e:
+                # Sin las claves existentes no se sabe qué filas insertar
+                logger.error(f"Error en la carga masiva de asistencias: {str(e)}")
+                for index in candidates.values():
+                    summary.mark(index, RowStatus.FAILED, str(e))
+                return summary
+        to_insert: List[int] = []
+        to_replace: List[int] = []
+        for key, index in candidates.items():
+            if not existing.contains(*key):
+                to_insert.append(index)
+            elif on_conflict == 'update':
+                to_replace.append(index)
+            elif on_conflict == 'skip':
+                summary.mark(index, RowStatus.SKIPPED)
+            else:
+                summary.mark(index, RowStatus.DUPLICATE,
+                             "Ya existe una asistencia con la misma fecha para este empleado.")
+
+        # 3. Escribir por bloques
+        chunk_size = max(1, int(chunk_size))
+        for start in range(0, len(to_insert), chunk_size):
+            self._insert_attendance_chunk(rows, to_insert[start:start + chunk_size], summary,
+                                          RowStatus.INSERTED, isolate_errors=True)
+        for start in range(0, len(to_replace), chunk_size):
+            self._replace_attendance_chunk(rows, to_replace[start:start + chunk_size], summary)
+
+        logger.info(f"Carga masiva de asistencias ({on_conflict}): {summary.counts()}")
+        return summary
+
+    def load_attendance_staged(self, records: Sequence[Union[Dict[str, Any], Sequence[Any]]],
+                               employee_codes: Optional[Set[str]] = None) -> UpsertSummary:
+        """
+        Registra muchas asistencias en el servidor: las filas se escriben en
+        un CSV temporal, se suben con LOAD DATA LOCAL INFILE a la tabla de paso
+        y sp_fusionar_carga_asistencias las valida e inserta las nuevas con un
+        INSERT ... SELECT (ver database/sql/carga_masiva_asistencias.sql); las
+        horas extras las calcula el trigger de inserción. Las filas ya
+        registradas o repetidas en la carga se conservan como en
+        bulk_upsert_attendance con on_conflict='skip'.
+        
+        Si la conexión no admite LOAD DATA LOCAL INFILE (ver
+        DatabaseConnection.supports_local_infile) se usa bulk_upsert_attendance.
+        
+        Args:
+            records: Diccionarios con las claves de ATTENDANCE_FIELDS o tuplas en ese orden
+            employee_codes: Solo para el camino alternativo (ver bulk_upsert_attendance);
+                en el servidor los empleados se validan con un JOIN
+            
+        Returns:
+            UpsertSummary con un estado por fila de entrada
+        """
+        if not self.db.supports_local_infile:
+            return self.bulk_upsert_attendance(records, on_conflict='skip', employee_codes=employee_codes)
+
+        rows = [self._normalize_attendance_record(record) for record in records]
+        summary = UpsertSummary.pending(len(rows))
+        if not rows:
+            return summary
+
+        path = None
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.csv',
+                                             prefix='carga_asistencia_', delete=False) as handle:
+                path = handle.name
+                writer = csv.writer(handle, lineterminator='\n')
+                writer.writerows((index, *row) for index, row in enumerate(rows))
+
+            with self.db.transaction() as tx:
+                # Restos de una carga interrumpida con el mismo id de conexión
+                success, message, _ = self.db.execute_delete(
+                    "DELETE FROM carga_asistencia WHERE id_carga = CONNECTION_ID()"
+                )
+                if success:
+                    success, message, loaded = self.db.execute_update(_LOAD_STAGING_SQL, (path,))
+                    if success and loaded != len(rows):
+                        success, message = False, f"Se cargaron {loaded} de {len(rows)} filas en la tabla de paso"
+                if success:
+                    success, message, rejected = self.db.execute_procedure("sp_fusionar_carga_asistencias")
+                if not success:
+                    tx.set_rollback_only()
+                    for index in range(len(rows)):
+                        summary.mark(index, RowStatus.FAILED, message)
+                    return summary
+        except Exception as e:
+            error_msg = f"Error en la carga masiva de asistencias: {str(e)}"
+            logger.error(error_msg)
+            for index in range(len(rows)):
+                summary.mark(index, RowStatus.FAILED, error_msg)
+            return summary
+        finally:
+            if path is not None:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+        for index in range(len(rows)):
+            summary.mark(index, RowStatus.INSERTED)
+        for row in rejected:
+            status = _STAGING_STATUS.get(str(row['estado']), RowStatus.FAILED)
+            summary.mark(int(row['linea']), status, row.get('motivo'))
+        logger.info(f"Carga masiva de asistencias en el servidor: {summary.counts()}")
+        return summary
+
+    def changes_since(self, watermark: Optional[str] = None) -> Optional[ChangeSet]:
+        """
+        Obtiene las asistencias creadas, modificadas o eliminadas desde un
+        watermark (ver database/sql/sincronizacion_cambios.sql).
+        
+        Args:
+            watermark: Marca devuelta por la llamada anterior; None para la tabla completa
+            
+        Returns:
+            ChangeSet con filas en el formato de sp_listar_asistencias y claves
+            eliminadas (fecha, codigo_empleado), o None si hay error
+        """
+        try:
+            desde = query_since(watermark)
+            success, message, rows = self.db.execute_procedure("sp_listar_asistencias_cambios", (desde,))
+            if not success:
+                logger.error(f"Error al obtener cambios de asistencias: {message}")
+                return None
+            deleted: List[Tuple[Any, Any]] = []
+            if watermark is not None:
+                success, message, removed = self.db.execute_procedure(
+                    "sp_listar_eliminados", ("reporte_asistencia", desde)
+                )
+                if not success:
+                    logger.error(f"Error al obtener asistencias eliminadas: {message}")
+                    return None
+                deleted = [((str(row['fecha'])[:10], str(row['codigo'])), row['eliminado_en']) for row in removed]
+            return ChangeSet.build(list(rows), deleted, watermark)
+        except Exception as e:
+            logger.error(f"Excepción al obtener cambios de asistencias: {str(e)}")
+            return None
+
+    def preview_overtime(self, records: Sequence[Union[Dict[str, Any], Sequence[Any]]]) -> Optional[OvertimeBatch]:
+        """
+        Estima las horas extras de un lote de asistencias con la regla
+        supuesta de database/overtime.py, sin escribir en la base de datos.
+        Los valores definitivos los calcula el trigger al insertar.
+        
+        Args:
+            records: Diccionarios con las claves de ATTENDANCE_FIELDS o tuplas en ese orden
+            
+        Returns:
+            OvertimeBatch con una posición por registro, o None si no se pudieron leer los turnos
+        """
+        success, message, shifts = self.db.execute_procedure("sp_listar_turnos")
+        if not success:
+            logger.error(f"Error al obtener turnos para el cálculo de horas extras: {message}")
+            return None
+        schedule = {row['codigo_turno']: (row['hora_entrada'], row['hora_salida']) for row in shifts}
+
+        rows = [self._normalize_attendance_record(record) for record in records]
+        turnos = [schedule.get(row[2], (None, None)) for row in rows]
+        return compute_overtime(
+            [turno[0] for turno in turnos],
+            [turno[1] for turno in turnos],
+            [row[4] for row in rows],
+            [row[5] for row in rows],
+            dias=[row[3] for row in rows],
+            fechas=[row[0] for row in rows],
+        )
+
+    def recompute_overtime_for_shift(self, codigo_turno: str, batch_size: int = 1000,
+                                     progress: Optional[ProgressCallback] = None) -> RecomputeSummary:
+        """
+        Recalcula h25/h35/h100 de las asistencias que usan un turno, p.ej.
+        después de corregir el horario de un turno creado con 00:00:00 por la
+        importación. Las horas extras las calcula el trigger de inserción del
+        servidor, por lo que cada bloque de filas (leído en orden de clave) se
+        elimina y se vuelve a insertar en su propia transacción, igual que
+        bulk_upsert_attendance con on_conflict='update'.
+        
+        Las filas se reconstruyen con ATTENDANCE_FIELDS: las horas extras
+        corregidas a mano se reemplazan por las del trigger. La reinserción
+        borra la eliminación que registra trg_asistencia_eliminada, por lo
+        que las réplicas de changes_since solo reciben las filas actualizadas
+        (ver database/sql/sincronizacion_cambios.sql).
+        
+        Args:
+            codigo_turno: Código del turno modificado
+            batch_size: Asistencias leídas y reescritas por bloque
+            progress: Callback opcional con (filas procesadas, total)
+            
+        Returns:
+            RecomputeSummary con las filas revisadas, recalculadas y fallidas
+        """
+        summary = RecomputeSummary(codigo_turno)
+        success, message, counted = self.db.execute_query(
+            "SELECT COUNT(*) FROM reporte_asistencia WHERE codigo_turno = %s",
+            (codigo_turno,), row_format=RowFormat.TUPLE, use_cache=False
+        )
+        if not success:
+            summary.errors.append(message)
+            return summary
+        summary.total = int(counted[0][0])
+        if progress is not None:
+            progress(0, summary.total)
+
+        batch_size = max(1, int(batch_size))
+        cursor: Optional[Tuple[Any, Any]] = None
+        while True:
+            query = (
+                "SELECT fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida "
+                "FROM reporte_asistencia WHERE codigo_turno = %s"
+            )
+            params: Tuple[Any, ...] = (codigo_turno,)
+            if cursor is not None:
+                query += " AND (fecha > %s OR (fecha = %s AND codigo_empleado > %s))"
+                params += (cursor[0], cursor[0], cursor[1])
+            query += " ORDER BY fecha, codigo_empleado LIMIT %s"
+            success, message, rows = self.db.execute_query(
+                query, params + (batch_size,), row_format=RowFormat.TUPLE, use_cache=False
+            )
+            if not success:
+                summary.errors.append(message)
+                break
+            if not rows:
+                break
+
+            rows = [tuple(row) for row in rows]
+            block = UpsertSummary.pending(len(rows))
+            self._replace_attendance_chunk(rows, list(range(len(rows))), block)
+            summary.updated += block.count(RowStatus.UPDATED)
+            summary.failed += len(rows) - block.count(RowStatus.UPDATED)
+            summary.errors.extend(sorted(set(block.messages.values())))
+            summary.scanned += len(rows)
+            summary.batches += 1
+            cursor = (rows[-1][0], rows[-1][1])
+            if progress is not None:
+                progress(summary.scanned, max(summary.total, summary.scanned))
+            if len(rows) < batch_size:
+                break
+
+        logger.info(
+            f"Horas extras recalculadas para el turno {codigo_turno}: {summary.updated} recalculadas, "
+            f"{summary.failed} con error"
+        )
+        return summary
+
+    @staticmethod
+    def _normalize_attendance_record(record: Union[Dict[str, Any], Sequence[Any]]) -> Tuple[Any, ...]:
+        if isinstance(record, dict) or hasattr(record, 'get'):
+            values = [record.get(name) for name in ATTENDANCE_FIELDS]  # type: ignore[union-attr]
+        else:
+            values = list(record)[:len(ATTENDANCE_FIELDS)]
+            values += [None] * (len(ATTENDANCE_FIELDS) - len(values))
+        fecha, codigo, turno, dia, entrada, salida = values
+        return (
+            str(fecha)[:10] if fecha else None,
+            str(codigo).strip() if codigo else None,
+            str(turno).strip() if turno else None,
+            dia or "",
+            entrada or None,
+            salida or None,
+        )
+
+    def get_employee_codes(self) -> Optional[Set[str]]:
+        """Códigos de empleado existentes, o None si no se pudieron consultar."""
+        success, message, results = self.db.execute_procedure("sp_listar_empleados")
+        if not success:
+            logger.warning(f"No se validarán los empleados de la carga: {message}")
+            return None
+        return {str(row.get('codigo')) for row in results}
+
+    def get_shift_codes(self) -> Optional[Set[str]]:
+        """Códigos de turno existentes, o None si no se pudieron consultar."""
+        success, message, results = self.db.execute_procedure("sp_listar_turnos")
+        if not success:
+            logger.warning(f"No se pudieron consultar los turnos: {message}")
+            return None
+        return {str(row.get('codigo_turno')) for row in results}
+
+    def prefetch_attendance_keys(self, fecha_inicio: str, fecha_fin: str,
+                                 codigo_empleados: Optional[Iterable[str]] = None,
+                                 max_codes_in_query: int = 1000) -> AttendanceKeySet:
+        """
+        Descarga en una sola consulta las claves (fecha, codigo_empleado) que
+        ya existen en un rango, para descartar duplicados antes de escribir.
+        Con muchos empleados se consulta solo por rango y se filtra en el
+        cliente. Las filas se leen en streaming hacia un AttendanceKeySet.
+        
+        Args:
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD), inclusive
+            fecha_fin: Fecha de fin (YYYY-MM-DD), inclusive
+            codigo_empleados: Empleados de interés; None para todos
+            max_codes_in_query: Máximo de códigos en la lista IN de la consulta
+            
+        Returns:
+            AttendanceKeySet con las claves existentes
+            
+        Raises:
+            RuntimeError: Si no se pudo consultar la base de datos
+        """
+        codes = None if codigo_empleados is None else {str(code) for code in codigo_empleados}
+        found = AttendanceKeySet()
+        if codes is not None and not codes:
+            return found
+        query = "SELECT fecha, codigo_empleado FROM reporte_asistencia WHERE fecha BETWEEN %s AND %s"
+        params: Tuple[Any, ...] = (fecha_inicio, fecha_fin)
+        if codes is not None and len(codes) <= max_codes_in_query:
+            query += " AND codigo_empleado IN (" + ", ".join(["%s"] * len(codes)) + ")"
+            params += tuple(sorted(codes))
+        try:
+            for fecha, codigo in self.db.iter_query(query, params, batch_size=5000, row_format=RowFormat.TUPLE):
+                if codes is None or str(codigo) in codes:
+                    found.add(fecha, codigo)
+        except Exception as e:
+            raise RuntimeError(f"No se pudieron consultar las asistencias existentes: {str(e)}") from e
+        return found
+
+    def _insert_attendance_chunk(self, rows: List[Tuple[Any, ...]], indexes: List[int],
+                                 summary: UpsertSummary, status: RowStatus,
+                                 isolate_errors: bool = False) -> bool:
+        """
+        Inserta un bloque con una sola sentencia. Si falla y isolate_errors es
+        True, el bloque se reintenta fila por fila para reportar solo las filas
+        con error (p.ej. un turno inexistente) y registrar las demás.
+        """
+        success, message, batch = self.db.execute_batch(
+            _INSERT_ATTENDANCE_SQL, [rows[index] for index in indexes], chunk_size=len(indexes)
+        )
+        summary.batch = batch
+        if success:
+            for index in indexes:
+                summary.mark(index, status)
+            return True
+        if not isolate_errors or len(indexes) == 1:
+            for index in indexes:
+                summary.mark(index, RowStatus.FAILED, batch.chunks[0].error if batch.chunks else message)
+            return False
+        logger.warning(f"Bloque de {len(indexes)} asistencias rechazado, se reintenta fila por fila: {message}")
+        for index in indexes:
+            self._insert_attendance_chunk(rows, [index], summary, status)
+        return False
+
+    def _replace_attendance_chunk(self, rows: List[Tuple[Any, ...]], indexes: List[int],
+                                  summary: UpsertSummary) -> None:
+        """Elimina y vuelve a insertar un bloque en una transacción para que el trigger recalcule."""
+        keys = [value for index in indexes for value in rows[index][:2]]
+        query = (
+            "DELETE FROM reporte_asistencia WHERE (fecha, codigo_empleado) IN ("
+            + ", ".join(["(%s, %s)"] * len(indexes)) + ")"
+        )
+        with self.db.transaction() as tx:
+            success, message, _ = self.db.execute_delete(query, tuple(keys))
+            if not success:
+                for index in indexes:
+                    summary.mark(index, RowStatus.FAILED, message)
+                return
+            if not self._insert_attendance_chunk(rows, indexes, summary, RowStatus.UPDATED):
+                # Sin la inserción el DELETE dejaría el bloque vacío: revertir
+                tx.set_rollback_only()
+
+    def delete_attendance_range(self, fecha_inicio: str, fecha_fin: str,
+                                codigo_empleados: Optional[Sequence[str]] = None,
+                                preview: bool = False, chunk_size: int = 1000,
+                                progress: Optional[ProgressCallback] = None,
+                                search_term: Optional[str] = None) -> RangeDeleteSummary:
+        """
+        Elimina las asistencias de un rango de fechas (opcionalmente solo de
+        algunos empleados), p.ej. para deshacer la importación de un mes.
+        search_term aplica el mismo filtro que filter_attendance (código o
+        nombre que contiene el texto), para eliminar lo que muestra la tabla.
+        Se eliminan bloques de hasta chunk_size filas por clave primaria, cada
+        uno en su propia sentencia y commit, para no retener bloqueos largos.
+        
+        Args:
+            fecha_inicio: Fecha de inicio (YYYY-MM-DD), inclusive
+            fecha_fin: Fecha de fin (YYYY-MM-DD), inclusive
+            codigo_empleados: Códigos de empleado; None para todos
+            preview: Si es True solo se cuentan las filas, sin eliminar
+            chunk_size: Filas eliminadas por sentencia
+            progress: Callback opcional con (filas eliminadas, total)
+            search_term: Término de búsqueda (código o nombre); None para no filtrar
+            
+        Returns:
+            RangeDeleteSummary con las filas encontradas y eliminadas
+        """
+        summary = RangeDeleteSummary(preview=preview)
+        if not fecha_inicio or not fecha_fin:
+            summary.error = "Debe indicar la fecha de inicio y de fin"
+            return summary
+        codes = sorted({str(code).strip() for code in codigo_empleados or () if code and str(code).strip()})
+        if codigo_empleados is not None and not codes:
+            return summary
+        # Grupos de códigos para no armar listas IN demasiado largas
+        groups: List[Optional[List[str]]] = [codes[i:i + 500] for i in range(0, len(codes), 500)] or [None]
+
+        for group in groups:
+            where, params = self._range_filter(fecha_inicio, fecha_fin, group, search_term)
+            success, message, counted = self.db.execute_query(
+                f"SELECT COUNT(*) FROM reporte_asistencia {where}", params,
+                row_format=RowFormat.TUPLE, use_cache=False
+            )
+            if not success:
+                summary.error = message
+                return summary
+            summary.matched += int(counted[0][0])
+        if preview or summary.matched == 0:
+            return summary
+
+        if progress is not None:
+            progress(0, summary.matched)
+        chunk_size = max(1, int(chunk_size))
+        for group in groups:
+            where, params = self._range_filter(fecha_inicio, fecha_fin, group, search_term)
+            while True:
+                success, message, keys = self.db.execute_query(
+                    f"SELECT fecha, codigo_empleado FROM reporte_asistencia {where} "
+                    "ORDER BY fecha, codigo_empleado LIMIT %s",
+                    params + (chunk_size,), row_format=RowFormat.TUPLE, use_cache=False
+                )
+                if not success:
+                    summary.error = message
+                    return summary
+                if not keys:
+                    break
+                success, message, deleted = self.db.execute_delete(
+                    "DELETE FROM reporte_asistencia WHERE (fecha, codigo_empleado) IN ("
+                    + ", ".join(["(%s, %s)"] * len(keys)) + ")",
+                    tuple(value for key in keys for value in key)
+                )
+                if not success:
+                    summary.error = message
+                    return summary
+                if deleted == 0:
+                    # Las claves leídas ya no existen: evitar un ciclo sin avance
+                    summary.error = "No se pudo eliminar el bloque de asistencias seleccionado"
+                    return summary
+                summary.deleted += deleted
+                summary.chunks += 1
+                if progress is not None:
+                    progress(summary.deleted, max(summary.matched, summary.deleted))
+                if len(keys) < chunk_size:
+                    break
+
+        logger.info(
+            f"Asistencias eliminadas entre {fecha_inicio} y {fecha_fin}: "
+            f"{summary.deleted} en {summary.chunks} bloques"
+        )
+        return summary
+
+    @staticmethod
+    def _range_filter(fecha_inicio: str, fecha_fin: str, codes: Optional[List[str]],
+                      search_term: Optional[str] = None) -> Tuple[str, Tuple[Any, ...]]:
+        where = "WHERE fecha BETWEEN %s AND %s"
+        params: Tuple[Any, ...] = (fecha_inicio, fecha_fin)
+        if codes is not None:
+            where += " AND codigo_empleado IN (" + ", ".join(["%s"] * len(codes)) + ")"
+            params += tuple(codes)
+        if search_term:
+            # Misma condición que sp_filtrar_asistencias
+            where += (" AND (codigo_empleado LIKE %s"
+                      " OR codigo_empleado IN (SELECT codigo FROM empleados WHERE nombre LIKE %s))")
+            params += (f"%{search_term}%", f"%{search_term}%")
+        return where, params
+
     @staticmethod
     def _is_duplicate_error(message: str) -> bool:
         lowered = message.lower()
@@ -0,0 +1,78 @@
+"""
+Backends de base de datos
+Descripción: Punto de extensión de DatabaseConnection para abrir conexiones
+             físicas. El backend por defecto usa mysql.connector; otros
+             backends (p.ej. SQLite en memoria) ofrecen la misma interfaz de
+             conexión y cursor que el conector de MySQL.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+import mysql.connector
+
+
+class DatabaseBackend:
+    """
+    Interfaz mínima de un backend: abrir una conexión compatible con
+    mysql.connector (cursor, callproc, stored_results, commit, rollback...).
+    """
+
+    name = 'base'
+    # Si acepta LOAD DATA LOCAL INFILE (carga masiva desde un archivo del cliente)
+    supports_local_infile = False
+
+    def connect(self, **kwargs: Any) -> Any:
+        """
+        Abre una conexión física.
+
+        Args:
+            kwargs: Parámetros de conexión (host, port, user, password, database, charset)
+
+        Returns:
+            Conexión con la interfaz de mysql.connector
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera los recursos compartidos del backend (si los hay)."""
+
+
+class MySQLBackend(DatabaseBackend):
+    """Backend por defecto: servidor MySQL con procedimientos almacenados."""
+
+    name = 'mysql'
+    supports_local_infile = True
+
+    def connect(self, **kwargs: Any) -> Any:
+        return mysql.connector.connect(**kwargs)
+
+
+BackendFactory = Callable[[Dict[str, Any]], DatabaseBackend]
+
+_BACKENDS: Dict[str, BackendFactory] = {
+    'mysql': lambda config: MySQLBackend(),
+}
+
+
+def register_backend(name: str, factory: BackendFactory) -> None:
+    """Registra un backend para seleccionarlo con la clave 'backend' de la configuración."""
+    _BACKENDS[name] = factory
+
+
+def create_backend(config: Dict[str, Any]) -> DatabaseBackend:
+    """
+    Crea el backend indicado en la configuración ('mysql' por defecto).
+
+    Raises:
+        ValueError: Si el backend no está registrado
+    """
+    name = str(config.get('backend') or 'mysql').lower()
+    if name == 'sqlite' and name not in _BACKENDS:
+        # Registro perezoso: el backend SQLite solo se importa si se usa
+        import database.sqlite_backend  # noqa: F401
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Backend de base de datos desconocido: {name!r}")
+    return factory(config)
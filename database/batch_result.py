@@ -0,0 +1,143 @@
+"""Modelos para resumir operaciones por lotes (varias filas por sentencia)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True)
+class ChunkResult:
+    """Resultado de un bloque de filas confirmado (o revertido) en una sola transacción."""
+
+    index: int
+    start: int
+    size: int
+    rows_affected: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Agrega los resultados de todos los bloques de una operación por lotes."""
+
+    chunks: List[ChunkResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(chunk.size for chunk in self.chunks)
+
+    @property
+    def rows_affected(self) -> int:
+        return sum(chunk.rows_affected for chunk in self.chunks)
+
+    @property
+    def failed_chunks(self) -> List[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def failed_rows(self) -> int:
+        return sum(chunk.size for chunk in self.chunks if not chunk.ok)
+
+
+class RowStatus(IntEnum):
+    """Estado de una fila dentro de una carga masiva."""
+
+    INSERTED = 0
+    UPDATED = 1
+    SKIPPED = 2     # Ya existía y se conservó (on_conflict='skip')
+    DUPLICATE = 3   # Ya existía y se reporta como error (on_conflict='error')
+    INVALID = 4     # Faltan datos o el empleado no existe
+    FAILED = 5      # El bloque que la contenía fue revertido
+    PENDING = 6     # No se llegó a procesar
+
+
+@dataclass(slots=True)
+class UpsertSummary:
+    """
+    Resumen compacto de una carga masiva: un byte de estado por fila de
+    entrada y mensajes solo para las filas con error.
+    """
+
+    statuses: bytearray
+    messages: Dict[int, str] = field(default_factory=dict)
+    batch: Optional[BatchResult] = None
+
+    @classmethod
+    def pending(cls, size: int) -> "UpsertSummary":
+        return cls(bytearray([RowStatus.PENDING]) * size)
+
+    def mark(self, index: int, status: RowStatus, message: Optional[str] = None) -> None:
+        self.statuses[index] = status
+        if message:
+            self.messages[index] = message
+
+    def status(self, index: int) -> RowStatus:
+        return RowStatus(self.statuses[index])
+
+    def count(self, status: RowStatus) -> int:
+        return self.statuses.count(status)
+
+    def counts(self) -> Dict[str, int]:
+        """Número de filas por estado, p.ej. {'inserted': 120, 'skipped': 3}."""
+        return {status.name.lower(): count for status in RowStatus if (count := self.statuses.count(status))}
+
+    def indexes(self, status: RowStatus) -> List[int]:
+        return [index for index, value in enumerate(self.statuses) if value == status]
+
+    @property
+    def written(self) -> int:
+        return self.count(RowStatus.INSERTED) + self.count(RowStatus.UPDATED)
+
+    @property
+    def ok(self) -> bool:
+        return not any(value in (RowStatus.DUPLICATE, RowStatus.INVALID, RowStatus.FAILED, RowStatus.PENDING)
+                       for value in set(self.statuses))
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+
+@dataclass(slots=True)
+class RecomputeSummary:
+    """Resultado de recalcular las horas extras de las asistencias de un turno."""
+
+    codigo_turno: str
+    total: int = 0
+    scanned: int = 0
+    updated: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return self.scanned - self.updated - self.failed
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0 and not self.errors
+
+
+@dataclass(slots=True)
+class RangeDeleteSummary:
+    """Resultado (o vista previa) de eliminar asistencias por rango de fechas."""
+
+    matched: int = 0
+    deleted: int = 0
+    chunks: int = 0
+    preview: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
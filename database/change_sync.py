@@ -0,0 +1,168 @@
+"""
+Sincronización incremental (delta sync)
+Descripción: Conjunto de cambios devuelto por ``changes_since`` y una réplica
+             local que los aplica. El servidor marca cada fila con
+             actualizado_en y registra las eliminaciones; el cliente guarda la
+             marca más alta vista (watermark) y en cada refresco pide solo lo
+             que cambió desde entonces.
+
+Las consultas se hacen desde ``watermark - SYNC_OVERLAP_SECONDS`` para no
+perder filas de transacciones que confirmaron tarde con una marca anterior;
+las filas repetidas se reemplazan por clave, por lo que reaplicarlas no tiene
+efecto.
+
+El registro de eliminaciones se purga pasados ``TOMBSTONE_RETENTION_DAYS``
+días; una réplica con un watermark más antiguo podría no ver eliminaciones ya
+purgadas, así que vuelve a descargar la tabla completa.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Margen para transacciones que confirman después de otras más recientes
+SYNC_OVERLAP_SECONDS = 5.0
+
+# Días que se conservan las eliminaciones en registro_eliminaciones
+TOMBSTONE_RETENTION_DAYS = 30
+
+_STAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def format_stamp(value: Any) -> Optional[str]:
+    """Normaliza una marca de tiempo a texto 'YYYY-MM-DD HH:MM:SS.ffffff' (ordenable)."""
+    if value is None or value == '':
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    return value.strftime(_STAMP_FORMAT)
+
+
+def query_since(watermark: Optional[str], overlap: float = SYNC_OVERLAP_SECONDS) -> Optional[str]:
+    """Marca desde la que se consulta: el watermark menos el margen de solapamiento."""
+    if not watermark:
+        return None
+    return (datetime.strptime(watermark, _STAMP_FORMAT) - timedelta(seconds=overlap)).strftime(_STAMP_FORMAT)
+
+
+def retention_cutoff(days: int = TOMBSTONE_RETENTION_DAYS, now: Optional[datetime] = None) -> str:
+    """Marca anterior a la cual las eliminaciones ya pueden haberse purgado."""
+    return ((now or datetime.now()) - timedelta(days=days)).strftime(_STAMP_FORMAT)
+
+
+@dataclass(slots=True)
+class ChangeSet:
+    """
+    Cambios de una tabla desde un watermark.
+
+    ``rows`` trae las filas nuevas o modificadas (con su columna actualizado_en)
+    y ``deleted`` las claves eliminadas con la marca de la eliminación.
+    ``watermark`` es la marca más alta vista, a usar en la siguiente llamada.
+    ``full`` indica que la consulta se hizo sin watermark (tabla completa).
+    """
+
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: List[Tuple[Hashable, str]] = field(default_factory=list)
+    watermark: Optional[str] = None
+    full: bool = False
+
+    def __len__(self) -> int:
+        return len(self.rows) + len(self.deleted)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.rows and not self.deleted
+
+    @classmethod
+    def build(cls, rows: List[Dict[str, Any]], deleted: List[Tuple[Hashable, Any]],
+              previous: Optional[str], stamp_column: str = 'actualizado_en') -> "ChangeSet":
+        """Construye el conjunto normalizando las marcas y avanzando el watermark."""
+        watermark = previous
+        for row in rows:
+            stamp = format_stamp(row.get(stamp_column))
+            row[stamp_column] = stamp
+            if stamp is not None and (watermark is None or stamp > watermark):
+                watermark = stamp
+        tombstones = []
+        for key, eliminado_en in deleted:
+            stamp = format_stamp(eliminado_en) or ''
+            tombstones.append((key, stamp))
+            if stamp and (watermark is None or stamp > watermark):
+                watermark = stamp
+        return cls(rows, tombstones, watermark, full=previous is None)
+
+
+class SyncedTable:
+    """
+    Réplica local de una tabla mantenida con ``changes_since``. La primera
+    llamada a refresh() descarga la tabla completa; las siguientes solo los
+    cambios. Segura para hilos (se refresca desde el ejecutor en segundo plano).
+    """
+
+    def __init__(self, changes_since: Callable[[Optional[str]], Optional[ChangeSet]],
+                 key: Callable[[Dict[str, Any]], Hashable],
+                 stamp_column: str = 'actualizado_en',
+                 retention_days: int = TOMBSTONE_RETENTION_DAYS):
+        """
+        Args:
+            changes_since: Función del servicio que devuelve los cambios desde un watermark
+            key: Extrae la clave primaria de una fila
+            stamp_column: Columna con la marca de modificación
+            retention_days: Días que el servidor conserva las eliminaciones
+        """
+        self._changes_since = changes_since
+        self._key = key
+        self._stamp_column = stamp_column
+        self._retention_days = retention_days
+        self._lock = threading.Lock()
+        self._rows: Dict[Hashable, Dict[str, Any]] = {}
+        self.watermark: Optional[str] = None
+        self.last_changes = 0
+
+    def refresh(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Aplica los cambios pendientes y devuelve las filas ordenadas por clave.
+
+        Returns:
+            Lista de filas, o None si no se pudieron consultar los cambios
+        """
+        with self._lock:
+            if self.watermark is not None and self.watermark < retention_cutoff(self._retention_days):
+                # Las eliminaciones posteriores al watermark pueden estar purgadas
+                self.watermark = None
+            changes = self._changes_since(self.watermark)
+            if changes is None:
+                return None
+            if changes.full:
+                self._rows.clear()
+            self._apply(changes)
+            self.watermark = changes.watermark
+            self.last_changes = len(changes)
+            return [self._rows[key] for key in sorted(self._rows)]
+
+    def reset(self) -> None:
+        """Descarta la réplica; el siguiente refresh() descarga la tabla completa."""
+        with self._lock:
+            self._rows.clear()
+            self.watermark = None
+            self.last_changes = 0
+
+    def _apply(self, changes: ChangeSet) -> None:
+        # Si una clave aparece como modificada y eliminada gana el evento más
+        # reciente; con la misma marca se conserva la fila (eliminar y volver a
+        # insertar en la misma sentencia, como en bulk_upsert_attendance)
+        for row in changes.rows:
+            self._rows[self._key(row)] = row
+        for key, eliminado_en in changes.deleted:
+            current = self._rows.get(key)
+            if current is None:
+                continue
+            stamp = current.get(self._stamp_column) or ''
+            if eliminado_en > stamp:
+                del self._rows[key]
+
+    def __len__(self) -> int:
+        return len(self._rows)
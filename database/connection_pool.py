@@ -0,0 +1,235 @@
+"""
+Pool de conexiones reutilizables para MySQL
+Descripción: Mantiene un conjunto acotado de conexiones abiertas para que los
+             servicios no paguen el handshake TCP + autenticación en cada llamada.
+             Controla inactividad, verifica que la conexión siga viva antes de
+             prestarla y lleva la cuenta de préstamos y devoluciones.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(RuntimeError):
+    """Se agotó el tiempo de espera para obtener una conexión del pool."""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones con tamaño máximo, expiración por inactividad y
+    verificación de vida (ping) antes de reutilizar una conexión.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 5,
+        idle_timeout: float = 300.0,
+        acquire_timeout: float = 10.0,
+        ping_interval: float = 30.0,
+    ):
+        """
+        Inicializa el pool (las conexiones se crean bajo demanda).
+
+        Args:
+            factory: Función que abre una conexión física nueva
+            size: Número máximo de conexiones abiertas simultáneamente
+            idle_timeout: Segundos que una conexión puede quedar ociosa antes de cerrarse
+            acquire_timeout: Segundos máximos de espera cuando el pool está lleno
+            ping_interval: Si la conexión estuvo ociosa más de este tiempo se verifica con ping
+        """
+        self._factory = factory
+        self.size = max(1, int(size))
+        self.idle_timeout = float(idle_timeout)
+        self.acquire_timeout = float(acquire_timeout)
+        self.ping_interval = float(ping_interval)
+
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._open = 0
+        self._closed = False
+        self._counters: Dict[str, int] = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'expired': 0,
+            'borrowed': 0,
+            'returned': 0,
+            'timeouts': 0,
+        }
+        self._in_use = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Presta una conexión del pool, creando una nueva si hay cupo.
+
+        Args:
+            timeout: Segundos de espera (por defecto acquire_timeout)
+
+        Returns:
+            Conexión lista para usarse
+
+        Raises:
+            PoolTimeoutError: Si no se liberó ninguna conexión a tiempo
+        """
+        wait = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + wait
+
+        while True:
+            connection, last_used = self._reserve(deadline)
+            if connection is None:
+                # Cupo reservado: abrir conexión física fuera del lock
+                try:
+                    connection = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._counters['created'] += 1
+                    self._counters['borrowed'] += 1
+                    self._in_use += 1
+                return connection
+
+            if self._is_alive(connection, last_used):
+                with self._cond:
+                    self._counters['reused'] += 1
+                    self._counters['borrowed'] += 1
+                    self._in_use += 1
+                return connection
+
+            self._close_physical(connection)
+            with self._cond:
+                self._open -= 1
+                self._counters['discarded'] += 1
+                self._cond.notify()
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        """
+        Devuelve una conexión al pool.
+
+        Args:
+            connection: Conexión obtenida con acquire()
+            discard: Si es True la conexión se cierra en lugar de reutilizarse
+        """
+        if connection is None:
+            return
+
+        if not discard:
+            discard = not self._reset(connection)
+
+        with self._cond:
+            self._in_use -= 1
+            self._counters['returned'] += 1
+            if discard or self._closed:
+                self._open -= 1
+                self._counters['discarded'] += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._cond.notify()
+
+        if connection is not None:
+            self._close_physical(connection)
+
+    def close(self) -> None:
+        """Cierra las conexiones ociosas; las prestadas se cierran al devolverse."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for connection, _ in idle:
+            self._close_physical(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso del pool."""
+        with self._cond:
+            data: Dict[str, Any] = dict(self._counters)
+            data.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'closed': self._closed,
+            })
+            return data
+
+    # ------------------------------------------------------------------
+    # Auxiliares internos
+    # ------------------------------------------------------------------
+    def _reserve(self, deadline: float) -> Tuple[Optional[Any], float]:
+        """
+        Toma una conexión ociosa o reserva cupo para crear una nueva.
+        Retorna (None, 0) cuando se reservó cupo para una conexión nueva.
+        """
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("El pool de conexiones está cerrado")
+
+                    now = time.monotonic()
+                    # Expirar conexiones ociosas desde la más antigua
+                    while self._idle and now - self._idle[0][1] > self.idle_timeout:
+                        expired.append(self._idle.popleft()[0])
+                        self._open -= 1
+                        self._counters['expired'] += 1
+
+                    if self._idle:
+                        # LIFO: la conexión usada más recientemente está más "caliente"
+                        return self._idle.pop()
+
+                    if self._open < self.size:
+                        self._open += 1
+                        return None, 0.0
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No hay conexiones disponibles (máximo {self.size} en uso)"
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for connection in expired:
+                self._close_physical(connection)
+
+    def _is_alive(self, connection: Any, last_used: float) -> bool:
+        """Verifica la conexión solo si estuvo ociosa más de ping_interval."""
+        if time.monotonic() - last_used < self.ping_interval:
+            return True
+        try:
+            return bool(connection.is_connected())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(connection: Any) -> bool:
+        """Deja la conexión limpia para el siguiente uso. Retorna False si no es reutilizable."""
+        try:
+            if getattr(connection, 'unread_result', False):
+                connection.consume_results()
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Conexión descartada al devolverla al pool: {str(e)}")
+            return False
+
+    @staticmethod
+    def _close_physical(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -6,17 +6,85 @@ Descripción: Gestiona la conexión directa a MySQL sin usar frameworks.
              Permite ejecutar procedimientos almacenados y consultas SQL nativas.
 """
 
-import mysql.connector
 from mysql.connector import Error
 from mysql.connector.abstracts import MySQLConnectionAbstract
 from mysql.connector.pooling import PooledMySQLConnection
-from typing import Optional, Tuple, List, Any, Union, Dict
+from typing import Optional, Tuple, List, Any, Union, Dict, Sequence, Iterator, Callable
 import logging
+import re
+from pathlib import Path
+import threading
+import time
+from contextlib import contextmanager
+
+from config.config import CONFIG_DIR
+from database.backends import DatabaseBackend, create_backend
+from database.batch_result import BatchResult, ChunkResult
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+from database.query_stats import QueryStats, configure_slow_query_log, estimate_payload
+from database.result_cache import (ALL_TAGS, READ_PROCEDURE_TAGS, WRITE_PROCEDURE_TAGS, ResultCache,
+                                   normalize_params, tags_for_sql)
+from database.retry_policy import RetryPolicy, RetryStats
+from database.row_format import ColumnBatch, RowFormat, TupleRows, shape_rows
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Códigos de error de MySQL que indican que la conexión ya no es utilizable
+CONNECTION_LOST_ERRNOS = frozenset({2006, 2013, 2055})
+
+# Procedimientos de solo lectura: pueden reintentarse sin efectos secundarios
+READ_PROCEDURE_PREFIXES = ('sp_listar_', 'sp_filtrar_', 'sp_buscar_', 'sp_obtener_', 'sp_reporte_', 'sp_generar_')
+
+# Nombres de procedimientos que se interpolan en sentencias CALL
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _resolve_log_path(path: str) -> Path:
+    """Las rutas relativas del log se resuelven junto al archivo de configuración."""
+    log_path = Path(path)
+    if not log_path.is_absolute():
+        log_path = CONFIG_DIR / log_path
+    return log_path
+
+
+def _copy_results(results: Any) -> Any:
+    """Copia superficial de un resultado cacheado para que el llamador no altere la caché."""
+    if isinstance(results, TupleRows):
+        return TupleRows(results.columns, results)
+    if isinstance(results, ColumnBatch):
+        return ColumnBatch(results.columns, [list(column) for column in results.data])
+    if isinstance(results, list):
+        return list(results)
+    return results
+
+
+def _query_label(query: str, limit: int = 80) -> str:
+    """Etiqueta estable para agrupar métricas de una consulta SQL."""
+    label = " ".join(query.split())
+    return label if len(label) <= limit else label[:limit] + '...'
+
+
+class Transaction:
+    """
+    Unidad de trabajo activa: una conexión fijada al hilo actual cuyo commit
+    se difiere hasta el final del bloque ``with db.transaction()``.
+    """
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.depth = 0
+        self.rollback_only = False
+        self.broken = False
+        self.operations = 0
+        self.committed = False
+        self.cache_tags: set = set()
+
+    def set_rollback_only(self) -> None:
+        """Marca la transacción para revertirse al cerrar el bloque."""
+        self.rollback_only = True
+
 
 class DatabaseConnection:
     """
@@ -25,7 +93,8 @@ class DatabaseConnection:
     """
     
     def __init__(self, config: Union[Dict[str, Any], str], port: Optional[int] = None, 
-                 user: Optional[str] = None, password: Optional[str] = None, database: Optional[str] = None):
+                 user: Optional[str] = None, password: Optional[str] = None, database: Optional[str] = None,
+                 backend: Optional[DatabaseBackend] = None):
         """
         Inicializa los parámetros de conexión.
         
@@ -35,6 +104,8 @@ class DatabaseConnection:
             user: Usuario de la base de datos (opcional si config es dict)
             password: Contraseña del usuario (opcional si config es dict)
             database: Nombre de la base de datos (opcional si config es dict)
+            backend: Backend que abre las conexiones (por defecto el indicado en
+                la clave 'backend' de la configuración, o MySQL)
         """
         if isinstance(config, dict):
             self.host = config.get('host', 'localhost')
@@ -42,15 +113,92 @@ class DatabaseConnection:
             self.user = config.get('user', 'root')
             self.password = config.get('password', '')
             self.database = config.get('database', '')
+            self.pool_enabled = bool(config.get('pool_enabled', True))
+            self.pool_size = int(config.get('pool_size', 5))
+            self.pool_idle_timeout = float(config.get('pool_idle_timeout', 300))
+            slow_query_ms = float(config.get('slow_query_ms', 1000))
+            slow_query_log = config.get('slow_query_log') or ''
+            self.retry_policy = RetryPolicy(
+                attempts=int(config.get('retry_attempts', 3)),
+                backoff_ms=float(config.get('retry_backoff_ms', 200)),
+                write_policy=str(config.get('write_retry_policy', 'safe')),
+            )
+            cache_enabled = bool(config.get('cache_enabled', True))
+            cache_ttl = float(config.get('cache_ttl', 60))
+            cache_max_entries = int(config.get('cache_max_entries', 512))
+            cache_max_mb = int(config.get('cache_max_mb', 16))
+            self.local_infile = bool(config.get('local_infile', False))
         else:
             self.host = config
             self.port = port or 3306
             self.user = user or 'root'
             self.password = password or ''
             self.database = database or ''
+            self.pool_enabled = True
+            self.pool_size = 5
+            self.pool_idle_timeout = 300.0
+            slow_query_ms = 1000.0
+            slow_query_log = ''
+            self.retry_policy = RetryPolicy()
+            cache_enabled = True
+            cache_ttl = 60.0
+            cache_max_entries = 512
+            cache_max_mb = 16
+            self.local_infile = False
         
+        self._owns_backend = backend is None
+        self.backend = backend or create_backend(config if isinstance(config, dict) else {})
         self.connection: Optional[Union[MySQLConnectionAbstract, PooledMySQLConnection]] = None
         self.cursor = None
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+
+        # Métricas por sentencia y log de consultas lentas
+        self.stats = QueryStats(slow_threshold_ms=slow_query_ms)
+        if slow_query_log:
+            configure_slow_query_log(_resolve_log_path(slow_query_log))
+        self.retries = RetryStats()
+
+        # Caché de lecturas (procedimientos y consultas de tablas conocidas)
+        self.cache: Optional[ResultCache] = None
+        if cache_enabled and cache_ttl > 0:
+            self.cache = ResultCache(
+                max_entries=cache_max_entries,
+                max_bytes=cache_max_mb * 1024 * 1024,
+                default_ttl=cache_ttl,
+            )
+
+    def _connection_kwargs(self) -> Dict[str, Any]:
+        """Construye los parámetros de conexión para el backend (mysql.connector por defecto)."""
+        # Construir kwargs de forma dinámica para evitar pasar parámetros
+        # no soportados por algunas versiones del conector (p.ej. 'collation').
+        conn_kwargs: Dict[str, Any] = {
+            'host': self.host,
+            'port': self.port,
+            'user': self.user,
+            'password': self.password,
+            'charset': 'utf8mb4'
+        }
+
+        # Incluir la base de datos solo si fue proporcionada
+        if self.database:
+            conn_kwargs['database'] = self.database
+        # Solo si se pidió: habilita LOAD DATA LOCAL INFILE en el cliente
+        if self.local_infile:
+            conn_kwargs['allow_local_infile'] = True
+        return conn_kwargs
+
+    @property
+    def supports_local_infile(self) -> bool:
+        """Si la carga masiva con LOAD DATA LOCAL INFILE está habilitada y el backend la admite."""
+        return self.local_infile and self.backend.supports_local_infile
+
+    def _open_pooled_connection(self) -> Any:
+        """Abre una conexión física para el pool."""
+        connection = self.backend.connect(**self._connection_kwargs())
+        logger.info(f"Conectado a MySQL Server versión {connection.get_server_info()} (pool)")
+        return connection
         
     def connect(self) -> Tuple[bool, str]:
         """
@@ -60,21 +208,7 @@ class DatabaseConnection:
             Tuple[bool, str]: (éxito, mensaje)
         """
         try:
-            # Construir kwargs de forma dinámica para evitar pasar parámetros
-            # no soportados por algunas versiones del conector (p.ej. 'collation').
-            conn_kwargs = {
-                'host': self.host,
-                'port': self.port,
-                'user': self.user,
-                'password': self.password,
-                'charset': 'utf8mb4'
-            }
-
-            # Incluir la base de datos solo si fue proporcionada
-            if self.database:
-                conn_kwargs['database'] = self.database
-
-            self.connection = mysql.connector.connect(**conn_kwargs)
+            self.connection = self.backend.connect(**self._connection_kwargs())
             
             if self.connection.is_connected():
                 db_info = self.connection.get_server_info()
@@ -84,6 +218,7 @@ class DatabaseConnection:
                 return False, "No se pudo establecer la conexión"
                 
         except Error as e:
+            self._note_error(e, 'connect')
             error_msg = f"Error al conectar a MySQL: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
@@ -108,6 +243,333 @@ class DatabaseConnection:
             logger.error(f"Error al cerrar la conexión: {str(e)}")
             # Asegurar que se limpie la referencia aunque falle el cierre
             self.connection = None
+
+    def close(self) -> None:
+        """
+        Cierra la conexión directa, todas las conexiones del pool y el backend
+        si fue creado por esta instancia.
+        """
+        self.disconnect()
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            logger.info("Pool de conexiones cerrado")
+        if self._owns_backend:
+            self.backend.close()
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna los contadores del pool (préstamos, devoluciones, conexiones abiertas).
+        
+        Returns:
+            Dict con estadísticas o None si el pool no está activo
+        """
+        pool = self._pool
+        return pool.stats() if pool is not None else None
+
+    def query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna las métricas por sentencia: llamadas, errores, filas, bytes
+        aproximados, tiempos por fase (connect/execute/fetch), percentiles e histograma.
+        
+        Returns:
+            Dict con una entrada por procedimiento o consulta
+        """
+        return self.stats.snapshot()
+
+    def retry_stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de reintentos (fallos, transitorios, reintentos,
+        recuperados, abandonados) y los fallos agrupados por código de error.
+        """
+        return self.retries.snapshot()
+
+    def _note_error(self, error: BaseException, phase: str) -> None:
+        """Registra el último error del hilo para que la política de reintentos lo evalúe."""
+        self._local.last_error = (error, phase)
+
+    def _run_with_retry(self, attempt: Callable[[], Tuple[Any, ...]], idempotent: bool) -> Any:
+        """
+        Ejecuta un intento y lo repite con backoff exponencial mientras el error
+        sea transitorio y la política lo permita. Dentro de una transacción no
+        se reintenta: la conexión fijada no puede reemplazarse.
+        
+        Args:
+            attempt: Función que realiza un intento y retorna la tupla de resultado
+            idempotent: True si repetir la operación no tiene efectos secundarios
+            
+        Returns:
+            La tupla del último intento
+        """
+        policy = self.retry_policy
+        retries = 0
+        while True:
+            self._local.last_error = None
+            result = attempt()
+            if result[0]:
+                if retries:
+                    self.retries.increment('recovered')
+                    logger.info(f"Operación recuperada tras {retries} reintento(s)")
+                return result
+
+            failure = getattr(self._local, 'last_error', None)
+            if failure is None:
+                return result
+            error, phase = failure
+            self.retries.record_failure(error)
+
+            if self.in_transaction() or not policy.allows(error, phase, idempotent):
+                self.retries.increment('not_retried')
+                return result
+            if retries >= policy.attempts:
+                self.retries.increment('gave_up')
+                logger.error(f"Se agotaron los {policy.attempts} reintentos: {str(error)}")
+                return result
+
+            retries += 1
+            self.retries.increment('retries')
+            delay = policy.delay(retries)
+            logger.warning(f"Error transitorio ({str(error)}); reintento {retries}/{policy.attempts} en {delay:.2f}s")
+            time.sleep(delay)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna las métricas de la caché de lecturas (aciertos, fallos, tasa de
+        aciertos, desalojos, invalidaciones, entradas y bytes).
+        
+        Returns:
+            Dict con estadísticas o None si la caché está desactivada
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def invalidate_cache(self, *tags: str) -> None:
+        """
+        Invalida las entradas con las etiquetas indicadas ('asistencias',
+        'reportes', 'empleados', 'referencia'); sin etiquetas vacía la caché.
+        """
+        if self.cache is None:
+            return
+        if tags:
+            self.cache.invalidate(tags)
+        else:
+            self.cache.clear()
+
+    def _cached_read(self, key: Any, tags: Optional[Any], ttl: Optional[float],
+                     use_cache: bool, run: Callable[[], Tuple[bool, str, Any]]) -> Tuple[bool, str, Any]:
+        """
+        Sirve una lectura desde la caché o la ejecuta y almacena el resultado.
+        Dentro de una transacción no se usa la caché: la transacción puede ver
+        sus propios cambios aún no confirmados. Si otra escritura invalida las
+        etiquetas mientras la lectura corre, el resultado no se guarda.
+        """
+        if self.cache is None or tags is None or self.in_transaction():
+            return run()
+        if use_cache:
+            hit, cached = self.cache.get(key)
+            if hit:
+                message, results = cached
+                return True, message, _copy_results(results)
+
+        generation = self.cache.generation(tags)
+        success, message, results = run()
+        if success:
+            self.cache.put(key, (message, results), estimate_payload(results), tags, ttl,
+                           generation=generation)
+            results = _copy_results(results)
+        return success, message, results
+
+    def _invalidate_for_write(self, tags: Any) -> None:
+        """Invalida las etiquetas afectadas por una escritura (y de nuevo al confirmar la transacción)."""
+        if self.cache is None:
+            return
+        self.cache.invalidate(tags)
+        tx = self._current_transaction()
+        if tx is not None:
+            tx.cache_tags.update(tags)
+
+    def _acquire_with_retry(self) -> Tuple[Optional[Any], str]:
+        """
+        Obtiene una conexión reintentando solo la fase de conexión. Lo usan las
+        operaciones que no pueden repetirse completas (lotes e iteradores).
+        """
+        _, message, connection = self._run_with_retry(self._acquire_attempt, idempotent=False)
+        return connection, message
+
+    def _acquire_attempt(self) -> Tuple[bool, str, Optional[Any]]:
+        connection, message = self._acquire_connection()
+        return connection is not None, message, connection
+
+    def _get_pool(self) -> ConnectionPool:
+        """Crea el pool de forma perezosa la primera vez que se necesita."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(
+                    self._open_pooled_connection,
+                    size=self.pool_size,
+                    idle_timeout=self.pool_idle_timeout,
+                )
+            return self._pool
+
+    def _acquire_connection(self) -> Tuple[Optional[Any], str]:
+        """
+        Obtiene una conexión para ejecutar una operación.
+        Usa el pool si está habilitado; en caso contrario conecta por llamada.
+        
+        Returns:
+            Tuple[conexión o None, mensaje de error]
+        """
+        tx = self._current_transaction()
+        if tx is not None:
+            if tx.broken:
+                return None, "La conexión de la transacción se perdió; la transacción será revertida."
+            tx.operations += 1
+            return tx.connection, ""
+
+        if not self.pool_enabled:
+            success, message = self.connect()
+            if not success or self.connection is None:
+                return None, message
+            return self.connection, message
+
+        try:
+            return self._get_pool().acquire(), ""
+        except (Error, PoolTimeoutError) as e:
+            self._note_error(e, 'connect')
+            error_msg = f"Error al conectar a MySQL: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
+
+    def _release_connection(self, connection: Any, discard: bool = False) -> None:
+        """
+        Devuelve la conexión al pool o la cierra en modo conexión por llamada.
+        
+        Args:
+            connection: Conexión obtenida con _acquire_connection
+            discard: Si es True la conexión no se reutiliza
+        """
+        tx = self._current_transaction()
+        if tx is not None and connection is tx.connection:
+            # La conexión pertenece a la transacción; se libera al cerrarla
+            if discard:
+                tx.broken = True
+            return
+        if not self.pool_enabled:
+            self.disconnect()
+            return
+        pool = self._pool
+        if pool is not None:
+            pool.release(connection, discard=discard)
+        else:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _current_transaction(self) -> Optional[Transaction]:
+        return getattr(self._local, 'transaction', None)
+
+    def in_transaction(self) -> bool:
+        """Indica si el hilo actual está dentro de un bloque transaction()."""
+        return self._current_transaction() is not None
+
+    def _commit(self, connection: Any) -> None:
+        """Confirma, salvo que la conexión pertenezca a una transacción abierta."""
+        tx = self._current_transaction()
+        if tx is not None and connection is tx.connection:
+            return
+        connection.commit()
+
+    def _rollback(self, connection: Any) -> None:
+        """Revierte, salvo dentro de una transacción (la revierte quien la abrió)."""
+        tx = self._current_transaction()
+        if tx is not None and connection is tx.connection:
+            return
+        connection.rollback()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Transaction]:
+        """
+        Abre una unidad de trabajo que fija una conexión al hilo actual.
+        Todas las llamadas execute_* del hilo (incluidas las de los servicios)
+        usan esa conexión y su commit se difiere hasta el final del bloque.
+        Si el bloque lanza una excepción, o se llamó a set_rollback_only(),
+        se revierte todo. Los bloques anidados se unen a la transacción externa.
+        
+        Uso:
+            with db.transaction() as tx:
+                service.create_attendance(...)
+                
+        Raises:
+            Error: Si no se pudo abrir la conexión o falló el commit final
+        """
+        tx = self._current_transaction()
+        if tx is not None:
+            tx.depth += 1
+            try:
+                yield tx
+            except BaseException:
+                tx.rollback_only = True
+                raise
+            finally:
+                tx.depth -= 1
+            return
+
+        connection = self._open_transaction_connection()
+        tx = Transaction(connection)
+        self._local.transaction = tx
+        discard = False
+        try:
+            connection.start_transaction()
+            yield tx
+            if tx.broken:
+                raise Error("Se perdió la conexión durante la transacción")
+            if tx.rollback_only:
+                connection.rollback()
+                logger.info("Transacción revertida a solicitud del llamador")
+            else:
+                connection.commit()
+                tx.committed = True
+                if tx.cache_tags and self.cache is not None:
+                    # Lecturas de otros hilos pudieron cachear datos previos al commit
+                    self.cache.invalidate(tx.cache_tags)
+        except BaseException:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            logger.error(f"Transacción revertida ({tx.operations} operaciones)")
+            raise
+        finally:
+            self._local.transaction = None
+            self._close_transaction_connection(connection, discard or tx.broken)
+
+    def _open_transaction_connection(self) -> Any:
+        if self.pool_enabled:
+            return self._get_pool().acquire()
+        return self.backend.connect(**self._connection_kwargs())
+
+    def _close_transaction_connection(self, connection: Any, discard: bool) -> None:
+        if self.pool_enabled and self._pool is not None:
+            self._pool.release(connection, discard=discard)
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_connection_lost(error: Error) -> bool:
+        return error.errno in CONNECTION_LOST_ERRNOS
+
+    @staticmethod
+    def _close_cursor(cursor: Any) -> None:
+        if cursor is None:
+            return
+        try:
+            cursor.close()
+        except Exception:
+            pass
     
     def test_connection(self) -> Optional[Dict[str, Any]]:
         """
@@ -180,59 +642,126 @@ class DatabaseConnection:
                 pass
             return None
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, List[Any]]:
+    def execute_query(self, query: str, params: Optional[tuple] = None,
+                      row_format: RowFormat = RowFormat.DICT,
+                      use_cache: bool = True) -> Tuple[bool, str, Any]:
         """
         Ejecuta una consulta SELECT y retorna los resultados.
+        Las consultas sobre tablas conocidas se sirven desde la caché mientras
+        ninguna escritura las invalide.
         
         Args:
             query: Consulta SQL a ejecutar
             params: Parámetros para la consulta (opcional)
+            row_format: Formato de las filas (dict por defecto; ver RowFormat)
+            use_cache: Si es False se consulta al servidor y se refresca la caché
             
         Returns:
             Tuple[bool, str, List]: (éxito, mensaje, resultados)
         """
-        results: List[Any] = []
+        tags = tags_for_sql(query) if query.lstrip()[:6].upper() == 'SELECT' else None
+        key = ('query', " ".join(query.split()), normalize_params(params), row_format)
+        return self._cached_read(
+            key, tags, None, use_cache,
+            lambda: self._run_with_retry(lambda: self._execute_query_once(query, params, row_format), True),
+        )
+
+    def _execute_query_once(self, query: str, params: Optional[tuple] = None,
+                            row_format: RowFormat = RowFormat.DICT) -> Tuple[bool, str, Any]:
+        """Un intento de execute_query."""
+        results: Any = []
+        trace = self.stats.start(_query_label(query), params)
+        connection, message = self._acquire_connection()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, results
+
+        cursor = None
+        discard = False
+        ok = False
+        as_dict = row_format == RowFormat.DICT
         try:
-            success, message = self.connect()
-            if not success or self.connection is None:
-                return False, message, results
-            
-            cursor = self.connection.cursor(dictionary=True)  # type: ignore
+            cursor = connection.cursor(dictionary=as_dict)
             
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             
-            results = list(cursor.fetchall())
-            cursor.close()
-            self.disconnect()
+            trace.mark('execute')
+            rows = cursor.fetchall()
+            results = list(rows) if as_dict else shape_rows(cursor.column_names, rows, row_format)
+            trace.mark('fetch')
             
+            ok = True
             return True, f"Consulta ejecutada exitosamente. {len(results)} registros obtenidos.", results
             
         except Error as e:
+            discard = self._is_connection_lost(e)
+            self._note_error(e, 'execute')
             error_msg = f"Error al ejecutar la consulta: {str(e)}"
             logger.error(error_msg)
             return False, error_msg, results
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=len(results), payload_bytes=estimate_payload(results), ok=ok)
     
-    def execute_procedure(self, procedure_name: str, params: Optional[tuple] = None) -> Tuple[bool, str, List[Any]]:
+    def execute_procedure(self, procedure_name: str, params: Optional[tuple] = None,
+                          row_format: RowFormat = RowFormat.DICT,
+                          idempotent: Optional[bool] = None,
+                          use_cache: bool = True) -> Tuple[bool, str, Any]:
         """
         Ejecuta un procedimiento almacenado.
         
         Args:
             procedure_name: Nombre del procedimiento almacenado
             params: Parámetros del procedimiento (opcional)
+            row_format: Formato de las filas (dict por defecto; ver RowFormat)
+            idempotent: Si puede reintentarse sin efectos secundarios; por defecto
+                se deduce del nombre (sp_listar_, sp_filtrar_, ...)
+            use_cache: Si es False se consulta al servidor y se refresca la caché
             
         Returns:
             Tuple[bool, str, List]: (éxito, mensaje, resultados)
         """
-        results: List[Any] = []
+        if idempotent is None:
+            idempotent = procedure_name.startswith(READ_PROCEDURE_PREFIXES)
+
+        def run() -> Tuple[bool, str, Any]:
+            return self._run_with_retry(
+                lambda: self._execute_procedure_once(procedure_name, params, row_format), idempotent
+            )
+
+        rule = READ_PROCEDURE_TAGS.get(procedure_name)
+        if rule is not None:
+            tags, ttl = rule
+            key = ('procedure', procedure_name, normalize_params(params), row_format)
+            return self._cached_read(key, tags, ttl, use_cache, run)
+
+        result = run()
+        if not idempotent:
+            self._invalidate_for_write(WRITE_PROCEDURE_TAGS.get(procedure_name, ALL_TAGS))
+        return result
+
+    def _execute_procedure_once(self, procedure_name: str, params: Optional[tuple] = None,
+                                row_format: RowFormat = RowFormat.DICT) -> Tuple[bool, str, Any]:
+        """Un intento de execute_procedure."""
+        results: Any = []
+        trace = self.stats.start(procedure_name, params)
+        connection, message = self._acquire_connection()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, results
+
+        cursor = None
+        discard = False
+        ok = False
+        as_dict = row_format == RowFormat.DICT
         try:
-            success, message = self.connect()
-            if not success or self.connection is None:
-                return False, message, results
-            
-            cursor = self.connection.cursor(dictionary=True)  # type: ignore
+            cursor = connection.cursor(dictionary=as_dict)
             
             # Llamar al procedimiento almacenado
             if params:
@@ -240,20 +769,33 @@ class DatabaseConnection:
             else:
                 cursor.callproc(procedure_name)
             
+            trace.mark('execute')
             # Obtener resultados
-            for result in cursor.stored_results():  # type: ignore
-                results.extend(list(result.fetchall()))
+            if as_dict:
+                for result in cursor.stored_results():  # type: ignore
+                    results.extend(list(result.fetchall()))
+            else:
+                results = self._shape_result_sets(
+                    [(result.column_names, result.fetchall()) for result in cursor.stored_results()],  # type: ignore
+                    row_format,
+                )
+            trace.mark('fetch')
             
-            self.connection.commit()
-            cursor.close()
-            self.disconnect()
+            self._commit(connection)
             
+            ok = True
             return True, f"Procedimiento '{procedure_name}' ejecutado exitosamente.", results
             
         except Error as e:
+            discard = self._is_connection_lost(e)
+            self._note_error(e, 'execute')
             error_msg = f"Error al ejecutar el procedimiento: {str(e)}"
             logger.error(error_msg)
             return False, error_msg, results
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=len(results), payload_bytes=estimate_payload(results), ok=ok)
     
     def execute_insert(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
         """
@@ -266,31 +808,48 @@ class DatabaseConnection:
         Returns:
             Tuple[bool, str, int]: (éxito, mensaje, last_id)
         """
+        result = self._run_with_retry(lambda: self._execute_insert_once(query, params), False)
+        self._invalidate_for_write(tags_for_sql(query) or ALL_TAGS)
+        return result
+
+    def _execute_insert_once(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
+        """Un intento de execute_insert."""
         last_id = 0
+        trace = self.stats.start(_query_label(query), params)
+        connection, message = self._acquire_connection()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, last_id
+
+        cursor = None
+        discard = False
+        ok = False
         try:
-            success, message = self.connect()
-            if not success or self.connection is None:
-                return False, message, last_id
-            
-            cursor = self.connection.cursor()  # type: ignore
+            cursor = connection.cursor()
             
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            trace.mark('execute')
+            self._commit(connection)
             last_id = int(cursor.lastrowid) if cursor.lastrowid else 0
             
-            cursor.close()
-            self.disconnect()
-            
+            ok = True
             return True, f"Registro insertado exitosamente. ID: {last_id}", last_id
             
         except Error as e:
+            discard = self._is_connection_lost(e)
+            self._note_error(e, 'execute')
             error_msg = f"Error al insertar: {str(e)}"
             logger.error(error_msg)
             return False, error_msg, last_id
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=1 if ok else 0, payload_bytes=0, ok=ok)
     
     def execute_update(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
         """
@@ -303,31 +862,48 @@ class DatabaseConnection:
         Returns:
             Tuple[bool, str, int]: (éxito, mensaje, rows_affected)
         """
+        result = self._run_with_retry(lambda: self._execute_update_once(query, params), False)
+        self._invalidate_for_write(tags_for_sql(query) or ALL_TAGS)
+        return result
+
+    def _execute_update_once(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
+        """Un intento de execute_update."""
         rows_affected = 0
+        trace = self.stats.start(_query_label(query), params)
+        connection, message = self._acquire_connection()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, rows_affected
+
+        cursor = None
+        discard = False
+        ok = False
         try:
-            success, message = self.connect()
-            if not success or self.connection is None:
-                return False, message, rows_affected
-            
-            cursor = self.connection.cursor()  # type: ignore
+            cursor = connection.cursor()
             
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            trace.mark('execute')
+            self._commit(connection)
             rows_affected = cursor.rowcount
             
-            cursor.close()
-            self.disconnect()
-            
+            ok = True
             return True, f"Actualización exitosa. {rows_affected} filas afectadas.", rows_affected
             
         except Error as e:
+            discard = self._is_connection_lost(e)
+            self._note_error(e, 'execute')
             error_msg = f"Error al actualizar: {str(e)}"
             logger.error(error_msg)
             return False, error_msg, rows_affected
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=max(rows_affected, 0), payload_bytes=0, ok=ok)
     
     def execute_delete(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
         """
@@ -340,28 +916,279 @@ class DatabaseConnection:
         Returns:
             Tuple[bool, str, int]: (éxito, mensaje, rows_deleted)
         """
+        result = self._run_with_retry(lambda: self._execute_delete_once(query, params), False)
+        self._invalidate_for_write(tags_for_sql(query) or ALL_TAGS)
+        return result
+
+    def _execute_delete_once(self, query: str, params: Optional[tuple] = None) -> Tuple[bool, str, int]:
+        """Un intento de execute_delete."""
         rows_deleted = 0
+        trace = self.stats.start(_query_label(query), params)
+        connection, message = self._acquire_connection()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, rows_deleted
+
+        cursor = None
+        discard = False
+        ok = False
         try:
-            success, message = self.connect()
-            if not success or self.connection is None:
-                return False, message, rows_deleted
-            
-            cursor = self.connection.cursor()  # type: ignore
+            cursor = connection.cursor()
             
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            trace.mark('execute')
+            self._commit(connection)
             rows_deleted = cursor.rowcount
             
-            cursor.close()
-            self.disconnect()
-            
+            ok = True
             return True, f"Eliminación exitosa. {rows_deleted} filas eliminadas.", rows_deleted
             
         except Error as e:
+            discard = self._is_connection_lost(e)
+            self._note_error(e, 'execute')
             error_msg = f"Error al eliminar: {str(e)}"
             logger.error(error_msg)
             return False, error_msg, rows_deleted
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=max(rows_deleted, 0), payload_bytes=0, ok=ok)
+
+    def execute_batch(self, query: str, rows: Sequence[Sequence[Any]],
+                      chunk_size: int = 500, stop_on_error: bool = False) -> Tuple[bool, str, BatchResult]:
+        """
+        Ejecuta una sentencia parametrizada sobre muchas filas usando executemany.
+        Para INSERT ... VALUES el conector reescribe cada bloque como un único
+        INSERT multi-fila; cada bloque se confirma en su propia transacción.
+        
+        Args:
+            query: Sentencia SQL con marcadores %s
+            rows: Secuencia de tuplas de parámetros
+            chunk_size: Número de filas por bloque (por round trip y commit)
+            stop_on_error: Si es True se detiene en el primer bloque fallido
+            
+        Returns:
+            Tuple[bool, str, BatchResult]: (éxito, mensaje, resultado por bloque)
+        """
+        batch = BatchResult()
+        if not rows:
+            return True, "No hay filas para procesar.", batch
+
+        chunk_size = max(1, int(chunk_size))
+        trace = self.stats.start(_query_label(query), (f"{len(rows)} filas",))
+        connection, message = self._acquire_with_retry()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            return False, message, batch
+
+        cursor = None
+        discard = False
+        try:
+            cursor = connection.cursor()
+            for index, start in enumerate(range(0, len(rows), chunk_size)):
+                chunk = [tuple(row) for row in rows[start:start + chunk_size]]
+                chunk_result = ChunkResult(index=index, start=start, size=len(chunk))
+                batch.chunks.append(chunk_result)
+                try:
+                    cursor.executemany(query, chunk)
+                    self._commit(connection)
+                    chunk_result.rows_affected = max(cursor.rowcount, 0)
+                    trace.mark('execute')
+                except Error as e:
+                    chunk_result.error = str(e)
+                    logger.error(f"Error en el bloque {index} (filas {start}-{start + len(chunk) - 1}): {str(e)}")
+                    if self._is_connection_lost(e):
+                        discard = True
+                        break
+                    try:
+                        self._rollback(connection)
+                    except Error:
+                        discard = True
+                        break
+                    if stop_on_error:
+                        break
+        except Error as e:
+            discard = self._is_connection_lost(e)
+            error_msg = f"Error al ejecutar el lote: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg, batch
+        finally:
+            self._close_cursor(cursor)
+            self._release_connection(connection, discard)
+            self.stats.finish(trace, rows=batch.rows_affected, ok=batch.ok)
+
+        self._invalidate_for_write(tags_for_sql(query) or ALL_TAGS)
+        processed = batch.total_rows
+        if batch.ok and processed == len(rows):
+            return True, f"Lote ejecutado exitosamente. {batch.rows_affected} filas afectadas en {len(batch.chunks)} bloques.", batch
+        return False, (
+            f"Lote con errores: {len(batch.failed_chunks)} bloques fallidos "
+            f"({batch.failed_rows} filas), {len(rows) - processed} filas sin procesar."
+        ), batch
+
+    def iter_query(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000, row_format: RowFormat = RowFormat.DICT) -> Iterator[Any]:
+        """
+        Ejecuta una consulta SELECT y entrega las filas a medida que llegan.
+        Usa un cursor sin buffer y fetchmany, por lo que la memoria se mantiene
+        constante sin importar el tamaño del resultado.
+        
+        Args:
+            query: Consulta SQL a ejecutar
+            params: Parámetros para la consulta (opcional)
+            batch_size: Filas leídas del servidor por cada fetchmany
+            row_format: Formato de las filas; con RowFormat.COLUMNS se entrega
+                un ColumnBatch por cada bloque leído
+            
+        Yields:
+            Cada fila (diccionario por defecto) o un ColumnBatch por bloque
+            
+        Raises:
+            Error: Si no se pudo conectar o falló la consulta
+        """
+        trace = self.stats.start(_query_label(query), params)
+        connection, message = self._acquire_with_retry()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            raise Error(message)
+
+        cursor = None
+        exhausted = False
+        discard = False
+        tally = [0]
+        try:
+            cursor = connection.cursor(dictionary=row_format == RowFormat.DICT, buffered=False)
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            trace.mark('execute')
+
+            yield from self._drain_cursor(cursor, batch_size, row_format, tally)
+            exhausted = True
+        except Error as e:
+            discard = self._is_connection_lost(e)
+            logger.error(f"Error al ejecutar la consulta: {str(e)}")
+            raise
+        finally:
+            self._release_stream(connection, cursor, discard, exhausted)
+            trace.mark('fetch')
+            self.stats.finish(trace, rows=tally[0], ok=exhausted)
+
+    def iter_procedure(self, procedure_name: str, params: Optional[tuple] = None,
+                       batch_size: int = 1000, row_format: RowFormat = RowFormat.DICT) -> Iterator[Any]:
+        """
+        Ejecuta un procedimiento almacenado y entrega sus filas a medida que llegan.
+        A diferencia de callproc (que almacena todos los resultados), emite
+        CALL con multi=True para leer cada conjunto de resultados sin buffer.
+        
+        Args:
+            procedure_name: Nombre del procedimiento almacenado
+            params: Parámetros del procedimiento (opcional)
+            batch_size: Filas leídas del servidor por cada fetchmany
+            row_format: Formato de las filas; con RowFormat.COLUMNS se entrega
+                un ColumnBatch por cada bloque leído
+            
+        Yields:
+            Cada fila de todos los conjuntos de resultados, o un ColumnBatch por bloque
+            
+        Raises:
+            ValueError: Si el nombre del procedimiento no es un identificador válido
+            Error: Si no se pudo conectar o falló el procedimiento
+        """
+        if not _IDENTIFIER_RE.match(procedure_name):
+            raise ValueError(f"Nombre de procedimiento inválido: {procedure_name!r}")
+
+        params = tuple(params or ())
+        placeholders = ", ".join(["%s"] * len(params))
+        statement = f"CALL {procedure_name}({placeholders})"
+
+        trace = self.stats.start(procedure_name, params)
+        connection, message = self._acquire_with_retry()
+        trace.mark('connect')
+        if connection is None:
+            self.stats.finish(trace, ok=False)
+            raise Error(message)
+
+        cursor = None
+        exhausted = False
+        discard = False
+        tally = [0]
+        try:
+            cursor = connection.cursor(dictionary=row_format == RowFormat.DICT, buffered=False)
+            for result in cursor.execute(statement, params, multi=True):
+                if result.with_rows:
+                    yield from self._drain_cursor(result, batch_size, row_format, tally)
+
+            self._commit(connection)
+            exhausted = True
+        except Error as e:
+            discard = self._is_connection_lost(e)
+            logger.error(f"Error al ejecutar el procedimiento: {str(e)}")
+            raise
+        finally:
+            self._release_stream(connection, cursor, discard, exhausted)
+            trace.mark('fetch')
+            self.stats.finish(trace, rows=tally[0], ok=exhausted)
+
+    def _release_stream(self, connection: Any, cursor: Any, discard: bool, exhausted: bool) -> None:
+        """Cierra un cursor sin buffer y libera su conexión."""
+        if not exhausted and not discard:
+            if self._current_transaction() is not None:
+                # La conexión de una transacción no puede descartarse: leer lo pendiente
+                try:
+                    connection.consume_results()
+                except Error:
+                    discard = True
+            else:
+                # Si el llamador abandonó la iteración quedan filas pendientes en el
+                # socket: es más barato descartar la conexión que leerlas todas.
+                discard = True
+        self._close_cursor(cursor)
+        self._release_connection(connection, discard)
+
+    @staticmethod
+    def _drain_cursor(cursor: Any, batch_size: int, row_format: RowFormat = RowFormat.DICT,
+                      tally: Optional[List[int]] = None) -> Iterator[Any]:
+        batch_size = max(1, int(batch_size))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            if tally is not None:
+                tally[0] += len(rows)
+            if row_format == RowFormat.DICT:
+                yield from rows
+            elif row_format == RowFormat.COLUMNS:
+                yield shape_rows(cursor.column_names, rows, row_format)
+            else:
+                yield from shape_rows(cursor.column_names, rows, row_format)
+
+    @staticmethod
+    def _shape_result_sets(result_sets: List[Tuple[Sequence[str], List[Any]]], row_format: RowFormat) -> Any:
+        """Une los conjuntos de resultados de un procedimiento en el formato pedido."""
+        non_empty = [(columns, rows) for columns, rows in result_sets if columns]
+        if not non_empty:
+            return shape_rows((), [], row_format)
+        if row_format == RowFormat.RECORD:
+            records: List[Any] = []
+            for columns, rows in non_empty:
+                records.extend(shape_rows(columns, rows, row_format))
+            return records
+
+        columns = tuple(non_empty[0][0])
+        if any(tuple(cols) != columns for cols, _ in non_empty[1:]):
+            raise ValueError(
+                "El procedimiento devolvió conjuntos con columnas distintas; use RowFormat.DICT o RowFormat.RECORD"
+            )
+        rows: List[Any] = []
+        for _, set_rows in non_empty:
+            rows.extend(set_rows)
+        return shape_rows(columns, rows, row_format)
@@ -1,6 +1,7 @@
 """Servicio para gestión de empleados mediante procedimientos almacenados."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from database.change_sync import ChangeSet, SyncedTable, TOMBSTONE_RETENTION_DAYS, query_since, retention_cutoff
 from database.database import DatabaseConnection
 from database.operation_result import OperationResult, OperationStatus
 import logging
@@ -14,6 +15,9 @@ class EmployeeService:
     def __init__(self, db_connection: DatabaseConnection):
         """Inicializa el servicio con una conexión a la base de datos."""
         self.db = db_connection
+        # Réplica local refrescada con changes_since (ver get_all_employees_synced)
+        self.replica = SyncedTable(self.changes_since, key=lambda row: row['codigo'])
+        self._delta_supported = True
     
     def get_all_employees(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -32,6 +36,85 @@ class EmployeeService:
             logger.error(f"Excepción al listar empleados: {str(e)}")
             return None
     
+    def get_all_employees_synced(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Obtiene todos los empleados desde la réplica local, descargando solo
+        los cambios desde el último refresco. Si el servidor no tiene los
+        procedimientos de cambios se usa el listado completo.
+        
+        Returns:
+            Lista de empleados o None si hay error
+        """
+        if self._delta_supported:
+            rows = self.replica.refresh()
+            if rows is not None:
+                return rows
+        return self.get_all_employees()
+
+    def changes_since(self, watermark: Optional[str] = None) -> Optional[ChangeSet]:
+        """
+        Obtiene los empleados creados, modificados o eliminados desde un
+        watermark (ver database/sql/sincronizacion_cambios.sql).
+        
+        Args:
+            watermark: Marca devuelta por la llamada anterior; None para la tabla completa
+            
+        Returns:
+            ChangeSet con filas en el formato de sp_listar_empleados y códigos
+            eliminados, o None si hay error
+        """
+        try:
+            desde = query_since(watermark)
+            success, message, rows = self.db.execute_procedure("sp_listar_empleados_cambios", (desde,))
+            if not success:
+                self._note_delta_error(message)
+                return None
+            deleted: List[Tuple[Any, Any]] = []
+            if watermark is not None:
+                success, message, removed = self.db.execute_procedure("sp_listar_eliminados", ("empleados", desde))
+                if not success:
+                    self._note_delta_error(message)
+                    return None
+                deleted = [(str(row['codigo']), row['eliminado_en']) for row in removed]
+            return ChangeSet.build(list(rows), deleted, watermark)
+        except Exception as e:
+            logger.error(f"Excepción al obtener cambios de empleados: {str(e)}")
+            return None
+
+    def purge_deleted_log(self, retention_days: int = TOMBSTONE_RETENTION_DAYS) -> Optional[int]:
+        """
+        Borra del registro de eliminaciones (empleados y asistencias) las
+        anteriores a la ventana de retención. Las réplicas con un watermark
+        más antiguo vuelven a descargar la tabla completa (ver SyncedTable).
+        
+        Args:
+            retention_days: Días de eliminaciones que se conservan
+            
+        Returns:
+            Número de eliminaciones purgadas, o None si hay error
+        """
+        if not self._delta_supported:
+            return 0
+        try:
+            success, message, results = self.db.execute_procedure(
+                "sp_purgar_eliminaciones", (retention_cutoff(retention_days),)
+            )
+            if not success:
+                self._note_delta_error(message)
+                return None
+            return int(results[0]['eliminadas']) if results else 0
+        except Exception as e:
+            logger.error(f"Excepción al purgar el registro de eliminaciones: {str(e)}")
+            return None
+
+    def _note_delta_error(self, message: str) -> None:
+        if "1305" in message or "does not exist" in message:
+            # Servidor sin sincronizacion_cambios.sql: no volver a intentarlo
+            self._delta_supported = False
+            logger.warning("El servidor no soporta sincronización incremental de empleados; se usará el listado completo")
+        else:
+            logger.error(f"Error al obtener cambios de empleados: {message}")
+    
     def search_employees(self, search_term: str) -> Optional[List[Dict[str, Any]]]:
         """
         Busca empleados por código, nombre o DNI.
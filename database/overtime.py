@@ -0,0 +1,264 @@
+"""
+Cálculo de horas extras
+Descripción: Calcula h25/h35/h100 de una asistencia, tanto para una fila como
+             para lotes completos, con una regla supuesta. El trigger real
+             vive solo en el servidor MySQL y no está en el repositorio; esta
+             regla es la misma que usa el backend SQLite de sustitución, por lo
+             que compararlos entre sí no demuestra que coincidan con el
+             servidor. Sirve para vistas previas y pruebas; los valores que se
+             guardan los calcula siempre el trigger. Con NumPy instalado el
+             cálculo por lotes opera sobre arreglos; sin NumPy se usa un
+             recorrido equivalente en Python.
+
+La comparación con el servidor está en tests/test_overtime_trigger.py, con
+valores exportados del trigger real (tests/fixtures/trigger_overtime.tsv).
+
+Regla supuesta:
+    - Domingo: todas las horas trabajadas se pagan al 100%.
+    - Otros días: el tiempo trabajado por encima de la duración del turno;
+      las primeras OVERTIME_25_LIMIT horas al 25% y el resto al 35%.
+    - Si la marca de salida es menor que la de entrada (o la hora de salida
+      del turno menor que la de entrada) se asume que cruza la medianoche.
+
+Los cálculos se hacen en segundos enteros y se redondean a centésimas de hora
+con la misma fórmula en ambos caminos, de modo que los resultados por fila y
+por lote son idénticos.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tope diario de horas al 25%; el exceso se paga al 35%
+OVERTIME_25_LIMIT = 2.0
+
+_LIMIT_25_SECONDS = int(OVERTIME_25_LIMIT * 3600)
+_DAY_SECONDS = 24 * 3600
+_SUNDAY = 'domingo'
+
+
+def to_seconds(value: Any) -> Optional[int]:
+    """Convierte 'HH:MM[:SS]', time o timedelta a segundos desde medianoche."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    if isinstance(value, (datetime, dt_time)):
+        return value.hour * 3600 + value.minute * 60 + value.second
+    if isinstance(value, int):
+        return value
+    parts = str(value).strip().split(':')
+    try:
+        hours = int(parts[0])
+        minutes = int(parts[1]) if len(parts) > 1 else 0
+        seconds = int(float(parts[2])) if len(parts) > 2 else 0
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _span_seconds(start: Optional[int], end: Optional[int]) -> int:
+    if start is None or end is None:
+        return 0
+    if end < start:
+        end += _DAY_SECONDS
+    return end - start
+
+
+def _round_hours(seconds: int) -> float:
+    """Segundos a horas con dos decimales (redondeo hacia arriba en la mitad, como ROUND)."""
+    return ((seconds * 100 + 1800) // 3600) / 100
+
+
+def _is_sunday(dia: Any = None, fecha: Any = None) -> bool:
+    if dia:
+        return str(dia).strip().lower() == _SUNDAY
+    if isinstance(fecha, str):
+        try:
+            fecha = date.fromisoformat(fecha[:10])
+        except ValueError:
+            return False
+    if isinstance(fecha, (date, datetime)):
+        return fecha.weekday() == 6
+    return False
+
+
+def worked_hours(marca_entrada: Any, marca_salida: Any) -> float:
+    """Horas trabajadas según las marcas de entrada y salida."""
+    return _round_hours(_span_seconds(to_seconds(marca_entrada), to_seconds(marca_salida)))
+
+
+def overtime_hours(dia: Optional[str], turno_entrada: Any, turno_salida: Any,
+                   marca_entrada: Any, marca_salida: Any,
+                   fecha: Any = None) -> Tuple[float, float, float]:
+    """
+    Clasifica las horas extras de una asistencia.
+
+    Args:
+        dia: Nombre del día ('Domingo', ...); si falta se deduce de fecha
+        turno_entrada, turno_salida: Horario del turno
+        marca_entrada, marca_salida: Marcas registradas
+        fecha: Fecha de la asistencia (opcional)
+
+    Returns:
+        Tupla (h25, h35, h100)
+    """
+    worked = _span_seconds(to_seconds(marca_entrada), to_seconds(marca_salida))
+    if worked <= 0:
+        return 0.0, 0.0, 0.0
+    if _is_sunday(dia, fecha):
+        return 0.0, 0.0, _round_hours(worked)
+    extra = max(0, worked - _span_seconds(to_seconds(turno_entrada), to_seconds(turno_salida)))
+    h25 = min(extra, _LIMIT_25_SECONDS)
+    return _round_hours(h25), _round_hours(extra - h25), 0.0
+
+
+@dataclass(slots=True)
+class OvertimeBatch:
+    """
+    Horas trabajadas y extras de un lote, una posición por fila.
+    Con NumPy cada columna es un ndarray de float64; sin NumPy, una lista.
+    """
+
+    worked: Any
+    h25: Any
+    h35: Any
+    h100: Any
+
+    def __len__(self) -> int:
+        return len(self.h25)
+
+    def row(self, index: int) -> Tuple[float, float, float]:
+        """(h25, h35, h100) de una fila."""
+        return float(self.h25[index]), float(self.h35[index]), float(self.h100[index])
+
+    def totals(self) -> Dict[str, float]:
+        """Suma de cada columna, redondeada a dos decimales."""
+        totals = {}
+        for name in ('worked', 'h25', 'h35', 'h100'):
+            column = getattr(self, name)
+            total = column.sum() if hasattr(column, 'sum') else sum(column)
+            totals[name] = round(float(total), 2)
+        return totals
+
+
+def compute_overtime(turno_entrada: Sequence[Any], turno_salida: Sequence[Any],
+                     marca_entrada: Sequence[Any], marca_salida: Sequence[Any],
+                     dias: Optional[Sequence[Any]] = None,
+                     fechas: Optional[Sequence[Any]] = None,
+                     use_numpy: Optional[bool] = None) -> OvertimeBatch:
+    """
+    Calcula h25/h35/h100 de un lote completo de asistencias.
+
+    Las columnas de horas aceptan texto 'HH:MM:SS', time, timedelta, segundos
+    enteros o None (sin marca). El domingo se detecta por el nombre del día
+    cuando se entrega ``dias`` y, si no, por la fecha.
+
+    Args:
+        turno_entrada, turno_salida: Horario del turno de cada fila
+        marca_entrada, marca_salida: Marcas de cada fila
+        dias: Nombre del día de cada fila (opcional)
+        fechas: Fecha de cada fila (opcional)
+        use_numpy: Forzar (True) o evitar (False) NumPy; por defecto se usa si está instalado
+
+    Returns:
+        OvertimeBatch con una posición por fila
+
+    Raises:
+        ValueError: Si las columnas no tienen la misma longitud
+        RuntimeError: Si se pidió NumPy y no está instalado
+    """
+    size = len(marca_entrada)
+    for column in (turno_entrada, turno_salida, marca_salida, dias, fechas):
+        if column is not None and len(column) != size:
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy no está instalado")
+
+    sunday = [
+        _is_sunday(dias[i] if dias is not None else None, fechas[i] if fechas is not None else None)
+        for i in range(size)
+    ] if (dias is not None or fechas is not None) else [False] * size
+
+    if np is not None and use_numpy is not False:
+        return _compute_numpy(
+            _seconds_column(turno_entrada), _seconds_column(turno_salida),
+            _seconds_column(marca_entrada), _seconds_column(marca_salida),
+            np.asarray(sunday, dtype=bool),
+        )
+
+    worked_col: List[float] = []
+    h25_col: List[float] = []
+    h35_col: List[float] = []
+    h100_col: List[float] = []
+    for values, is_sunday in zip(zip(_seconds_column(turno_entrada), _seconds_column(turno_salida),
+                                     _seconds_column(marca_entrada), _seconds_column(marca_salida)), sunday):
+        shift_in, shift_out, mark_in, mark_out = values
+        worked = _span_seconds(mark_in, mark_out)
+        worked_col.append(_round_hours(worked))
+        if worked <= 0 or is_sunday:
+            h25_col.append(0.0)
+            h35_col.append(0.0)
+            h100_col.append(_round_hours(worked) if worked > 0 else 0.0)
+            continue
+        extra = max(0, worked - _span_seconds(shift_in, shift_out))
+        h25 = min(extra, _LIMIT_25_SECONDS)
+        h25_col.append(_round_hours(h25))
+        h35_col.append(_round_hours(extra - h25))
+        h100_col.append(0.0)
+    return OvertimeBatch(worked_col, h25_col, h35_col, h100_col)
+
+
+def _seconds_column(values: Sequence[Any]) -> List[Optional[int]]:
+    """Convierte una columna de horas a segundos; las horas repetidas se parsean una vez."""
+    if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+        return values.tolist()
+    memo: Dict[Any, Optional[int]] = {}
+    column: List[Optional[int]] = []
+    for value in values:
+        try:
+            seconds = memo[value]
+        except KeyError:
+            seconds = memo[value] = to_seconds(value)
+        except TypeError:
+            seconds = to_seconds(value)
+        column.append(seconds)
+    return column
+
+
+def _compute_numpy(shift_in: List[Optional[int]], shift_out: List[Optional[int]],
+                   mark_in: List[Optional[int]], mark_out: List[Optional[int]],
+                   sunday: "np.ndarray") -> OvertimeBatch:
+    def as_array(column: List[Optional[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        missing = np.fromiter((value is None for value in column), dtype=bool, count=len(column))
+        array = np.fromiter((value or 0 for value in column), dtype=np.int64, count=len(column))
+        return array, missing
+
+    def span(start: "np.ndarray", end: "np.ndarray", missing: "np.ndarray") -> "np.ndarray":
+        result = np.where(end < start, end + _DAY_SECONDS, end) - start
+        result[missing] = 0
+        return result
+
+    def hours(seconds: "np.ndarray") -> "np.ndarray":
+        return ((seconds * 100 + 1800) // 3600) / 100
+
+    shift_in_a, shift_in_missing = as_array(shift_in)
+    shift_out_a, shift_out_missing = as_array(shift_out)
+    mark_in_a, mark_in_missing = as_array(mark_in)
+    mark_out_a, mark_out_missing = as_array(mark_out)
+
+    worked = span(mark_in_a, mark_out_a, mark_in_missing | mark_out_missing)
+    shift = span(shift_in_a, shift_out_a, shift_in_missing | shift_out_missing)
+    weekday = (worked > 0) & ~sunday
+    extra = np.where(weekday, np.maximum(worked - shift, 0), 0)
+    h25 = np.minimum(extra, _LIMIT_25_SECONDS)
+    h35 = extra - h25
+    h100 = np.where((worked > 0) & sunday, worked, 0)
+    return OvertimeBatch(hours(worked), hours(h25), hours(h35), hours(h100))
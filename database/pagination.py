@@ -0,0 +1,57 @@
+"""
+Paginación por clave (keyset)
+Descripción: Página de resultados y token de continuación opaco. El token
+             guarda la clave (fecha, codigo_empleado) de la última fila
+             entregada, de modo que la página siguiente se busca por índice
+             en lugar de saltar filas con OFFSET.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Page:
+    """Una página de resultados y el token para pedir la siguiente."""
+
+    rows: List[Any] = field(default_factory=list)
+    next_token: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_token is not None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def encode_token(fecha: Any, codigo_empleado: Any) -> str:
+    """Codifica la clave de la última fila en un token opaco."""
+    if isinstance(fecha, (datetime, date)):
+        fecha = fecha.strftime('%Y-%m-%d')
+    payload = json.dumps([str(fecha), str(codigo_empleado)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_token(token: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decodifica un token de continuación.
+
+    Returns:
+        Tupla (fecha, codigo_empleado); (None, None) para la primera página
+
+    Raises:
+        ValueError: Si el token no es válido
+    """
+    if not token:
+        return None, None
+    try:
+        fecha, codigo = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Token de paginación inválido: {token!r}") from e
+    return str(fecha), str(codigo)
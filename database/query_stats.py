@@ -0,0 +1,228 @@
+"""
+Instrumentación de consultas
+Descripción: Registra el tiempo de cada consulta o procedimiento separado en
+             conexión, ejecución y lectura de filas, junto con el número de filas
+             y un tamaño aproximado de los datos. Mantiene histogramas por
+             sentencia, calcula percentiles y escribe un log rotativo con las
+             consultas que superan un umbral.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('database.slow_queries')
+slow_logger.propagate = False
+
+# Límites superiores (ms) de los buckets del histograma; el último es abierto
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Muestras recientes conservadas por sentencia para calcular percentiles
+SAMPLE_WINDOW = 1024
+
+PHASES = ('connect', 'execute', 'fetch')
+
+
+class QueryTrace:
+    """Cronómetro de una sola llamada; se marca al terminar cada fase."""
+
+    __slots__ = ('label', 'params', 'started', '_last', 'phases')
+
+    def __init__(self, label: str, params: Optional[Sequence[Any]] = None):
+        self.label = label
+        self.params = params
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Acumula el tiempo transcurrido desde la marca anterior en la fase indicada."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class _LabelStats:
+    __slots__ = ('count', 'errors', 'rows', 'bytes', 'phase_totals',
+                 'total_time', 'max_time', 'histogram', 'samples')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.phase_totals: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram: List[int] = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+
+class QueryStats:
+    """Acumulador de métricas por sentencia, seguro para varios hilos."""
+
+    def __init__(self, slow_threshold_ms: float = 1000.0):
+        """
+        Args:
+            slow_threshold_ms: Las llamadas que tardan más de este valor se
+                escriben en el log de consultas lentas (0 lo desactiva)
+        """
+        self.slow_threshold_ms = float(slow_threshold_ms)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _LabelStats] = {}
+
+    def start(self, label: str, params: Optional[Sequence[Any]] = None) -> QueryTrace:
+        return QueryTrace(label, params)
+
+    def finish(self, trace: QueryTrace, rows: int = 0, payload_bytes: int = 0, ok: bool = True) -> None:
+        """Registra una llamada terminada y la envía al log si fue lenta."""
+        total = trace.total
+        total_ms = total * 1000.0
+        bucket = len(HISTOGRAM_BOUNDS_MS)
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if total_ms <= bound:
+                bucket = index
+                break
+
+        with self._lock:
+            stats = self._stats.get(trace.label)
+            if stats is None:
+                stats = self._stats[trace.label] = _LabelStats()
+            stats.count += 1
+            stats.errors += 0 if ok else 1
+            stats.rows += rows
+            stats.bytes += payload_bytes
+            stats.total_time += total
+            stats.max_time = max(stats.max_time, total)
+            for phase, elapsed in trace.phases.items():
+                stats.phase_totals[phase] = stats.phase_totals.get(phase, 0.0) + elapsed
+            stats.histogram[bucket] += 1
+            stats.samples.append(total_ms)
+
+        if self.slow_threshold_ms > 0 and total_ms >= self.slow_threshold_ms:
+            phases = " ".join(f"{phase}={elapsed * 1000.0:.1f}ms" for phase, elapsed in trace.phases.items())
+            slow_logger.warning(
+                f"{trace.label} total={total_ms:.1f}ms {phases} filas={rows} "
+                f"bytes~{payload_bytes} ok={ok} params={_truncate(repr(trace.params))}"
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna las métricas acumuladas por sentencia.
+
+        Returns:
+            Dict etiqueta -> {count, errors, rows, bytes, avg_ms, max_ms,
+            p50_ms, p90_ms, p99_ms, connect_ms, execute_ms, fetch_ms, histogram}
+        """
+        with self._lock:
+            items = [(label, stats, sorted(stats.samples)) for label, stats in self._stats.items()]
+            result: Dict[str, Dict[str, Any]] = {}
+            for label, stats, samples in items:
+                bounds = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+                entry: Dict[str, Any] = {
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'bytes': stats.bytes,
+                    'avg_ms': stats.total_time * 1000.0 / stats.count if stats.count else 0.0,
+                    'max_ms': stats.max_time * 1000.0,
+                    'p50_ms': _percentile(samples, 50),
+                    'p90_ms': _percentile(samples, 90),
+                    'p99_ms': _percentile(samples, 99),
+                    'histogram': dict(zip(bounds, stats.histogram)),
+                }
+                for phase, elapsed in stats.phase_totals.items():
+                    entry[f'{phase}_ms'] = elapsed * 1000.0
+                result[label] = entry
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def configure_slow_query_log(path: Union[str, Path], max_bytes: int = 1_000_000, backup_count: int = 3) -> None:
+    """
+    Dirige el log de consultas lentas a un archivo rotativo.
+
+    Args:
+        path: Ruta del archivo de log
+        max_bytes: Tamaño máximo antes de rotar
+        backup_count: Número de archivos rotados que se conservan
+    """
+    path = Path(path)
+    for handler in list(slow_logger.handlers):
+        if isinstance(handler, RotatingFileHandler) and Path(handler.baseFilename) == path.resolve():
+            return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"No se pudo abrir el log de consultas lentas '{path}': {str(e)}")
+        return
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    slow_logger.addHandler(handler)
+    slow_logger.setLevel(logging.WARNING)
+
+
+def estimate_payload(rows: Any, sample_size: int = 20) -> int:
+    """
+    Estima el tamaño en bytes de un resultado a partir de una muestra de filas.
+    Cuenta solo los valores (no la sobrecarga de objetos de Python).
+    """
+    if rows is None:
+        return 0
+    if hasattr(rows, 'columns') and hasattr(rows, 'data') and not isinstance(rows, list):
+        # ColumnBatch: convertir a filas de muestra
+        total = len(rows)
+        if total == 0:
+            return 0
+        step = max(1, total // sample_size)
+        sample = [rows.row(i).values() for i in range(0, total, step)]
+    else:
+        total = len(rows)
+        if total == 0:
+            return 0
+        step = max(1, total // sample_size)
+        sample = [_row_values(rows[i]) for i in range(0, total, step)]
+
+    sampled = sum(_value_size(value) for values in sample for value in values)
+    return int(sampled * total / len(sample))
+
+
+def _row_values(row: Any) -> Any:
+    if isinstance(row, dict):
+        return row.values()
+    if hasattr(row, 'values') and callable(row.values):
+        return row.values()
+    return row
+
+
+def _value_size(value: Any) -> int:
+    if value is None:
+        return 1
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return 8
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(percent / 100.0 * (len(samples) - 1)))))
+    return samples[index]
+
+
+def _truncate(text: str, limit: int = 200) -> str:
+    return text if len(text) <= limit else text[:limit] + '...'
@@ -21,15 +21,10 @@ class ReferenceService:
             db_connection: Instancia de DatabaseConnection
         """
         self.db = db_connection
-        self._cost_centers_cache: Optional[List[Dict[str, Any]]] = None
-        self._areas_cache: Optional[List[Dict[str, Any]]] = None
-        self._shifts_cache: Optional[List[Dict[str, Any]]] = None
 
     def clear_cache(self):
-        """Limpia la caché de datos de referencia."""
-        self._cost_centers_cache = None
-        self._areas_cache = None
-        self._shifts_cache = None
+        """Limpia la caché de datos de referencia (en la caché de DatabaseConnection)."""
+        self.db.invalidate_cache('referencia')
     
     def get_cost_centers(self, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
@@ -41,13 +36,11 @@ class ReferenceService:
         Returns:
             Lista de centros de coste o None si hay error
         """
-        if self._cost_centers_cache is not None and not force_refresh:
-            return self._cost_centers_cache
-
         try:
-            success, message, results = self.db.execute_procedure("sp_listar_centros_coste")
+            success, message, results = self.db.execute_procedure(
+                "sp_listar_centros_coste", use_cache=not force_refresh
+            )
             if success:
-                self._cost_centers_cache = results
                 return results
             logger.error(f"Error al listar centros de coste: {message}")
             return None
@@ -65,13 +58,11 @@ class ReferenceService:
         Returns:
             Lista de áreas o None si hay error
         """
-        if self._areas_cache is not None and not force_refresh:
-            return self._areas_cache
-
         try:
-            success, message, results = self.db.execute_procedure("sp_listar_areas")
+            success, message, results = self.db.execute_procedure(
+                "sp_listar_areas", use_cache=not force_refresh
+            )
             if success:
-                self._areas_cache = results
                 return results
             logger.error(f"Error al listar áreas: {message}")
             return None
@@ -89,13 +80,11 @@ class ReferenceService:
         Returns:
             Lista de turnos o None si hay error
         """
-        if self._shifts_cache is not None and not force_refresh:
-            return self._shifts_cache
-
         try:
-            success, message, results = self.db.execute_procedure("sp_listar_turnos")
+            success, message, results = self.db.execute_procedure(
+                "sp_listar_turnos", use_cache=not force_refresh
+            )
             if success:
-                self._shifts_cache = results
                 return results
             logger.error(f"Error al listar turnos: {message}")
             return None
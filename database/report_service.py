@@ -5,6 +5,7 @@ Proporciona funciones para generar reportes de horas extras y estadísticas
 
 from typing import Optional, List, Dict, Any
 from database.database import DatabaseConnection
+from database.row_format import RowFormat
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,9 +23,10 @@ class ReportService:
         self.db = db_connection
     
     def get_overtime_by_employee(self, fecha_inicio: str, fecha_fin: str,
-                                codigo_empleado: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+                                codigo_empleado: Optional[str] = None) -> Optional[List[Any]]:
         """
         Genera reporte de horas extras por empleado.
+        Las filas son registros compactos (RowFormat.RECORD) con interfaz de diccionario.
         
         Args:
             fecha_inicio: Fecha de inicio (YYYY-MM-DD)
@@ -40,7 +42,9 @@ class ReportService:
                 params = (fecha_inicio, fecha_fin, codigo_empleado)
             else:
                 params = (fecha_inicio, fecha_fin, None)
-            success, message, results = self.db.execute_procedure("sp_reporte_horas_extras_empleado", params)
+            success, message, results = self.db.execute_procedure(
+                "sp_reporte_horas_extras_empleado", params, row_format=RowFormat.RECORD
+            )
             if success:
                 return results
             logger.error(f"Error al generar reporte: {message}")
@@ -49,9 +53,10 @@ class ReportService:
             logger.error(f"Excepción al generar reporte: {str(e)}")
             return None
     
-    def get_overtime_by_cost_center(self, fecha_inicio: str, fecha_fin: str) -> Optional[List[Dict[str, Any]]]:
+    def get_overtime_by_cost_center(self, fecha_inicio: str, fecha_fin: str) -> Optional[List[Any]]:
         """
         Genera reporte de horas extras por centro de coste.
+        Las filas son registros compactos (RowFormat.RECORD) con interfaz de diccionario.
         
         Args:
             fecha_inicio: Fecha de inicio (YYYY-MM-DD)
@@ -62,7 +67,9 @@ class ReportService:
         """
         try:
             params = (fecha_inicio, fecha_fin)
-            success, message, results = self.db.execute_procedure("sp_reporte_horas_extras_centro_coste", params)
+            success, message, results = self.db.execute_procedure(
+                "sp_reporte_horas_extras_centro_coste", params, row_format=RowFormat.RECORD
+            )
             if success:
                 return results
             logger.error(f"Error al generar reporte: {message}")
@@ -0,0 +1,256 @@
+"""
+Caché de resultados de lectura
+Descripción: Caché read-through para execute_procedure/execute_query. Las
+             entradas se indexan por procedimiento (o consulta) y parámetros
+             normalizados, expiran por TTL, se desalojan por LRU al superar el
+             número de entradas o el tamaño en bytes, y se invalidan por
+             etiquetas cuando una escritura toca los mismos datos.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+# Procedimientos de lectura cacheables: nombre -> (etiquetas, TTL en segundos o None = por defecto)
+READ_PROCEDURE_TAGS: Dict[str, Tuple[FrozenSet[str], Optional[float]]] = {
+    'sp_listar_asistencias': (frozenset({'asistencias'}), None),
+    'sp_filtrar_asistencias': (frozenset({'asistencias'}), None),
+    'sp_listar_asistencias_pagina': (frozenset({'asistencias'}), None),
+    'sp_reporte_resumen_asistencias': (frozenset({'asistencias'}), None),
+    'sp_reporte_horas_extras_empleado': (frozenset({'reportes'}), None),
+    'sp_reporte_horas_extras_centro_coste': (frozenset({'reportes'}), None),
+    'sp_listar_empleados': (frozenset({'empleados'}), None),
+    'sp_buscar_empleados': (frozenset({'empleados'}), None),
+    'sp_obtener_empleado': (frozenset({'empleados'}), None),
+    'sp_listar_turnos': (frozenset({'referencia'}), 3600.0),
+    'sp_listar_areas': (frozenset({'referencia'}), 3600.0),
+    'sp_listar_centros_coste': (frozenset({'referencia'}), 3600.0),
+}
+
+# Procedimientos de escritura: nombre -> etiquetas que invalidan
+WRITE_PROCEDURE_TAGS: Dict[str, FrozenSet[str]] = {
+    'sp_insertar_asistencia': frozenset({'asistencias', 'reportes'}),
+    'sp_actualizar_asistencia': frozenset({'asistencias', 'reportes'}),
+    'sp_eliminar_asistencia': frozenset({'asistencias', 'reportes'}),
+    'sp_insertar_empleado': frozenset({'empleados', 'asistencias', 'reportes'}),
+    'sp_actualizar_empleado': frozenset({'empleados', 'asistencias', 'reportes'}),
+    'sp_eliminar_empleado': frozenset({'empleados', 'asistencias', 'reportes'}),
+    'sp_fusionar_carga_asistencias': frozenset({'asistencias', 'reportes'}),
+    'sp_purgar_eliminaciones': frozenset(),  # Solo registro_eliminaciones, sin lecturas cacheadas
+}
+
+# Tablas -> etiquetas, para consultas SQL directas
+TABLE_TAGS: Dict[str, FrozenSet[str]] = {
+    'reporte_asistencia': frozenset({'asistencias', 'reportes'}),
+    'empleados': frozenset({'empleados', 'asistencias', 'reportes'}),
+    'turnos': frozenset({'referencia', 'asistencias'}),
+    'centros_coste': frozenset({'referencia', 'empleados', 'reportes'}),
+    'areas': frozenset({'referencia'}),
+    'carga_asistencia': frozenset(),  # Tabla de paso de la carga masiva, sin lecturas cacheadas
+}
+
+ALL_TAGS: FrozenSet[str] = frozenset().union(*TABLE_TAGS.values())
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?', re.IGNORECASE)
+
+
+def tags_for_sql(query: str) -> Optional[FrozenSet[str]]:
+    """
+    Etiquetas de las tablas que usa una sentencia SQL.
+
+    Returns:
+        Conjunto de etiquetas, o None si alguna tabla no es conocida
+    """
+    tables = {name.lower() for name in _TABLE_RE.findall(query)}
+    if not tables:
+        return None
+    tags: set = set()
+    for table in tables:
+        table_tags = TABLE_TAGS.get(table)
+        if table_tags is None:
+            return None
+        tags |= table_tags
+    return frozenset(tags)
+
+
+def normalize_params(params: Any) -> Hashable:
+    """Convierte los parámetros en una clave estable (fechas en ISO, listas en tuplas)."""
+    if params is None:
+        return ()
+    if isinstance(params, (list, tuple)):
+        return tuple(normalize_params(value) if isinstance(value, (list, tuple)) else _normalize_value(value)
+                     for value in params)
+    return (_normalize_value(params),)
+
+
+def _normalize_value(value: Any) -> Hashable:
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize_value(v)) for k, v in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class _Entry:
+    __slots__ = ('value', 'expires', 'size', 'tags')
+
+    def __init__(self, value: Any, expires: float, size: int, tags: FrozenSet[str]):
+        self.value = value
+        self.expires = expires
+        self.size = size
+        self.tags = tags
+
+
+class ResultCache:
+    """
+    Caché LRU + TTL con tope en bytes e invalidación por etiquetas, segura para hilos.
+
+    Cada etiqueta lleva un contador de generación que avanza con cada
+    invalidación. Una lectura toma generation() antes de consultar la base y
+    lo entrega a put(): si entre tanto otra escritura invalidó alguna de sus
+    etiquetas, el resultado (posiblemente anterior a la escritura) no se guarda.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024, default_ttl: float = 60.0):
+        """
+        Args:
+            max_entries: Número máximo de resultados almacenados
+            max_bytes: Tamaño aproximado máximo de todos los resultados
+            default_ttl: Segundos de vida de una entrada sin TTL propio
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.default_ttl = float(default_ttl)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+        self._cleared = 0
+        self._bytes = 0
+        self._counters: Dict[str, int] = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'rejected': 0,
+            'stale': 0,
+        }
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Busca una entrada vigente.
+
+        Returns:
+            Tuple[encontrada, valor]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return False, None
+            if entry.expires <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return True, entry.value
+
+    def generation(self, tags: Iterable[str]) -> Hashable:
+        """Marca de generación de las etiquetas, a tomar antes de leer de la base."""
+        with self._lock:
+            return self._generation(frozenset(tags))
+
+    def put(self, key: Hashable, value: Any, size: int, tags: Iterable[str] = (),
+            ttl: Optional[float] = None, generation: Optional[Hashable] = None) -> None:
+        """
+        Almacena un resultado; los que superan el tope completo no se guardan.
+        Con ``generation`` (ver generation()) tampoco se guarda si alguna de
+        las etiquetas se invalidó desde que se tomó la marca.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = max(0, int(size))
+        tags = frozenset(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation(tags):
+                self._counters['stale'] += 1
+                return
+            if size > self.max_bytes:
+                self._counters['rejected'] += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, time.monotonic() + ttl, size, tags)
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            self._counters['stores'] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Elimina las entradas con alguna de las etiquetas. Retorna cuántas se eliminaron."""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in list(self._by_tag.get(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+            self._counters['invalidations'] += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+            self._cleared += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de aciertos, fallos y desalojos, más el tamaño actual."""
+        with self._lock:
+            data: Dict[str, Any] = dict(self._counters)
+            lookups = data['hits'] + data['misses']
+            data['hit_ratio'] = data['hits'] / lookups if lookups else 0.0
+            data['entries'] = len(self._entries)
+            data['bytes'] = self._bytes
+            data['max_entries'] = self.max_entries
+            data['max_bytes'] = self.max_bytes
+            return data
+
+    def _generation(self, tags: FrozenSet[str]) -> Hashable:
+        return self._cleared, tuple(sorted((tag, self._generations.get(tag, 0)) for tag in tags))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
@@ -0,0 +1,120 @@
+"""
+Política de reintentos para errores transitorios de MySQL
+Descripción: Clasifica los errores en transitorios (conexión caída, servidor
+             reiniciado, wait_timeout, bloqueos) o permanentes, y decide si una
+             operación puede reintentarse según sea de lectura o escritura.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from database.connection_pool import PoolTimeoutError
+
+# Errores de red/servidor que suelen resolverse reconectando
+CONNECTION_ERRNOS = frozenset({
+    2002,  # No se puede conectar por socket local
+    2003,  # No se puede conectar al servidor
+    2006,  # MySQL server has gone away
+    2013,  # Conexión perdida durante la consulta
+    2055,  # Conexión perdida (error de sistema)
+    1040,  # Demasiadas conexiones
+    1053,  # El servidor se está apagando
+})
+
+# Errores de concurrencia: la sentencia fue revertida por el servidor
+LOCK_ERRNOS = frozenset({
+    1205,  # Lock wait timeout
+    1213,  # Deadlock
+})
+
+TRANSIENT_ERRNOS = CONNECTION_ERRNOS | LOCK_ERRNOS
+
+# Errores con los que el servidor no llegó a recibir la sentencia
+NOT_SENT_ERRNOS = frozenset({2002, 2003, 2006, 1040})
+
+WRITE_POLICIES = ('never', 'safe', 'always')
+
+
+def is_transient(error: BaseException) -> bool:
+    """Indica si el error puede desaparecer al reintentar."""
+    if isinstance(error, PoolTimeoutError):
+        return True
+    return getattr(error, 'errno', None) in TRANSIENT_ERRNOS
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Parámetros de reintento con backoff exponencial acotado."""
+
+    attempts: int = 3
+    backoff_ms: float = 200.0
+    max_backoff_ms: float = 5000.0
+    write_policy: str = 'safe'
+
+    def allows(self, error: BaseException, phase: str, idempotent: bool) -> bool:
+        """
+        Decide si una operación fallida puede repetirse.
+
+        Args:
+            error: Excepción que provocó el fallo
+            phase: 'connect' si falló al obtener la conexión, 'execute' si ya se envió la sentencia
+            idempotent: True para lecturas u operaciones que pueden repetirse sin efectos
+
+        Returns:
+            True si la operación debe reintentarse
+        """
+        if not is_transient(error):
+            return False
+        if idempotent or phase == 'connect':
+            return True
+        if self.write_policy == 'always':
+            return True
+        if self.write_policy == 'safe':
+            # Escrituras: solo si la sentencia no llegó al servidor
+            return getattr(error, 'errno', None) in NOT_SENT_ERRNOS
+        return False
+
+    def delay(self, attempt: int) -> float:
+        """Segundos de espera antes del reintento número ``attempt`` (desde 1)."""
+        base = min(self.max_backoff_ms, self.backoff_ms * (2 ** (attempt - 1)))
+        # Jitter para que varios hilos no reintenten al mismo tiempo
+        return random.uniform(base / 2, base) / 1000.0
+
+
+class RetryStats:
+    """Contadores de reintentos, para medir la estabilidad del enlace."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            'failures': 0,
+            'transient_failures': 0,
+            'retries': 0,
+            'recovered': 0,
+            'gave_up': 0,
+            'not_retried': 0,
+        }
+        self._by_errno: Dict[str, int] = {}
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._counters['failures'] += 1
+            if is_transient(error):
+                self._counters['transient_failures'] += 1
+            key = str(getattr(error, 'errno', None) or type(error).__name__)
+            self._by_errno[key] = self._by_errno.get(key, 0) + 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = dict(self._counters)
+            data['by_errno'] = dict(self._by_errno)
+            return data
+
@@ -0,0 +1,181 @@
+"""
+Formatos de fila para resultados de consultas
+Descripción: Alternativas compactas al diccionario por fila que devuelven los
+             cursores con dictionary=True. Cada formato comparte una sola lista
+             de columnas entre todas las filas del resultado.
+"""
+
+from __future__ import annotations
+
+import keyword
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class RowFormat(str, Enum):
+    """Formato en que DatabaseConnection entrega las filas."""
+
+    DICT = "dict"        # Un diccionario por fila (comportamiento original)
+    TUPLE = "tuple"      # Tuplas + una lista de columnas compartida (TupleRows)
+    RECORD = "record"    # Objetos con __slots__ generados desde la descripción del cursor
+    COLUMNS = "columns"  # Un ColumnBatch con una lista por columna
+
+
+class TupleRows(list):
+    """Lista de tuplas que conserva los nombres de columna una sola vez."""
+
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Sequence[str], rows: Iterable[tuple] = ()):
+        super().__init__(rows)
+        self.columns: Tuple[str, ...] = tuple(columns)
+
+    def index_of(self, column: str) -> int:
+        return self.columns.index(column)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self]
+
+
+class RecordBase:
+    """
+    Base de las clases de registro generadas. Ofrece la misma interfaz de
+    lectura que un diccionario (get, [], keys, items) para que las vistas
+    existentes puedan consumir registros sin cambios.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slot_of.get(key)
+        if slot is None:
+            raise KeyError(key)
+        return getattr(self, slot)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slot_of.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def values(self) -> List[Any]:
+        return [self[name] for name in self._fields]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(name, self[name]) for name in self._fields]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecordBase):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"Record({fields})"
+
+
+def _slot_name(index: int, column: str) -> str:
+    """Usa el nombre de la columna como atributo cuando es un identificador seguro."""
+    if column.isidentifier() and not keyword.iskeyword(column) \
+            and not column.startswith('_') and not hasattr(RecordBase, column):
+        return column
+    return f"_c{index}"
+
+
+@lru_cache(maxsize=64)
+def record_class(columns: Tuple[str, ...]) -> type:
+    """
+    Genera (y memoiza) una clase con __slots__ para un conjunto de columnas.
+    Las columnas que no son identificadores válidos se acceden solo con get()/[].
+    """
+    slots = tuple(_slot_name(i, col) for i, col in enumerate(columns))
+
+    def __init__(self: Any, *values: Any) -> None:
+        for name, value in zip(slots, values):
+            object.__setattr__(self, name, value)
+
+    return type('Record', (RecordBase,), {
+        '__slots__': slots,
+        '_fields': tuple(columns),
+        '_slot_of': dict(zip(columns, slots)),
+        '__init__': __init__,
+        '__hash__': None,
+    })
+
+
+class ColumnBatch:
+    """Resultado orientado a columnas: una lista de valores por columna."""
+
+    __slots__ = ('columns', 'data')
+
+    def __init__(self, columns: Sequence[str], data: Sequence[List[Any]]):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.data: List[List[Any]] = list(data)
+
+    @classmethod
+    def from_rows(cls, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> "ColumnBatch":
+        rows = list(rows)
+        if rows:
+            data = [list(col) for col in zip(*rows)]
+        else:
+            data = [[] for _ in columns]
+        return cls(columns, data)
+
+    def __len__(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def column(self, name: str) -> List[Any]:
+        return self.data[self.columns.index(name)]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: values[index] for name, values in zip(self.columns, self.data)}
+
+    def extend(self, other: "ColumnBatch") -> None:
+        if other.columns != self.columns:
+            raise ValueError("Los lotes tienen columnas distintas")
+        for target, values in zip(self.data, other.data):
+            target.extend(values)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
+
+
+def shape_rows(columns: Sequence[str], rows: Sequence[Sequence[Any]], row_format: RowFormat) -> Any:
+    """
+    Convierte filas crudas (tuplas) al formato solicitado.
+
+    Args:
+        columns: Nombres de columna del cursor
+        rows: Filas devueltas por fetchall/fetchmany
+        row_format: Formato de salida
+
+    Returns:
+        Lista de dicts, TupleRows, lista de registros o ColumnBatch
+    """
+    if row_format == RowFormat.TUPLE:
+        return TupleRows(columns, rows)
+    if row_format == RowFormat.RECORD:
+        cls = record_class(tuple(columns))
+        return [cls(*row) for row in rows]
+    if row_format == RowFormat.COLUMNS:
+        return ColumnBatch.from_rows(columns, rows)
+    return [dict(zip(columns, row)) for row in rows]
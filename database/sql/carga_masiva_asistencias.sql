@@ -0,0 +1,90 @@
+-- Carga masiva de asistencias en el servidor.
+-- El cliente escribe las filas normalizadas en un CSV temporal y las sube con
+-- LOAD DATA LOCAL INFILE a la tabla de paso carga_asistencia (una carga por
+-- conexión, identificada por CONNECTION_ID()). sp_fusionar_carga_asistencias
+-- valida y fusiona la carga con sentencias por conjunto: rechaza filas
+-- incompletas o con empleado/turno inexistente, marca las repetidas y las ya
+-- registradas e inserta el resto con un solo INSERT ... SELECT. Las horas
+-- extras las sigue calculando el trigger de inserción del servidor, que no
+-- se modifica.
+--
+-- Requiere local_infile=ON en el servidor y 'local_infile': true en
+-- config/db_config.json.
+
+CREATE TABLE IF NOT EXISTS carga_asistencia (
+    id_carga BIGINT UNSIGNED NOT NULL,
+    linea INT UNSIGNED NOT NULL,
+    fecha DATE NULL,
+    codigo_empleado VARCHAR(20) NULL,
+    codigo_turno VARCHAR(10) NULL,
+    dia VARCHAR(15) NULL,
+    marca_entrada TIME NULL,
+    marca_salida TIME NULL,
+    -- N: nueva, R: rechazada, D: repetida en la carga, E: ya registrada
+    estado CHAR(1) NOT NULL DEFAULT 'N',
+    motivo VARCHAR(120) NULL,
+    PRIMARY KEY (id_carga, linea),
+    INDEX idx_carga_clave (id_carga, fecha, codigo_empleado)
+) ENGINE=InnoDB;
+
+DROP PROCEDURE IF EXISTS sp_fusionar_carga_asistencias;
+
+DELIMITER $$
+
+-- Fusiona la carga de la conexión actual en reporte_asistencia.
+-- Devuelve las líneas no insertadas (linea, estado, motivo) y vacía la carga.
+-- Debe ejecutarse en la misma transacción que el LOAD DATA.
+CREATE PROCEDURE sp_fusionar_carga_asistencias()
+BEGIN
+    DECLARE v_carga BIGINT UNSIGNED DEFAULT CONNECTION_ID();
+
+    -- 1. Datos mínimos, empleado y turno
+    UPDATE carga_asistencia c
+    LEFT JOIN empleados e ON e.codigo = c.codigo_empleado
+    LEFT JOIN turnos t ON t.codigo_turno = c.codigo_turno
+    SET c.estado = 'R',
+        c.motivo = CASE
+            WHEN c.fecha IS NULL OR c.codigo_empleado IS NULL OR c.codigo_turno IS NULL
+                THEN 'Faltan fecha, código de empleado o turno'
+            WHEN e.codigo IS NULL THEN CONCAT('No se encontró el empleado ', c.codigo_empleado)
+            ELSE CONCAT('No se encontró el turno ', c.codigo_turno)
+        END
+    WHERE c.id_carga = v_carga
+      AND (c.fecha IS NULL OR c.codigo_empleado IS NULL OR c.codigo_turno IS NULL
+           OR e.codigo IS NULL OR t.codigo_turno IS NULL);
+
+    -- 2. Claves repetidas en la carga: se conserva la primera línea
+    UPDATE carga_asistencia c
+    JOIN (
+        SELECT fecha, codigo_empleado, MIN(linea) AS primera
+        FROM carga_asistencia
+        WHERE id_carga = v_carga AND estado = 'N'
+        GROUP BY fecha, codigo_empleado
+        HAVING COUNT(*) > 1
+    ) r ON r.fecha = c.fecha AND r.codigo_empleado = c.codigo_empleado
+    SET c.estado = 'D'
+    WHERE c.id_carga = v_carga AND c.estado = 'N' AND c.linea > r.primera;
+
+    -- 3. Asistencias ya registradas
+    UPDATE carga_asistencia c
+    JOIN reporte_asistencia ra ON ra.fecha = c.fecha AND ra.codigo_empleado = c.codigo_empleado
+    SET c.estado = 'E'
+    WHERE c.id_carga = v_carga AND c.estado = 'N';
+
+    -- 4. Inserción por conjunto; el trigger calcula las horas extras
+    INSERT INTO reporte_asistencia
+        (fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida)
+    SELECT fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida
+    FROM carga_asistencia
+    WHERE id_carga = v_carga AND estado = 'N'
+    ORDER BY fecha, codigo_empleado;
+
+    SELECT linea, estado, motivo
+    FROM carga_asistencia
+    WHERE id_carga = v_carga AND estado <> 'N'
+    ORDER BY linea;
+
+    DELETE FROM carga_asistencia WHERE id_carga = v_carga;
+END$$
+
+DELIMITER ;
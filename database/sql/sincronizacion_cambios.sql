@@ -0,0 +1,143 @@
+-- Seguimiento de cambios para sincronización incremental (delta sync).
+-- Cada fila de reporte_asistencia y empleados lleva la marca actualizado_en,
+-- mantenida por el servidor (DEFAULT / ON UPDATE CURRENT_TIMESTAMP(6)), y las
+-- eliminaciones quedan registradas en registro_eliminaciones por triggers.
+-- Un cliente que guardó la marca más alta vista (watermark) pide solo las filas
+-- con actualizado_en posterior y las claves eliminadas desde entonces; el
+-- volumen transferido depende de los cambios y no del tamaño de la tabla.
+-- El listado de empleados trae el nombre del centro de coste, por lo que su
+-- marca es la mayor entre la del empleado y la de su centro de coste.
+-- Las eliminaciones se conservan TOMBSTONE_RETENTION_DAYS días
+-- (database/change_sync.py); sp_purgar_eliminaciones borra las anteriores y
+-- un cliente con un watermark más antiguo vuelve a descargar la tabla completa.
+-- Las asistencias que se eliminan y se vuelven a insertar para que el trigger
+-- recalcule las horas extras (bulk_upsert_attendance con 'update',
+-- recompute_overtime_for_shift) no dejan eliminación registrada: al insertar
+-- una clave se borran sus eliminaciones previas, ya que la fila nueva (con
+-- actualizado_en posterior) reemplaza a la anterior en las réplicas.
+
+ALTER TABLE reporte_asistencia
+    ADD COLUMN actualizado_en TIMESTAMP(6) NOT NULL
+        DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_asistencia_actualizado (actualizado_en);
+
+ALTER TABLE empleados
+    ADD COLUMN actualizado_en TIMESTAMP(6) NOT NULL
+        DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_empleado_actualizado (actualizado_en);
+
+ALTER TABLE centros_coste
+    ADD COLUMN actualizado_en TIMESTAMP(6) NOT NULL
+        DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+CREATE TABLE IF NOT EXISTS registro_eliminaciones (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    tabla VARCHAR(40) NOT NULL,
+    codigo VARCHAR(20) NOT NULL,
+    fecha DATE NULL,
+    eliminado_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    INDEX idx_eliminaciones_tabla (tabla, eliminado_en),
+    INDEX idx_eliminaciones_clave (tabla, codigo, fecha)
+);
+
+DROP TRIGGER IF EXISTS trg_asistencia_eliminada;
+DROP TRIGGER IF EXISTS trg_asistencia_reinsertada;
+DROP TRIGGER IF EXISTS trg_empleado_eliminado;
+DROP PROCEDURE IF EXISTS sp_listar_asistencias_cambios;
+DROP PROCEDURE IF EXISTS sp_listar_empleados_cambios;
+DROP PROCEDURE IF EXISTS sp_listar_eliminados;
+DROP PROCEDURE IF EXISTS sp_purgar_eliminaciones;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_asistencia_eliminada
+AFTER DELETE ON reporte_asistencia
+FOR EACH ROW
+BEGIN
+    INSERT INTO registro_eliminaciones (tabla, codigo, fecha)
+    VALUES ('reporte_asistencia', OLD.codigo_empleado, OLD.fecha);
+END$$
+
+CREATE TRIGGER trg_asistencia_reinsertada
+AFTER INSERT ON reporte_asistencia
+FOR EACH ROW
+BEGIN
+    DELETE FROM registro_eliminaciones
+    WHERE tabla = 'reporte_asistencia'
+      AND codigo = NEW.codigo_empleado
+      AND fecha = NEW.fecha;
+END$$
+
+CREATE TRIGGER trg_empleado_eliminado
+AFTER DELETE ON empleados
+FOR EACH ROW
+BEGIN
+    INSERT INTO registro_eliminaciones (tabla, codigo, fecha)
+    VALUES ('empleados', OLD.codigo, NULL);
+END$$
+
+-- Mismas columnas que sp_listar_asistencias más actualizado_en.
+-- p_desde NULL entrega la tabla completa (primera sincronización).
+CREATE PROCEDURE sp_listar_asistencias_cambios(IN p_desde TIMESTAMP(6))
+BEGIN
+    SELECT ra.fecha AS fecha_asistencia,
+           ra.codigo_empleado,
+           e.nombre AS nombre_empleado,
+           ra.codigo_turno,
+           t.hora_entrada AS turno_entrada,
+           t.hora_salida AS turno_salida,
+           ra.dia,
+           ra.marca_entrada,
+           ra.marca_salida,
+           ROUND(TIME_TO_SEC(
+               IF(ra.marca_salida < ra.marca_entrada,
+                  ADDTIME(TIMEDIFF(ra.marca_salida, ra.marca_entrada), '24:00:00'),
+                  TIMEDIFF(ra.marca_salida, ra.marca_entrada))
+           ) / 3600, 2) AS horas_trabajadas,
+           ra.h25,
+           ra.h35,
+           ra.h100,
+           ra.actualizado_en
+    FROM reporte_asistencia ra
+    JOIN empleados e ON e.codigo = ra.codigo_empleado
+    LEFT JOIN turnos t ON t.codigo_turno = ra.codigo_turno
+    WHERE p_desde IS NULL OR ra.actualizado_en > p_desde
+    ORDER BY ra.actualizado_en;
+END$$
+
+-- Mismas columnas que sp_listar_empleados más actualizado_en, que también
+-- avanza cuando cambia el centro de coste del empleado (p.ej. su nombre).
+CREATE PROCEDURE sp_listar_empleados_cambios(IN p_desde TIMESTAMP(6))
+BEGIN
+    SELECT e.codigo,
+           e.nombre,
+           e.dni,
+           e.puesto,
+           e.unidad_organizativa,
+           e.codigo_centro_coste,
+           cc.nombre AS centro_coste,
+           e.subdivision,
+           GREATEST(e.actualizado_en, COALESCE(cc.actualizado_en, e.actualizado_en)) AS actualizado_en
+    FROM empleados e
+    LEFT JOIN centros_coste cc ON cc.codigo = e.codigo_centro_coste
+    WHERE p_desde IS NULL OR e.actualizado_en > p_desde OR cc.actualizado_en > p_desde
+    ORDER BY actualizado_en;
+END$$
+
+CREATE PROCEDURE sp_listar_eliminados(IN p_tabla VARCHAR(40), IN p_desde TIMESTAMP(6))
+BEGIN
+    SELECT codigo, fecha, eliminado_en
+    FROM registro_eliminaciones
+    WHERE tabla = p_tabla
+      AND (p_desde IS NULL OR eliminado_en > p_desde)
+    ORDER BY eliminado_en;
+END$$
+
+-- Borra las eliminaciones registradas antes de p_antes; devuelve cuántas.
+CREATE PROCEDURE sp_purgar_eliminaciones(IN p_antes TIMESTAMP(6))
+BEGIN
+    DELETE FROM registro_eliminaciones WHERE eliminado_en < p_antes;
+    SELECT ROW_COUNT() AS eliminadas;
+END$$
+
+DELIMITER ;
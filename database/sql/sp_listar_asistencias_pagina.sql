@@ -0,0 +1,55 @@
+-- Listado paginado de asistencias por clave (keyset).
+-- Mismas columnas que sp_listar_asistencias / sp_filtrar_asistencias, ordenadas
+-- por la clave primaria (fecha, codigo_empleado) en sentido descendente.
+-- p_cursor_fecha / p_cursor_codigo son la clave de la última fila de la página
+-- anterior (NULL para la primera). Con ambas columnas en el mismo sentido el
+-- servidor recorre el índice primario hacia atrás desde el cursor y se detiene
+-- tras p_limite filas, por lo que cada página cuesta lo mismo que la primera.
+-- Mezclar sentidos (fecha DESC, código ASC) obligaría a leer y ordenar todas
+-- las filas anteriores al cursor.
+
+DROP PROCEDURE IF EXISTS sp_listar_asistencias_pagina;
+
+DELIMITER $$
+
+CREATE PROCEDURE sp_listar_asistencias_pagina(
+    IN p_termino VARCHAR(120),
+    IN p_fecha_inicio DATE,
+    IN p_fecha_fin DATE,
+    IN p_codigo_empleado VARCHAR(20),
+    IN p_cursor_fecha DATE,
+    IN p_cursor_codigo VARCHAR(20),
+    IN p_limite INT
+)
+BEGIN
+    SELECT ra.fecha AS fecha_asistencia,
+           ra.codigo_empleado,
+           e.nombre AS nombre_empleado,
+           ra.codigo_turno,
+           t.hora_entrada AS turno_entrada,
+           t.hora_salida AS turno_salida,
+           ra.dia,
+           ra.marca_entrada,
+           ra.marca_salida,
+           ROUND(TIME_TO_SEC(
+               IF(ra.marca_salida < ra.marca_entrada,
+                  ADDTIME(TIMEDIFF(ra.marca_salida, ra.marca_entrada), '24:00:00'),
+                  TIMEDIFF(ra.marca_salida, ra.marca_entrada))
+           ) / 3600, 2) AS horas_trabajadas,
+           ra.h25,
+           ra.h35,
+           ra.h100
+    FROM reporte_asistencia ra
+    JOIN empleados e ON e.codigo = ra.codigo_empleado
+    LEFT JOIN turnos t ON t.codigo_turno = ra.codigo_turno
+    WHERE (p_termino IS NULL OR ra.codigo_empleado LIKE p_termino OR e.nombre LIKE p_termino)
+      AND (p_fecha_inicio IS NULL OR ra.fecha >= p_fecha_inicio)
+      AND (p_fecha_fin IS NULL OR ra.fecha <= p_fecha_fin)
+      AND (p_codigo_empleado IS NULL OR ra.codigo_empleado = p_codigo_empleado)
+      AND (p_cursor_fecha IS NULL
+           OR (ra.fecha, ra.codigo_empleado) < (p_cursor_fecha, p_cursor_codigo))
+    ORDER BY ra.fecha DESC, ra.codigo_empleado DESC
+    LIMIT p_limite;
+END$$
+
+DELIMITER ;
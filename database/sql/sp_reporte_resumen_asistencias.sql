@@ -0,0 +1,30 @@
+-- Resumen agregado de las asistencias que cumplen un filtro.
+-- Mismos parámetros y condiciones que sp_filtrar_asistencias, pero devuelve
+-- una sola fila con los totales en lugar de todas las asistencias.
+
+DROP PROCEDURE IF EXISTS sp_reporte_resumen_asistencias;
+
+DELIMITER $$
+
+CREATE PROCEDURE sp_reporte_resumen_asistencias(
+    IN p_termino VARCHAR(120),
+    IN p_fecha_inicio DATE,
+    IN p_fecha_fin DATE,
+    IN p_codigo_empleado VARCHAR(20)
+)
+BEGIN
+    SELECT COUNT(*) AS registros,
+           COUNT(DISTINCT ra.codigo_empleado) AS empleados,
+           COALESCE(SUM(ra.h25), 0) AS h25,
+           COALESCE(SUM(ra.h35), 0) AS h35,
+           COALESCE(SUM(ra.h100), 0) AS h100,
+           COALESCE(SUM(ra.marca_entrada IS NULL OR ra.marca_salida IS NULL), 0) AS marcas_incompletas
+    FROM reporte_asistencia ra
+    JOIN empleados e ON e.codigo = ra.codigo_empleado
+    WHERE (p_termino IS NULL OR ra.codigo_empleado LIKE p_termino OR e.nombre LIKE p_termino)
+      AND (p_fecha_inicio IS NULL OR ra.fecha >= p_fecha_inicio)
+      AND (p_fecha_fin IS NULL OR ra.fecha <= p_fecha_fin)
+      AND (p_codigo_empleado IS NULL OR ra.codigo_empleado = p_codigo_empleado);
+END$$
+
+DELIMITER ;
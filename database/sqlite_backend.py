@@ -0,0 +1,850 @@
+"""
+Backend SQLite de sustitución
+Descripción: Emula en proceso el esquema y los procedimientos almacenados del
+             servidor MySQL (sp_listar_asistencias, sp_insertar_asistencia,
+             reportes de horas extras, etc.) junto con un sustituto del trigger
+             que calcula las horas extras (regla supuesta, ver
+             database/overtime.py). Permite ejecutar la aplicación, benchmarks y
+             pruebas de rendimiento sin un servidor MySQL.
+
+Uso:
+    db = DatabaseConnection({'backend': 'sqlite', 'sqlite_path': ':memory:'})
+
+Las conexiones imitan la interfaz de mysql.connector (cursor con dictionary,
+callproc/stored_results, CALL con multi=True) y los errores de SQLite se
+traducen a mysql.connector.Error con códigos equivalentes (1062 duplicado,
+1205 bloqueo, 1146 tabla inexistente).
+
+Las fechas y horas se devuelven como texto ISO ('YYYY-MM-DD', 'HH:MM:SS') en
+lugar de date/timedelta.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import random
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mysql.connector import errors
+
+from database.backends import DatabaseBackend, register_backend
+from database.overtime import overtime_hours, to_seconds as _to_seconds, worked_hours
+
+logger = logging.getLogger(__name__)
+
+ResultSet = Tuple[Tuple[str, ...], List[tuple]]
+Procedure = Callable[[sqlite3.Connection, Tuple[Any, ...]], List[ResultSet]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS centros_coste (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    actualizado_en TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS areas (
+    puesto TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS turnos (
+    codigo_turno TEXT PRIMARY KEY,
+    hora_entrada TEXT NOT NULL,
+    hora_salida TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS empleados (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    dni TEXT UNIQUE,
+    puesto TEXT,
+    codigo_centro_coste TEXT REFERENCES centros_coste(codigo),
+    subdivision TEXT,
+    unidad_organizativa TEXT,
+    actualizado_en TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS reporte_asistencia (
+    fecha TEXT NOT NULL,
+    codigo_empleado TEXT NOT NULL REFERENCES empleados(codigo),
+    codigo_turno TEXT REFERENCES turnos(codigo_turno),
+    dia TEXT,
+    marca_entrada TEXT,
+    marca_salida TEXT,
+    h25 REAL NOT NULL DEFAULT 0,
+    h35 REAL NOT NULL DEFAULT 0,
+    h100 REAL NOT NULL DEFAULT 0,
+    actualizado_en TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    PRIMARY KEY (fecha, codigo_empleado)
+);
+CREATE INDEX IF NOT EXISTS idx_asistencia_empleado ON reporte_asistencia (codigo_empleado, fecha);
+CREATE INDEX IF NOT EXISTS idx_asistencia_actualizado ON reporte_asistencia (actualizado_en);
+CREATE INDEX IF NOT EXISTS idx_empleado_actualizado ON empleados (actualizado_en);
+CREATE TABLE IF NOT EXISTS registro_eliminaciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tabla TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    fecha TEXT,
+    eliminado_en TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_eliminaciones_tabla ON registro_eliminaciones (tabla, eliminado_en);
+CREATE INDEX IF NOT EXISTS idx_eliminaciones_clave ON registro_eliminaciones (tabla, codigo, fecha);
+
+-- Sustituto del trigger de MySQL que calcula las horas extras al insertar
+-- (regla supuesta de database/overtime.py)
+CREATE TRIGGER IF NOT EXISTS trg_asistencia_sobretiempo
+AFTER INSERT ON reporte_asistencia
+BEGIN
+    UPDATE reporte_asistencia
+    SET h25 = sobretiempo(NEW.dia, t.hora_entrada, t.hora_salida, NEW.marca_entrada, NEW.marca_salida, 25),
+        h35 = sobretiempo(NEW.dia, t.hora_entrada, t.hora_salida, NEW.marca_entrada, NEW.marca_salida, 35),
+        h100 = sobretiempo(NEW.dia, t.hora_entrada, t.hora_salida, NEW.marca_entrada, NEW.marca_salida, 100)
+    FROM (SELECT hora_entrada, hora_salida FROM turnos WHERE codigo_turno = NEW.codigo_turno) AS t
+    WHERE fecha = NEW.fecha AND codigo_empleado = NEW.codigo_empleado;
+END;
+
+-- Equivalente de ON UPDATE CURRENT_TIMESTAMP(6) y de los triggers de
+-- registro_eliminaciones (database/sql/sincronizacion_cambios.sql)
+CREATE TRIGGER IF NOT EXISTS trg_asistencia_actualizada
+AFTER UPDATE ON reporte_asistencia
+WHEN NEW.actualizado_en IS OLD.actualizado_en
+BEGIN
+    UPDATE reporte_asistencia SET actualizado_en = (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    WHERE fecha = NEW.fecha AND codigo_empleado = NEW.codigo_empleado;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_empleado_actualizado
+AFTER UPDATE ON empleados
+WHEN NEW.actualizado_en IS OLD.actualizado_en
+BEGIN
+    UPDATE empleados SET actualizado_en = (strftime('%Y-%m-%d %H:%M:%f', 'now')) WHERE codigo = NEW.codigo;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_centro_coste_actualizado
+AFTER UPDATE ON centros_coste
+WHEN NEW.actualizado_en IS OLD.actualizado_en
+BEGIN
+    UPDATE centros_coste SET actualizado_en = (strftime('%Y-%m-%d %H:%M:%f', 'now')) WHERE codigo = NEW.codigo;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_asistencia_eliminada
+AFTER DELETE ON reporte_asistencia
+BEGIN
+    INSERT INTO registro_eliminaciones (tabla, codigo, fecha)
+    VALUES ('reporte_asistencia', OLD.codigo_empleado, OLD.fecha);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_asistencia_reinsertada
+AFTER INSERT ON reporte_asistencia
+BEGIN
+    DELETE FROM registro_eliminaciones
+    WHERE tabla = 'reporte_asistencia' AND codigo = NEW.codigo_empleado AND fecha = NEW.fecha;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_empleado_eliminado
+AFTER DELETE ON empleados
+BEGIN
+    INSERT INTO registro_eliminaciones (tabla, codigo, fecha) VALUES ('empleados', OLD.codigo, NULL);
+END;
+"""
+
+# Datos de referencia mínimos (turnos usados por la importación)
+REFERENCE_DATA = {
+    'turnos': [
+        ('M01', '07:00:00', '15:00:00'),
+        ('M02', '08:00:00', '16:00:00'),
+        ('T01', '15:00:00', '23:00:00'),
+        ('N01', '22:00:00', '06:00:00'),
+    ],
+    'centros_coste': [
+        ('CC001', 'Administración'),
+        ('CC002', 'Producción'),
+        ('CC003', 'Logística'),
+    ],
+    'areas': [
+        ('Operario',),
+        ('Supervisor',),
+        ('Asistente',),
+    ],
+}
+
+DAY_NAMES = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+
+
+# ----------------------------------------------------------------------
+# Cálculo de horas (funciones registradas en cada conexión; la regla vive en
+# database.overtime para compartirla con el cálculo por lotes)
+# ----------------------------------------------------------------------
+def _sobretiempo(dia: Any, turno_entrada: Any, turno_salida: Any,
+                 marca_entrada: Any, marca_salida: Any, tasa: int) -> float:
+    h25, h35, h100 = overtime_hours(dia, turno_entrada, turno_salida, marca_entrada, marca_salida)
+    return {25: h25, 35: h35, 100: h100}.get(int(tasa), 0.0)
+
+
+def _addtime(value: Any, delta: Any) -> Optional[str]:
+    base = _to_seconds(value)
+    extra = _to_seconds(delta)
+    if base is None or extra is None:
+        return None
+    total = base + extra
+    return f"{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+# ----------------------------------------------------------------------
+# Traducción de SQL y errores
+# ----------------------------------------------------------------------
+_CALL_RE = re.compile(r'^\s*CALL\s+([A-Za-z_][A-Za-z0-9_]*)\s*\((.*)\)\s*;?\s*$', re.IGNORECASE | re.DOTALL)
+
+_SQL_REWRITES = (
+    (re.compile(r'@@character_set_database', re.IGNORECASE), "'utf8mb4'"),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE), 'INSERT OR IGNORE'),
+)
+
+
+@lru_cache(maxsize=256)
+def translate_sql(query: str) -> str:
+    """Adapta una sentencia con marcadores %s y funciones de MySQL a SQLite."""
+    sql = query.replace('%%', '\0').replace('%s', '?').replace('\0', '%')
+    for pattern, replacement in _SQL_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def _map_error(error: sqlite3.Error) -> errors.Error:
+    """Traduce una excepción de SQLite al error equivalente de mysql.connector."""
+    message = str(error)
+    lowered = message.lower()
+    if isinstance(error, sqlite3.IntegrityError):
+        if 'unique' in lowered or 'primary key' in lowered:
+            return errors.IntegrityError(msg=f"Duplicate entry: {message}", errno=1062)
+        if 'foreign key' in lowered:
+            return errors.IntegrityError(msg=message, errno=1452)
+        return errors.IntegrityError(msg=message, errno=1048)
+    if 'locked' in lowered or 'busy' in lowered:
+        return errors.OperationalError(msg=f"Lock wait timeout exceeded: {message}", errno=1205)
+    if 'no such table' in lowered:
+        return errors.ProgrammingError(msg=message, errno=1146)
+    if isinstance(error, sqlite3.ProgrammingError) and 'closed' in lowered:
+        return errors.OperationalError(msg=f"MySQL Connection not available: {message}", errno=2055)
+    return errors.DatabaseError(msg=message, errno=1064)
+
+
+# ----------------------------------------------------------------------
+# Procedimientos almacenados emulados
+# ----------------------------------------------------------------------
+PROCEDURES: Dict[str, Procedure] = {}
+
+
+def procedure(name: str) -> Callable[[Procedure], Procedure]:
+    """Registra una función Python como procedimiento almacenado."""
+    def decorator(fn: Procedure) -> Procedure:
+        PROCEDURES[name] = fn
+        return fn
+    return decorator
+
+
+def _select(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> ResultSet:
+    cursor = conn.execute(sql, tuple(params))
+    columns = tuple(d[0] for d in cursor.description or ())
+    return columns, cursor.fetchall()
+
+
+def _status(affected: int, message: str) -> List[ResultSet]:
+    """Resultado de los procedimientos de escritura (affected_rows, message)."""
+    return [(('affected_rows', 'message'), [(affected, message)])]
+
+
+def _arg(params: Tuple[Any, ...], index: int) -> Any:
+    return params[index] if index < len(params) else None
+
+
+_ATTENDANCE_SELECT = """
+    SELECT ra.fecha AS fecha_asistencia, ra.codigo_empleado, e.nombre AS nombre_empleado,
+           ra.codigo_turno, t.hora_entrada AS turno_entrada, t.hora_salida AS turno_salida,
+           ra.dia, ra.marca_entrada, ra.marca_salida,
+           horas_trabajadas(ra.marca_entrada, ra.marca_salida) AS horas_trabajadas,
+           ra.h25, ra.h35, ra.h100
+    FROM reporte_asistencia ra
+    JOIN empleados e ON e.codigo = ra.codigo_empleado
+    LEFT JOIN turnos t ON t.codigo_turno = ra.codigo_turno
+"""
+
+_EMPLOYEE_SELECT = """
+    SELECT e.codigo, e.nombre, e.dni, e.puesto, e.unidad_organizativa,
+           e.codigo_centro_coste, cc.nombre AS centro_coste, e.subdivision
+    FROM empleados e
+    LEFT JOIN centros_coste cc ON cc.codigo = e.codigo_centro_coste
+"""
+
+
+@procedure('sp_listar_asistencias')
+def _sp_listar_asistencias(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, _ATTENDANCE_SELECT + " ORDER BY ra.fecha DESC, ra.codigo_empleado")]
+
+
+@procedure('sp_filtrar_asistencias')
+def _sp_filtrar_asistencias(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    termino, inicio, fin, codigo = (_arg(params, i) for i in range(4))
+    sql = _ATTENDANCE_SELECT + """
+        WHERE (? IS NULL OR ra.codigo_empleado LIKE ? OR e.nombre LIKE ?)
+          AND (? IS NULL OR ra.fecha >= ?)
+          AND (? IS NULL OR ra.fecha <= ?)
+          AND (? IS NULL OR ra.codigo_empleado = ?)
+        ORDER BY ra.fecha DESC, ra.codigo_empleado
+    """
+    return [_select(conn, sql, (termino, termino, termino, inicio, inicio, fin, fin, codigo, codigo))]
+
+
+@procedure('sp_reporte_resumen_asistencias')
+def _sp_reporte_resumen_asistencias(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    termino, inicio, fin, codigo = (_arg(params, i) for i in range(4))
+    sql = """
+        SELECT COUNT(*) AS registros,
+               COUNT(DISTINCT ra.codigo_empleado) AS empleados,
+               COALESCE(SUM(ra.h25), 0) AS h25,
+               COALESCE(SUM(ra.h35), 0) AS h35,
+               COALESCE(SUM(ra.h100), 0) AS h100,
+               COALESCE(SUM(ra.marca_entrada IS NULL OR ra.marca_salida IS NULL), 0) AS marcas_incompletas
+        FROM reporte_asistencia ra
+        JOIN empleados e ON e.codigo = ra.codigo_empleado
+        WHERE (? IS NULL OR ra.codigo_empleado LIKE ? OR e.nombre LIKE ?)
+          AND (? IS NULL OR ra.fecha >= ?)
+          AND (? IS NULL OR ra.fecha <= ?)
+          AND (? IS NULL OR ra.codigo_empleado = ?)
+    """
+    return [_select(conn, sql, (termino, termino, termino, inicio, inicio, fin, fin, codigo, codigo))]
+
+
+@procedure('sp_listar_asistencias_pagina')
+def _sp_listar_asistencias_pagina(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    termino, inicio, fin, codigo, cursor_fecha, cursor_codigo, limite = (_arg(params, i) for i in range(7))
+    # Orden (fecha, codigo) DESC: la siguiente página empieza antes de la clave del cursor
+    sql = _ATTENDANCE_SELECT + """
+        WHERE (? IS NULL OR ra.codigo_empleado LIKE ? OR e.nombre LIKE ?)
+          AND (? IS NULL OR ra.fecha >= ?)
+          AND (? IS NULL OR ra.fecha <= ?)
+          AND (? IS NULL OR ra.codigo_empleado = ?)
+          AND (? IS NULL OR (ra.fecha, ra.codigo_empleado) < (?, ?))
+        ORDER BY ra.fecha DESC, ra.codigo_empleado DESC
+        LIMIT ?
+    """
+    return [_select(conn, sql, (
+        termino, termino, termino, inicio, inicio, fin, fin, codigo, codigo,
+        cursor_fecha, cursor_fecha, cursor_codigo, int(limite or 100),
+    ))]
+
+
+@procedure('sp_listar_asistencias_cambios')
+def _sp_listar_asistencias_cambios(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    desde = _arg(params, 0)
+    sql = _ATTENDANCE_SELECT.replace(
+        "ra.h25, ra.h35, ra.h100", "ra.h25, ra.h35, ra.h100, ra.actualizado_en"
+    ) + " WHERE ? IS NULL OR ra.actualizado_en > ? ORDER BY ra.actualizado_en"
+    return [_select(conn, sql, (desde, desde))]
+
+
+@procedure('sp_insertar_asistencia')
+def _sp_insertar_asistencia(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    fecha, codigo, turno, dia, entrada, salida = (_arg(params, i) for i in range(6))
+    if conn.execute("SELECT 1 FROM empleados WHERE codigo = ?", (codigo,)).fetchone() is None:
+        return _status(0, f"No se encontró el empleado {codigo}")
+    cursor = conn.execute(
+        "INSERT INTO reporte_asistencia (fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (fecha, codigo, turno, dia, entrada, salida),
+    )
+    return _status(cursor.rowcount, "Asistencia registrada correctamente")
+
+
+@procedure('sp_actualizar_asistencia')
+def _sp_actualizar_asistencia(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    fecha, codigo, turno, dia, entrada, salida, h25, h35, h100 = (_arg(params, i) for i in range(9))
+    cursor = conn.execute(
+        "UPDATE reporte_asistencia SET codigo_turno = ?, dia = ?, marca_entrada = ?, marca_salida = ?, "
+        "h25 = ?, h35 = ?, h100 = ? WHERE fecha = ? AND codigo_empleado = ?",
+        (turno, dia, entrada, salida, h25 or 0, h35 or 0, h100 or 0, fecha, codigo),
+    )
+    if cursor.rowcount == 0:
+        return _status(0, "No se encontró el registro de asistencia solicitado")
+    return _status(cursor.rowcount, "Asistencia actualizada correctamente")
+
+
+@procedure('sp_eliminar_asistencia')
+def _sp_eliminar_asistencia(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    cursor = conn.execute(
+        "DELETE FROM reporte_asistencia WHERE fecha = ? AND codigo_empleado = ?",
+        (_arg(params, 0), _arg(params, 1)),
+    )
+    if cursor.rowcount == 0:
+        return _status(0, "No se encontró el registro a eliminar")
+    return _status(cursor.rowcount, "Asistencia eliminada correctamente")
+
+
+@procedure('sp_listar_empleados')
+def _sp_listar_empleados(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, _EMPLOYEE_SELECT + " ORDER BY e.codigo")]
+
+
+@procedure('sp_buscar_empleados')
+def _sp_buscar_empleados(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    term = _arg(params, 0)
+    sql = _EMPLOYEE_SELECT + " WHERE e.codigo LIKE ? OR e.nombre LIKE ? OR e.dni LIKE ? ORDER BY e.codigo"
+    return [_select(conn, sql, (term, term, term))]
+
+
+@procedure('sp_obtener_empleado')
+def _sp_obtener_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, _EMPLOYEE_SELECT + " WHERE e.codigo = ?", (_arg(params, 0),))]
+
+
+@procedure('sp_listar_empleados_cambios')
+def _sp_listar_empleados_cambios(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    desde = _arg(params, 0)
+    stamp = "MAX(e.actualizado_en, COALESCE(cc.actualizado_en, e.actualizado_en))"
+    sql = _EMPLOYEE_SELECT.replace("e.subdivision", f"e.subdivision, {stamp} AS actualizado_en", 1) + (
+        " WHERE ? IS NULL OR e.actualizado_en > ? OR cc.actualizado_en > ? ORDER BY actualizado_en"
+    )
+    return [_select(conn, sql, (desde, desde, desde))]
+
+
+@procedure('sp_listar_eliminados')
+def _sp_listar_eliminados(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    tabla, desde = _arg(params, 0), _arg(params, 1)
+    return [_select(conn, (
+        "SELECT codigo, fecha, eliminado_en FROM registro_eliminaciones "
+        "WHERE tabla = ? AND (? IS NULL OR eliminado_en > ?) ORDER BY eliminado_en"
+    ), (tabla, desde, desde))]
+
+
+@procedure('sp_purgar_eliminaciones')
+def _sp_purgar_eliminaciones(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    deleted = conn.execute("DELETE FROM registro_eliminaciones WHERE eliminado_en < ?", (_arg(params, 0),)).rowcount
+    return [(('eliminadas',), [(deleted,)])]
+
+
+@procedure('sp_insertar_empleado')
+def _sp_insertar_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    codigo, nombre, dni, puesto, centro, subdivision = (_arg(params, i) for i in range(6))
+    cursor = conn.execute(
+        "INSERT INTO empleados (codigo, nombre, dni, puesto, codigo_centro_coste, subdivision) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (codigo, nombre, dni, puesto, centro, subdivision),
+    )
+    return _status(cursor.rowcount, f"Empleado {codigo} creado correctamente")
+
+
+@procedure('sp_actualizar_empleado')
+def _sp_actualizar_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    codigo, nombre, dni, puesto, centro, subdivision = (_arg(params, i) for i in range(6))
+    cursor = conn.execute(
+        "UPDATE empleados SET nombre = ?, dni = ?, puesto = ?, codigo_centro_coste = ?, subdivision = ? "
+        "WHERE codigo = ?",
+        (nombre, dni, puesto, centro, subdivision, codigo),
+    )
+    if cursor.rowcount == 0:
+        return _status(0, "No se encontró el empleado solicitado")
+    return _status(cursor.rowcount, "Empleado actualizado correctamente")
+
+
+@procedure('sp_eliminar_empleado')
+def _sp_eliminar_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    codigo = _arg(params, 0)
+    conn.execute("DELETE FROM reporte_asistencia WHERE codigo_empleado = ?", (codigo,))
+    cursor = conn.execute("DELETE FROM empleados WHERE codigo = ?", (codigo,))
+    if cursor.rowcount == 0:
+        return _status(0, "No se encontró el empleado solicitado")
+    return _status(cursor.rowcount, f"Empleado {codigo} eliminado correctamente")
+
+
+@procedure('sp_generar_codigo_empleado')
+def _sp_generar_codigo_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    row = conn.execute(
+        "SELECT MAX(CAST(SUBSTR(codigo, 2) AS INTEGER)) FROM empleados WHERE codigo LIKE 'E%'"
+    ).fetchone()
+    return [(('codigo',), [(f"E{(row[0] or 0) + 1:05d}",)])]
+
+
+@procedure('sp_listar_centros_coste')
+def _sp_listar_centros_coste(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, "SELECT codigo, nombre FROM centros_coste ORDER BY codigo")]
+
+
+@procedure('sp_listar_areas')
+def _sp_listar_areas(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, "SELECT puesto FROM areas ORDER BY puesto")]
+
+
+@procedure('sp_listar_turnos')
+def _sp_listar_turnos(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    return [_select(conn, "SELECT codigo_turno, hora_entrada, hora_salida FROM turnos ORDER BY codigo_turno")]
+
+
+@procedure('sp_reporte_horas_extras_empleado')
+def _sp_reporte_horas_extras_empleado(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    inicio, fin, codigo = (_arg(params, i) for i in range(3))
+    sql = """
+        SELECT e.codigo AS codigo_empleado, e.nombre AS nombre_empleado, e.codigo_centro_coste,
+               ROUND(SUM(ra.h25), 2) AS total_horas_25,
+               ROUND(SUM(ra.h35), 2) AS total_horas_35,
+               ROUND(SUM(ra.h100), 2) AS total_horas_100
+        FROM reporte_asistencia ra
+        JOIN empleados e ON e.codigo = ra.codigo_empleado
+        WHERE ra.fecha BETWEEN ? AND ? AND (? IS NULL OR ra.codigo_empleado = ?)
+        GROUP BY e.codigo, e.nombre, e.codigo_centro_coste
+        ORDER BY e.codigo_centro_coste, e.codigo
+    """
+    return [_select(conn, sql, (inicio, fin, codigo, codigo))]
+
+
+@procedure('sp_reporte_horas_extras_centro_coste')
+def _sp_reporte_horas_extras_centro_coste(conn: sqlite3.Connection, params: Tuple[Any, ...]) -> List[ResultSet]:
+    sql = """
+        SELECT cc.codigo AS codigo_centro_coste, cc.nombre AS nombre_centro_coste,
+               ROUND(SUM(ra.h25), 2) AS total_horas_25,
+               ROUND(SUM(ra.h35), 2) AS total_horas_35,
+               ROUND(SUM(ra.h100), 2) AS total_horas_100
+        FROM reporte_asistencia ra
+        JOIN empleados e ON e.codigo = ra.codigo_empleado
+        JOIN centros_coste cc ON cc.codigo = e.codigo_centro_coste
+        WHERE ra.fecha BETWEEN ? AND ?
+        GROUP BY cc.codigo, cc.nombre
+        ORDER BY cc.codigo
+    """
+    return [_select(conn, sql, (_arg(params, 0), _arg(params, 1)))]
+
+
+# ----------------------------------------------------------------------
+# Conexión y cursor compatibles con mysql.connector
+# ----------------------------------------------------------------------
+class _Result:
+    """Conjunto de resultados ya materializado (procedimientos y CALL)."""
+
+    def __init__(self, columns: Tuple[str, ...], rows: List[tuple], dictionary: bool):
+        self.column_names = columns
+        self.description = [(name, None, None, None, None, None, True) for name in columns]
+        self.with_rows = bool(columns)
+        self.rowcount = len(rows)
+        self._rows = rows
+        self._pos = 0
+        self._dictionary = dictionary
+
+    def _shape(self, rows: List[tuple]) -> List[Any]:
+        if self._dictionary:
+            return [dict(zip(self.column_names, row)) for row in rows]
+        return rows
+
+    def fetchone(self) -> Any:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return self._shape(rows)
+
+    def fetchall(self) -> List[Any]:
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return self._shape(rows)
+
+
+class SQLiteCursor:
+    """Cursor con la interfaz usada por DatabaseConnection."""
+
+    def __init__(self, connection: "SQLiteConnection", dictionary: bool = False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._result: Optional[_Result] = None
+        self._stored: List[_Result] = []
+        self.lastrowid: Optional[int] = None
+        self.rowcount = -1
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        if self._result is not None:
+            return self._result.column_names
+        if self._cursor is not None and self._cursor.description:
+            return tuple(d[0] for d in self._cursor.description)
+        return ()
+
+    @property
+    def description(self) -> Any:
+        if self._result is not None:
+            return self._result.description
+        return self._cursor.description if self._cursor is not None else None
+
+    @property
+    def with_rows(self) -> bool:
+        return bool(self.column_names)
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None, multi: bool = False) -> Any:
+        params = tuple(params or ())
+        if multi:
+            return self._execute_multi(operation, params)
+        call = _CALL_RE.match(operation)
+        if call is not None:
+            result_sets = self._run_procedure(call.group(1), params)
+            self._result = result_sets[0] if result_sets else _Result((), [], self._dictionary)
+            return None
+        self._result = None
+        try:
+            self._cursor = self._connection.raw.execute(translate_sql(operation), params)
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return None
+
+    def executemany(self, operation: str, seq_params: Sequence[Sequence[Any]]) -> None:
+        self._result = None
+        try:
+            self._cursor = self._connection.raw.executemany(translate_sql(operation), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+
+    def _execute_multi(self, operation: str, params: Tuple[Any, ...]) -> Iterator[Any]:
+        call = _CALL_RE.match(operation)
+        if call is None:
+            self.execute(operation, params)
+            yield self
+            return
+        for result in self._run_procedure(call.group(1), params):
+            yield result
+
+    def callproc(self, procname: str, args: Sequence[Any] = ()) -> Tuple[Any, ...]:
+        self._stored = self._run_procedure(procname, tuple(args))
+        return tuple(args)
+
+    def stored_results(self) -> Iterator[_Result]:
+        return iter(self._stored)
+
+    def _run_procedure(self, name: str, params: Tuple[Any, ...]) -> List[_Result]:
+        fn = PROCEDURES.get(name)
+        if fn is None:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {name} does not exist", errno=1305)
+        try:
+            result_sets = fn(self._connection.raw, params)
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+        results = [_Result(columns, rows, self._dictionary) for columns, rows in result_sets]
+        self.rowcount = sum(result.rowcount for result in results)
+        return results
+
+    def _source(self) -> Any:
+        if self._result is not None:
+            return self._result
+        if self._cursor is None:
+            raise errors.InterfaceError(msg="No result set to fetch from", errno=2053)
+        return self._cursor
+
+    def _shape(self, rows: List[tuple]) -> List[Any]:
+        if self._result is None and self._dictionary:
+            columns = self.column_names
+            return [dict(zip(columns, row)) for row in rows]
+        return rows
+
+    def fetchone(self) -> Any:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        source = self._source()
+        try:
+            return self._shape(source.fetchmany(size))
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def fetchall(self) -> List[Any]:
+        source = self._source()
+        try:
+            return self._shape(source.fetchall())
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def close(self) -> None:
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        self._result = None
+        self._stored = []
+
+
+class SQLiteConnection:
+    """Envoltura de sqlite3.Connection con la interfaz de mysql.connector."""
+
+    unread_result = False
+
+    def __init__(self, raw: sqlite3.Connection, connection_id: int):
+        self.raw = raw
+        self.connection_id = connection_id
+        self._open = True
+
+    def is_connected(self) -> bool:
+        return self._open
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
+        if not self._open:
+            raise errors.InterfaceError(msg="Connection is closed", errno=2006)
+
+    def get_server_info(self) -> str:
+        return f"SQLite {sqlite3.sqlite_version}"
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None, **kwargs: Any) -> SQLiteCursor:
+        if not self._open:
+            raise errors.OperationalError(msg="MySQL Connection not available", errno=2055)
+        return SQLiteCursor(self, dictionary=dictionary)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._open and self.raw.in_transaction
+
+    def start_transaction(self) -> None:
+        if not self.raw.in_transaction:
+            self.raw.execute("BEGIN")
+
+    def commit(self) -> None:
+        try:
+            self.raw.commit()
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def rollback(self) -> None:
+        self.raw.rollback()
+
+    def consume_results(self) -> None:
+        """Los resultados de SQLite no quedan pendientes en un socket."""
+
+    def close(self) -> None:
+        if self._open:
+            self._open = False
+            self.raw.close()
+
+
+class SQLiteBackend(DatabaseBackend):
+    """
+    Backend en proceso. Con ':memory:' la base vive mientras exista el
+    backend (se comparte entre las conexiones del pool); con una ruta de
+    archivo se usa modo WAL para permitir lectores concurrentes.
+    """
+
+    name = 'sqlite'
+
+    _instances = itertools.count(1)
+
+    def __init__(self, path: str = ':memory:', busy_timeout_ms: int = 5000):
+        """
+        Args:
+            path: Archivo de la base o ':memory:'
+            busy_timeout_ms: Espera máxima ante bloqueos antes de fallar con 1205
+        """
+        self.path = path or ':memory:'
+        self.busy_timeout_ms = busy_timeout_ms
+        self._connection_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        if self.path == ':memory:':
+            self._uri = f"file:aplicativo_bd_{next(self._instances)}?mode=memory&cache=shared"
+        else:
+            self._uri = None
+        # Conexión ancla: mantiene viva la base en memoria e inicializa el esquema
+        self._anchor: Optional[sqlite3.Connection] = self._open_raw()
+        self._anchor.executescript(SCHEMA)
+        self._seed_reference_data(self._anchor)
+
+    def _open_raw(self) -> sqlite3.Connection:
+        if self._uri is not None:
+            raw = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        else:
+            raw = sqlite3.connect(self.path, check_same_thread=False)
+            raw.execute("PRAGMA journal_mode=WAL")
+        raw.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        raw.execute("PRAGMA foreign_keys=ON")
+        raw.create_function('sobretiempo', 6, _sobretiempo, deterministic=True)
+        raw.create_function('horas_trabajadas', 2, worked_hours, deterministic=True)
+        raw.create_function('ADDTIME', 2, _addtime, deterministic=True)
+        raw.create_function('CURDATE', 0, lambda: date.today().isoformat())
+        raw.create_function('NOW', 0, lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        raw.create_function('VERSION', 0, lambda: f"{sqlite3.sqlite_version}-sqlite")
+        raw.create_function('DATABASE', 0, lambda: self.path)
+        raw.create_function('USER', 0, lambda: 'sqlite@localhost')
+        return raw
+
+    def connect(self, **kwargs: Any) -> SQLiteConnection:
+        if self._anchor is None:
+            raise errors.InterfaceError(msg="El backend SQLite está cerrado", errno=2003)
+        with self._lock:
+            connection_id = next(self._connection_ids)
+        raw = self._open_raw()
+        raw.create_function('CONNECTION_ID', 0, lambda: connection_id)
+        return SQLiteConnection(raw, connection_id)
+
+    def close(self) -> None:
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+
+    @staticmethod
+    def _seed_reference_data(raw: sqlite3.Connection) -> None:
+        for table, rows in REFERENCE_DATA.items():
+            # Columnas explícitas: las tablas pueden tener columnas extra con valor por defecto
+            columns = [d[0] for d in raw.execute(f"SELECT * FROM {table} LIMIT 0").description][:len(rows[0])]
+            placeholders = ", ".join(["?"] * len(columns))
+            raw.executemany(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        raw.commit()
+
+    def populate(self, employees: int = 100, days: int = 30,
+                 start: Optional[date] = None, seed: int = 0) -> int:
+        """
+        Genera empleados y asistencias sintéticas para benchmarks.
+
+        Args:
+            employees: Número de empleados a crear
+            days: Días de asistencia por empleado
+            start: Primer día (por defecto, ``days`` días antes de hoy)
+            seed: Semilla del generador para obtener datos reproducibles
+
+        Returns:
+            Número de asistencias insertadas
+        """
+        if self._anchor is None:
+            raise errors.InterfaceError(msg="El backend SQLite está cerrado", errno=2003)
+        rng = random.Random(seed)
+        start = start or (date.today() - timedelta(days=days))
+        centers = [row[0] for row in REFERENCE_DATA['centros_coste']]
+        areas = [row[0] for row in REFERENCE_DATA['areas']]
+        shifts = REFERENCE_DATA['turnos']
+
+        raw = self._anchor
+        raw.executemany(
+            "INSERT OR IGNORE INTO empleados (codigo, nombre, dni, puesto, codigo_centro_coste) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (f"E{i:05d}", f"Empleado {i}", f"{10000000 + i}", rng.choice(areas), rng.choice(centers))
+                for i in range(1, employees + 1)
+            ],
+        )
+
+        rows = []
+        for i in range(1, employees + 1):
+            codigo_turno, hora_entrada, _ = shifts[i % len(shifts)]
+            entrada_s = _to_seconds(hora_entrada) or 0
+            for offset in range(days):
+                fecha = start + timedelta(days=offset)
+                entrada = (entrada_s + rng.randint(-600, 900)) % 86400
+                salida = (entrada + 8 * 3600 + rng.choice((0, 0, 1800, 3600, 7200, 10800))) % 86400
+                rows.append((
+                    fecha.isoformat(), f"E{i:05d}", codigo_turno, DAY_NAMES[fecha.weekday()],
+                    f"{entrada // 3600:02d}:{(entrada % 3600) // 60:02d}:00",
+                    f"{salida // 3600:02d}:{(salida % 3600) // 60:02d}:00",
+                ))
+        raw.executemany(
+            "INSERT OR IGNORE INTO reporte_asistencia "
+            "(fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        raw.commit()
+        logger.info(f"Backend SQLite poblado: {employees} empleados, {len(rows)} asistencias")
+        return len(rows)
+
+
+register_backend('sqlite', lambda config: SQLiteBackend(
+    str(config.get('sqlite_path') or ':memory:'),
+))
@@ -0,0 +1,545 @@
+"""
+Lectura de reportes de asistencia (Excel)
+Descripción: Detección de encabezados, del código de empleado y conversión de
+             fechas y horas de los reportes del reloj. No depende de Tkinter
+             ni de la base de datos, por lo que también se ejecuta en procesos
+             de un ProcessPoolExecutor para importar muchos libros a la vez.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from gui.datetime_parsing import (
+    DateColumnParser, TimeColumnParser, day_name, parse_date, parse_time,
+)
+
+# Importar openpyxl para manejo de Excel
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# Filas iniciales donde se buscan los encabezados y el código de empleado
+HEADER_SCAN_ROWS = 20
+# Columnas supuestas cuando no se encuentra la fila de encabezados (Kardex común)
+DEFAULT_COLUMNS: Dict[str, Any] = {'fecha': 0, 'turno': 1, 'entrada': 2, 'salida': 3, 'codigo': None}
+# Extensiones de libro que se toman al importar una carpeta
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+# Texto delimitado exportado por el reloj
+DELIMITED_EXTENSIONS = ('.csv', '.tsv', '.txt')
+DELIMITERS = ',;\t|'
+# Bytes leídos para detectar codificación y separador
+SNIFF_BYTES = 64 * 1024
+# Búfer de lectura de archivos de texto
+READ_BUFFER_BYTES = 1024 * 1024
+# Filas por bloque en la conversión por columnas
+DELIMITED_BLOCK_ROWS = 10000
+# Valores distintos memorizados por columna antes de reiniciar la caché
+MAX_CACHED_VALUES = 100000
+
+# (nro_fila, registro en el orden de ATTENDANCE_FIELDS, turno_original); en
+# importaciones de varios libros la fila se identifica como 'archivo[hoja]:fila'
+ParsedRow = Tuple[Union[int, str], Tuple[Any, ...], Optional[str]]
+
+
+@dataclass
+class ImportStats:
+    """Contadores de la etapa de lectura (los actualiza el generador de filas)."""
+
+    rows: int = 0
+    skipped: int = 0
+    errors: int = 0
+    codes: Set[str] = field(default_factory=set)
+    # Hojas o libros que no se pudieron leer
+    messages: List[str] = field(default_factory=list)
+    files_total: int = 0
+    files_done: int = 0
+
+    def merge(self, other: "ImportStats") -> None:
+        """Suma los contadores de otra lectura (p.ej. de un proceso)."""
+        self.rows += other.rows
+        self.skipped += other.skipped
+        self.errors += other.errors
+        self.codes.update(other.codes)
+        self.messages.extend(other.messages)
+
+
+def cell(row, index):
+    """Valor de una columna; en modo solo lectura las filas pueden venir más cortas."""
+    return row[index] if index < len(row) else None
+
+
+def iter_attendance_rows(rows, first_row, headers_map, codigo_header, stats):
+    """
+    Analiza las filas de datos del reporte y entrega, por cada asistencia
+    válida, (nro_fila, registro, turno_original). No accede a la base de
+    datos: se ejecuta en el hilo de lectura de AttendanceImportWorker.
+    Las filas leídas, sin marcas, con error y los códigos vistos se
+    acumulan en stats (ImportStats).
+    """
+    col_idx_codigo = headers_map.get('codigo')
+    # Un analizador por columna: fija el formato de la columna y memoriza valores
+    parse_fecha = DateColumnParser().parse
+    parse_entrada = TimeColumnParser().parse
+    parse_salida = TimeColumnParser().parse
+
+    for idx, row in enumerate(rows, start=first_row):
+        stats.rows += 1
+        try:
+            # Determinar Código
+            if col_idx_codigo is not None:
+                val_code = cell(row, col_idx_codigo)
+                current_code = str(val_code).strip() if val_code else None
+            else:
+                current_code = codigo_header
+
+            if not current_code:
+                continue
+
+            stats.codes.add(current_code)
+
+            # Validar Fecha
+            fecha_val = cell(row, headers_map['fecha'])
+            if not fecha_val:
+                continue
+
+            fecha_str, dia_semana = parse_fecha(fecha_val)
+            if not fecha_str:
+                continue
+
+            # Validar Turno
+            codigo_turno = "GEN"
+            val_turno_raw = None
+            if headers_map['turno'] is not None:
+                val_turno = cell(row, headers_map['turno'])
+                if val_turno:
+                    val_turno_raw = str(val_turno)
+                    codigo_turno = val_turno_raw.split(' ')[0][:10]
+
+            # Validar Marcas
+            marca_entrada = None
+            marca_salida = None
+
+            if headers_map['entrada'] is not None:
+                marca_entrada = parse_entrada(cell(row, headers_map['entrada']))
+
+            if headers_map['salida'] is not None:
+                marca_salida = parse_salida(cell(row, headers_map['salida']))
+
+            # CRITERIO: Solo importar si hay al menos una marca
+            if not marca_entrada and not marca_salida:
+                stats.skipped += 1
+                continue
+
+            yield idx, (fecha_str, current_code, codigo_turno, dia_semana or "",
+                        marca_entrada, marca_salida), val_turno_raw
+
+        except Exception:
+            stats.errors += 1
+
+
+def extract_employee_code(rows):
+    """
+    Busca en las primeras 15 filas alguna celda que diga 'Código', 'Legajo' o 'DNI'
+    y toma el valor de la celda siguiente o adyacente.
+    Recibe las primeras filas del archivo (tuplas de valores).
+    """
+    keywords = ['código', 'codigo', 'legajo', 'trabajador', 'dni', 'id', 'cod.']
+
+    # Escanear las primeras 15 filas y primeras 10 columnas
+    for row in rows[:15]:
+        row = row[:10]
+        for i, cell_value in enumerate(row):
+            if cell_value and isinstance(cell_value, str):
+                val_lower = cell_value.lower().strip()
+
+                # Caso 1: La celda es exactamente la keyword (o con :)
+                # Ej: "Código" o "Código:"
+                clean_val = val_lower.replace(':', '').strip()
+                if clean_val in keywords:
+                    # El valor está en la celda de la derecha (i+1)
+                    if i + 1 < len(row) and row[i+1]:
+                        return str(row[i+1]).strip()
+
+                # Caso 2: El valor está en la misma celda
+                # Ej: "Código: E001" o "Legajo 1234"
+                for k in keywords:
+                    if val_lower.startswith(k):
+                        # Intentar separar por ':'
+                        if ':' in cell_value:
+                            parts = cell_value.split(':')
+                            if len(parts) > 1:
+                                val = parts[1].strip()
+                                if val: return val
+
+                        # Si no tiene ':', ver si hay algo después de la keyword
+                        # Ej: "Legajo 12345"
+                        # Quitamos la keyword del inicio
+                        remainder = val_lower[len(k):].strip()
+                        if remainder:
+                            # Retornamos la parte correspondiente del string original
+                            # para preservar mayúsculas/minúsculas del código
+                            # Ajuste: buscar la posición de la keyword en el original para cortar bien
+                            start_idx = cell_value.lower().find(k)
+                            if start_idx != -1:
+                                return cell_value[start_idx + len(k):].strip()
+
+    return None
+
+
+def find_column_indexes(rows):
+    """
+    Busca la fila de encabezados de la tabla y mapea las columnas.
+    Recibe las primeras filas del archivo (tuplas de valores).
+    Retorna: (dict_map, row_index)
+    """
+    map_cols: Dict[str, Any] = {'fecha': None, 'turno': None, 'entrada': None, 'salida': None, 'codigo': None}
+    found_header_row = 0
+
+    # Palabras clave para identificar columnas
+    keys_fecha = ['fecha', 'date']
+    keys_turno = ['turno', 'horario']
+    keys_in = ['entrada', 'ingreso', 'inicio', 'in']
+    keys_out = ['salida', 'fin', 'out', 'retiro']
+    keys_code = ['codigo', 'legajo', 'dni', 'trabajador']
+
+    # Buscar hasta la fila 20
+    for r_idx, row in enumerate(rows[:HEADER_SCAN_ROWS], start=1):
+        row_lower = [str(c).lower().strip() if c else '' for c in row]
+
+        # Si encontramos "fecha" y ("entrada" o "ingreso"), es la fila de cabecera
+        # Verificamos si alguna celda contiene alguna de las keywords
+        has_fecha = any(any(k in cell for k in keys_fecha) for cell in row_lower)
+        has_in = any(any(k in cell for k in keys_in) for cell in row_lower)
+        has_out = any(any(k in cell for k in keys_out) for cell in row_lower)
+
+        if has_fecha and (has_in or has_out):
+            found_header_row = r_idx
+
+            # Mapear índices (Priorizar la primera coincidencia encontrada de izquierda a derecha)
+            for c_idx, val in enumerate(row_lower):
+                if map_cols['fecha'] is None and any(k in val for k in keys_fecha):
+                    map_cols['fecha'] = c_idx
+                elif map_cols['turno'] is None and any(k in val for k in keys_turno):
+                    map_cols['turno'] = c_idx
+                elif map_cols['entrada'] is None and any(k in val for k in keys_in):
+                    map_cols['entrada'] = c_idx
+                elif map_cols['salida'] is None and any(k in val for k in keys_out):
+                    map_cols['salida'] = c_idx
+                elif map_cols['codigo'] is None and any(k in val for k in keys_code):
+                    map_cols['codigo'] = c_idx
+            break
+
+    # Fallback: Si no encuentra cabeceras claras, usar posiciones estándar de un Kardex común
+    # Suponiendo: A=Fecha, B=Turno, C=Entrada, D=Salida
+    if found_header_row == 0:
+        # Asumir que los datos empiezan en fila 2 si no hay cabecera
+        return dict(DEFAULT_COLUMNS), 1
+
+    return map_cols, found_header_row
+
+
+def parse_excel_date(val):
+    """Auxiliar para convertir fecha de excel a string YYYY-MM-DD (y nombre del día)"""
+    return parse_date(val)
+
+
+def parse_excel_time(val):
+    """Auxiliar para convertir hora de excel a string HH:MM:SS"""
+    return parse_time(val)
+
+
+def get_day_name(dt):
+    """Nombre del día de la semana en español."""
+    return day_name(dt)
+
+
+# -------------------------------------------------------------------------
+# Archivos de texto delimitado (CSV / TSV)
+# -------------------------------------------------------------------------
+
+class DelimitedFile:
+    """
+    Archivo CSV/TSV exportado por el reloj. Detecta la codificación y el
+    separador con los primeros bytes y lo lee como stream con un búfer
+    grande; rows() devuelve un csv.reader (listas de texto).
+    """
+
+    def __init__(self, path: str, delimiter: Optional[str] = None, encoding: Optional[str] = None):
+        """
+        Args:
+            path: Ruta del archivo
+            delimiter: Separador; None lo detecta (',', ';', tabulador o '|')
+            encoding: Codificación; None prueba UTF-8 y si no, cp1252
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            sample = f.read(SNIFF_BYTES)
+        self.size = os.path.getsize(path)
+        self.encoding = encoding or _detect_encoding(sample)
+        text = codecs.getincrementaldecoder(self.encoding)(errors='replace').decode(sample)
+        if len(sample) == SNIFF_BYTES:
+            text = text[:text.rfind('\n') + 1] or text  # descartar la última línea incompleta
+        self.delimiter = delimiter or _detect_delimiter(text, path)
+        lines = text.count('\n') or 1
+        self.estimated_rows = max(1, round(self.size * lines / max(1, len(sample)))) if len(sample) == SNIFF_BYTES else lines
+        self._file: Optional[IO[str]] = None
+
+    def rows(self) -> Iterator[List[str]]:
+        """Filas del archivo desde el inicio."""
+        self.close()
+        self._file = open(self.path, 'r', encoding=self.encoding, errors='replace',
+                          newline='', buffering=READ_BUFFER_BYTES)
+        return csv.reader(self._file, delimiter=self.delimiter)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def is_delimited_file(path: str) -> bool:
+    """True si la extensión corresponde a texto delimitado (CSV/TSV)."""
+    return path.lower().endswith(DELIMITED_EXTENSIONS)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    try:
+        codecs.getincrementaldecoder('utf-8-sig')().decode(sample, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def _detect_delimiter(text: str, path: str) -> str:
+    if path.lower().endswith('.tsv'):
+        return '\t'
+    try:
+        return csv.Sniffer().sniff(text, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # Sin patrón claro: el separador más frecuente de la primera línea
+        first_line = text.split('\n', 1)[0]
+        return max(DELIMITERS, key=first_line.count)
+
+
+class _ConversionCache:
+    """
+    Convierte columnas completas memorizando el resultado de cada valor
+    distinto: en un reporte las fechas, horas y turnos se repiten mucho, por
+    lo que cada texto se analiza una sola vez.
+    """
+
+    __slots__ = ('_convert', '_values')
+
+    def __init__(self, convert):
+        self._convert = convert
+        self._values: Dict[str, Any] = {}
+
+    def column(self, values: List[str]) -> List[Any]:
+        cache = self._values
+        missing = set(values).difference(cache)
+        if missing:
+            if len(cache) + len(missing) > MAX_CACHED_VALUES:
+                cache.clear()
+                missing = set(values)
+            convert = self._convert
+            for value in missing:
+                cache[value] = convert(value)
+        return list(map(cache.__getitem__, values))
+
+
+def _column(block: List[List[str]], index: int) -> List[str]:
+    return [row[index] if index < len(row) else '' for row in block]
+
+
+def iter_delimited_rows(rows: Iterable[List[str]], first_row: int, headers_map: Dict[str, Any],
+                        codigo_header: Optional[str], stats: ImportStats,
+                        block_size: int = DELIMITED_BLOCK_ROWS) -> Iterator[ParsedRow]:
+    """
+    Equivalente a iter_attendance_rows para filas de texto: toma bloques de
+    ``block_size`` filas y convierte cada columna del bloque de una vez
+    (con _ConversionCache) en lugar de celda por celda.
+    """
+    col_codigo = headers_map.get('codigo')
+    col_fecha = headers_map['fecha']
+    col_turno = headers_map['turno']
+    col_entrada = headers_map['entrada']
+    col_salida = headers_map['salida']
+
+    dates = _ConversionCache(DateColumnParser(memo_size=0).convert)
+    entries = _ConversionCache(TimeColumnParser(memo_size=0).convert)
+    exits = _ConversionCache(TimeColumnParser(memo_size=0).convert)
+    shifts = _ConversionCache(lambda raw: raw.split(' ')[0][:10])
+
+    iterator = iter(rows)
+    idx = first_row
+    while True:
+        block = list(islice(iterator, block_size))
+        if not block:
+            return
+        count = len(block)
+        stats.rows += count
+
+        if col_codigo is not None:
+            codes = [value.strip() for value in _column(block, col_codigo)]
+        else:
+            codes = [codigo_header] * count
+        fechas = dates.column(_column(block, col_fecha))
+        turnos_raw = _column(block, col_turno) if col_turno is not None else [''] * count
+        turnos = shifts.column(turnos_raw)
+        entradas = entries.column(_column(block, col_entrada)) if col_entrada is not None else [None] * count
+        salidas = exits.column(_column(block, col_salida)) if col_salida is not None else [None] * count
+
+        stats.codes.update(code for code in set(codes) if code)
+        for j in range(count):
+            current_code = codes[j]
+            if not current_code:
+                continue
+            fecha_str, dia_semana = fechas[j]
+            if not fecha_str:
+                continue
+            marca_entrada = entradas[j]
+            marca_salida = salidas[j]
+            # CRITERIO: Solo importar si hay al menos una marca
+            if not marca_entrada and not marca_salida:
+                stats.skipped += 1
+                continue
+            val_turno_raw = turnos_raw[j] or None
+            yield idx + j, (fecha_str, current_code, turnos[j] if val_turno_raw else "GEN",
+                            dia_semana or "", marca_entrada, marca_salida), val_turno_raw
+        idx += count
+
+
+# -------------------------------------------------------------------------
+# Importación de varios archivos
+# -------------------------------------------------------------------------
+
+@dataclass
+class ParsedWorkbook:
+    """Filas analizadas de todas las hojas de un libro (o de un archivo CSV/TSV)."""
+
+    path: str
+    rows: List[ParsedRow] = field(default_factory=list)
+    stats: ImportStats = field(default_factory=ImportStats)
+
+
+def find_workbooks(folder: str) -> List[str]:
+    """Libros Excel y archivos CSV/TSV de una carpeta (sin subcarpetas ni temporales '~$')."""
+    names = sorted(
+        name for name in os.listdir(folder)
+        if name.lower().endswith(WORKBOOK_EXTENSIONS + DELIMITED_EXTENSIONS) and not name.startswith('~$')
+    )
+    return [os.path.join(folder, name) for name in names]
+
+
+def parse_workbook(path: str) -> ParsedWorkbook:
+    """
+    Analiza todas las hojas de un libro. Cada hoja detecta sus propios
+    encabezados y, si no tiene columna de código, toma el de su cabecera
+    (Reporte Individual / Kardex); las hojas sin fecha o sin código se
+    informan en stats.messages. Función de nivel de módulo para poder
+    ejecutarse en un ProcessPoolExecutor.
+    """
+    result = ParsedWorkbook(path)
+    label = os.path.basename(path)
+    if openpyxl is None:
+        result.stats.messages.append(f"{label}: la librería 'openpyxl' no está instalada")
+        return result
+
+    try:
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except Exception as e:
+        result.stats.messages.append(f"{label}: no se pudo abrir ({str(e)})")
+        return result
+
+    try:
+        for sheet in wb.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            head = list(islice(rows, HEADER_SCAN_ROWS))
+            if not head:
+                continue
+            headers_map, start_row = find_column_indexes(head)
+
+            codigo_header = None
+            if headers_map.get('codigo') is None:
+                codigo_header = extract_employee_code(head)
+                if not codigo_header:
+                    # Sin encabezados ni código la hoja no es de asistencias
+                    # (resúmenes, notas): se omite sin informarla
+                    if headers_map != DEFAULT_COLUMNS:
+                        result.stats.messages.append(f"{label}[{sheet.title}]: no se detectó el código de empleado")
+                    continue
+
+            source = f"{label}[{sheet.title}]"
+            for idx, record, turno_raw in iter_attendance_rows(chain(head[start_row:], rows), start_row + 1,
+                                                               headers_map, codigo_header, result.stats):
+                result.rows.append((f"{source}:{idx}", record, turno_raw))
+    except Exception as e:
+        result.stats.messages.append(f"{label}: error de lectura ({str(e)})")
+    finally:
+        wb.close()
+    return result
+
+
+def parse_delimited(path: str) -> ParsedWorkbook:
+    """Analiza un archivo CSV/TSV completo (ver parse_workbook)."""
+    result = ParsedWorkbook(path)
+    label = os.path.basename(path)
+    source = None
+    try:
+        source = DelimitedFile(path)
+        rows = source.rows()
+        head = list(islice(rows, HEADER_SCAN_ROWS))
+        if not head:
+            return result
+        headers_map, start_row = find_column_indexes(head)
+        codigo_header = None
+        if headers_map.get('codigo') is None:
+            codigo_header = extract_employee_code(head)
+            if not codigo_header:
+                result.stats.messages.append(f"{label}: no se detectó el código de empleado")
+                return result
+        for idx, record, turno_raw in iter_delimited_rows(chain(head[start_row:], rows), start_row + 1,
+                                                          headers_map, codigo_header, result.stats):
+            result.rows.append((f"{label}:{idx}", record, turno_raw))
+    except Exception as e:
+        result.stats.messages.append(f"{label}: error de lectura ({str(e)})")
+    finally:
+        if source is not None:
+            source.close()
+    return result
+
+
+def iter_workbooks(paths: List[str], stats: ImportStats,
+                   max_workers: Optional[int] = None) -> Iterator[ParsedRow]:
+    """
+    Analiza varios libros o CSV en paralelo (un proceso por núcleo) y entrega sus
+    filas a medida que cada libro termina, para unirlas en una sola etapa
+    de escritura. Los contadores de cada libro se suman a ``stats``.
+    Si el consumidor deja de iterar, los libros pendientes se cancelan.
+    """
+    stats.files_total = len(paths)
+    if not paths:
+        return
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths)))
+    # spawn también en Linux: la importación corre en un hilo de la aplicación
+    # Tk y un fork copiaría locks tomados por otros hilos (pool, ejecutor)
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [executor.submit(parse_delimited if is_delimited_file(path) else parse_workbook, path)
+                   for path in paths]
+        for future in as_completed(futures):
+            workbook = future.result()
+            stats.merge(workbook.stats)
+            stats.files_done += 1
+            yield from workbook.rows
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
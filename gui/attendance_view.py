@@ -19,6 +19,8 @@ from database.attendance_service import AttendanceService
 from database.employee_service import EmployeeService
 from database.reference_service import ReferenceService
 from database.operation_result import OperationResult, OperationStatus
+from gui.background import BackgroundExecutor, run_in_background
+from gui.components import ProgressDialog
 
 
 class AttendanceView:
@@ -27,6 +29,7 @@ class AttendanceView:
     SEARCH_PLACEHOLDER = "Código empleado o nombre..."
     MONTH_PLACEHOLDER = "Seleccione mes"
     DEFAULT_RANGE_DAYS = 30
+    PAGE_SIZE = 200
     DAYS_OF_WEEK = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
     MONTH_OPTIONS = [
         ("01", "Enero"),
@@ -47,7 +50,8 @@ class AttendanceView:
     def __init__(self, parent_frame: tk.Frame,
                  attendance_service: Optional[AttendanceService],
                  employee_service: Optional[EmployeeService],
-                 reference_service: Optional[ReferenceService] = None):
+                 reference_service: Optional[ReferenceService] = None,
+                 executor: Optional[BackgroundExecutor] = None):
         """
         Inicializa la vista de asistencias.
         
@@ -55,12 +59,15 @@ class AttendanceView:
             parent_frame: Frame contenedor principal
             attendance_service: Servicio de asistencias
             employee_service: Servicio de empleados
+            executor: Ejecutor para consultar la BD sin bloquear la interfaz
         """
         self.parent_frame = parent_frame
         self.attendance_service = attendance_service
         self.employee_service = employee_service
         self.reference_service = reference_service
+        self.executor = executor
         self.container = None
+        self.summary_frame = None
         
     def render(self):
         """Renderiza la vista completa de asistencias"""
@@ -83,6 +90,10 @@ class AttendanceView:
         # Filtros
         self._create_filters(main_container)
         
+        # Resumen del filtro (totales calculados en el servidor)
+        self.summary_frame = tk.Frame(main_container, bg='#e3f2fd', relief='solid', borderwidth=1)
+        self.summary_frame.pack(fill='x', pady=(0, 10))
+        
         # Tabla de asistencias
         self.container = tk.Frame(main_container, bg='#f5f5f5')
         self.container.pack(fill='both', expand=True, pady=(0, 10))
@@ -296,6 +307,19 @@ class AttendanceView:
             pady=6
         ).pack(side='left')
 
+        tk.Button(
+            btn_frame,
+            text="🗑️ Eliminar rango",
+            command=self._delete_attendance_range,
+            font=('Segoe UI', 9),
+            bg='#f44336',
+            fg='white',
+            relief='flat',
+            cursor='hand2',
+            padx=15,
+            pady=6
+        ).pack(side='right')
+
         self._filter_controls = {
             'fecha_inicio': fecha_inicio,
             'fecha_fin': fecha_fin,
@@ -397,12 +421,74 @@ class AttendanceView:
 
         assert self.attendance_service is not None
         
-        # Ejecutar carga de datos (simulada asíncrona para UI)
-        self.container.after(50, lambda: self._render_attendance_table(search_term, fecha_inicio, fecha_fin))
+        # Consultar en segundo plano; la tabla se dibuja al llegar los datos
+        filters = (search_term, fecha_inicio, fecha_fin)
+        run_in_background(
+            self.container,
+            self.executor,
+            lambda: self._fetch_attendances(*filters),
+            on_success=lambda page: self._render_attendance_table(filters, page),
+            on_error=lambda exc: self._render_attendance_table(filters, None, exc),
+            key='attendance_table',
+        )
+        self._load_attendance_summary(filters)
+
+    def _load_attendance_summary(self, filters):
+        """Consulta los totales del filtro en paralelo con la primera página"""
+        if self.summary_frame is None:
+            return
+        self._render_attendance_summary(None, loading=True)
+        assert self.attendance_service is not None
+        run_in_background(
+            self.summary_frame,
+            self.executor,
+            lambda: self.attendance_service.summarize(*filters),
+            on_success=lambda summary: self._render_attendance_summary(summary),
+            on_error=lambda exc: self._render_attendance_summary(None, error=exc),
+            key='attendance_summary',
+        )
+
+    def _render_attendance_summary(self, summary, loading=False, error=None):
+        """Muestra registros, empleados, horas extras y marcas incompletas del filtro"""
+        if self.summary_frame is None or not self.summary_frame.winfo_exists():
+            return
+        for widget in self.summary_frame.winfo_children():
+            widget.destroy()
+
+        if loading:
+            text, color = "⏳ Calculando resumen...", '#546e7a'
+        elif summary is None:
+            text = f"No se pudo calcular el resumen: {error}" if error else "No se pudo calcular el resumen"
+            color = '#e53935'
+        else:
+            text = (
+                f"📊 {summary['registros']} registros  •  {summary['empleados']} empleados  •  "
+                f"H25: {summary['h25']:.2f} h  •  H35: {summary['h35']:.2f} h  •  H100: {summary['h100']:.2f} h  •  "
+                f"Marcas incompletas: {summary['marcas_incompletas']}"
+            )
+            color = '#1565c0'
+
+        tk.Label(
+            self.summary_frame,
+            text=text,
+            font=('Segoe UI', 10, 'bold' if summary else 'normal'),
+            bg='#e3f2fd',
+            fg=color,
+            anchor='w',
+            padx=15,
+            pady=8
+        ).pack(fill='x')
+
+    def _fetch_attendances(self, search_term, fecha_inicio, fecha_fin, token=None):
+        """Obtiene una página de asistencias (se ejecuta fuera del hilo de la interfaz)"""
+        assert self.attendance_service is not None
+        return self.attendance_service.get_attendance_page(
+            self.PAGE_SIZE, token, search_term, fecha_inicio, fecha_fin, None
+        )
 
-    def _render_attendance_table(self, search_term, fecha_inicio, fecha_fin):
-        """Renderiza la tabla de asistencias después de cargar"""
-        if self.container is None or self.attendance_service is None:
+    def _render_attendance_table(self, filters, page, error=None):
+        """Renderiza la primera página de asistencias después de cargar"""
+        if self.container is None or not self.container.winfo_exists():
             return
 
         # Limpiar loading
@@ -454,16 +540,12 @@ class AttendanceView:
             ).place(relx=sum([h[1] for h in headers[:headers.index((header_text, width))]]),
                    rely=0, relwidth=width, relheight=1)
         
-        # Obtener datos
+        # Mostrar datos
         try:
-            if search_term or fecha_inicio or fecha_fin:
-                attendances = self.attendance_service.filter_attendance(
-                    search_term, fecha_inicio, fecha_fin, None
-                )
-            else:
-                attendances = self.attendance_service.get_all_attendance()
+            if error is not None:
+                raise error
             
-            if not attendances:
+            if page is None or not page.rows:
                 tk.Label(
                     table_frame,
                     text="No se encontraron registros de asistencia",
@@ -472,85 +554,10 @@ class AttendanceView:
                     fg='#546e7a'
                 ).pack(pady=50)
             else:
-                # Renderizar filas
-                for idx, att in enumerate(attendances):
-                    row_bg = '#f8f9fa' if idx % 2 == 0 else 'white'
-                    
-                    row_frame = tk.Frame(table_frame, bg=row_bg, height=45)
-                    row_frame.pack(fill='x')
-                    row_frame.pack_propagate(False)
-                    
-                    entrada_marca_str = self._format_time(att.get('marca_entrada'))
-                    salida_marca_str = self._format_time(att.get('marca_salida'))
-                    entrada_turno_str = self._format_time(att.get('turno_entrada'))
-                    salida_turno_str = self._format_time(att.get('turno_salida'))
-                    
-                    # Formato combinado para turno y marca
-                    turno_horario = f"{entrada_turno_str} - {salida_turno_str}" if entrada_turno_str or salida_turno_str else ''
-                    marca_horario = f"{entrada_marca_str} - {salida_marca_str}" if entrada_marca_str or salida_marca_str else ''
-                    
-                    fecha_valor = att.get('fecha_asistencia')
-                    if isinstance(fecha_valor, (datetime, date)):
-                        fecha_valor = fecha_valor.strftime('%Y-%m-%d')
-                    fecha_display = fecha_valor or ''
-                    
-                    # Datos simplificados
-                    data = [
-                        fecha_display,
-                        f"{att.get('codigo_empleado', '')} - {att.get('nombre_empleado', '')}",
-                        turno_horario,
-                        marca_horario,
-                        f"{att.get('horas_trabajadas', 0):.1f}h",
-                        att.get('codigo_turno', '')
-                    ]
-                    
-                    for i, (text, width) in enumerate(zip(data, [h[1] for h in headers[:-1]])):
-                        tk.Label(
-                            row_frame,
-                            text=str(text),
-                            font=('Segoe UI', 9),
-                            bg=row_bg,
-                            fg='#2c3e50',
-                            anchor='w',
-                            padx=10
-                        ).place(relx=sum([h[1] for h in headers[:i]]),
-                               rely=0, relwidth=width, relheight=1)
-                    
-                    # Botones
-                    actions_frame = tk.Frame(row_frame, bg=row_bg)
-                    actions_frame.place(relx=0.90, rely=0.5, anchor='center')
-                    
-                    tk.Button(
-                        actions_frame,
-                        text="✏️ Editar",
-                        command=lambda a=att: self._edit_attendance_dialog(a),
-                        font=('Segoe UI', 9, 'bold'),
-                        bg='#ff9800',
-                        fg='white',
-                        activebackground='#f57c00',
-                        activeforeground='white',
-                        relief='flat',
-                        cursor='hand2',
-                        padx=12,
-                        pady=4,
-                        bd=0
-                    ).pack(side='left', padx=4)
-                    
-                    tk.Button(
-                        actions_frame,
-                        text="🗑️ Eliminar",
-                        command=lambda a=att: self._delete_attendance(a),
-                        font=('Segoe UI', 9, 'bold'),
-                        bg='#f44336',
-                        fg='white',
-                        activebackground='#d32f2f',
-                        activeforeground='white',
-                        relief='flat',
-                        cursor='hand2',
-                        padx=12,
-                        pady=4,
-                        bd=0
-                    ).pack(side='left', padx=4)
+                rows = page.rows
+                self._render_attendance_rows(table_frame, headers, rows)
+                if page.has_more:
+                    self._add_load_more_button(table_frame, headers, filters, page.next_token, len(rows))
         
         except Exception as e:
             tk.Label(
@@ -563,6 +570,135 @@ class AttendanceView:
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+
+    def _render_attendance_rows(self, table_frame, headers, attendances, offset=0):
+        """Dibuja las filas de una página de asistencias al final de la tabla"""
+        for idx, att in enumerate(attendances, start=offset):
+            row_bg = '#f8f9fa' if idx % 2 == 0 else 'white'
+            
+            row_frame = tk.Frame(table_frame, bg=row_bg, height=45)
+            row_frame.pack(fill='x')
+            row_frame.pack_propagate(False)
+            
+            entrada_marca_str = self._format_time(att.get('marca_entrada'))
+            salida_marca_str = self._format_time(att.get('marca_salida'))
+            entrada_turno_str = self._format_time(att.get('turno_entrada'))
+            salida_turno_str = self._format_time(att.get('turno_salida'))
+            
+            # Formato combinado para turno y marca
+            turno_horario = f"{entrada_turno_str} - {salida_turno_str}" if entrada_turno_str or salida_turno_str else ''
+            marca_horario = f"{entrada_marca_str} - {salida_marca_str}" if entrada_marca_str or salida_marca_str else ''
+            
+            fecha_valor = att.get('fecha_asistencia')
+            if isinstance(fecha_valor, (datetime, date)):
+                fecha_valor = fecha_valor.strftime('%Y-%m-%d')
+            fecha_display = fecha_valor or ''
+            
+            # Datos simplificados
+            data = [
+                fecha_display,
+                f"{att.get('codigo_empleado', '')} - {att.get('nombre_empleado', '')}",
+                turno_horario,
+                marca_horario,
+                f"{att.get('horas_trabajadas', 0):.1f}h",
+                att.get('codigo_turno', '')
+            ]
+            
+            for i, (text, width) in enumerate(zip(data, [h[1] for h in headers[:-1]])):
+                tk.Label(
+                    row_frame,
+                    text=str(text),
+                    font=('Segoe UI', 9),
+                    bg=row_bg,
+                    fg='#2c3e50',
+                    anchor='w',
+                    padx=10
+                ).place(relx=sum([h[1] for h in headers[:i]]),
+                       rely=0, relwidth=width, relheight=1)
+            
+            # Botones
+            actions_frame = tk.Frame(row_frame, bg=row_bg)
+            actions_frame.place(relx=0.90, rely=0.5, anchor='center')
+            
+            tk.Button(
+                actions_frame,
+                text="✏️ Editar",
+                command=lambda a=att: self._edit_attendance_dialog(a),
+                font=('Segoe UI', 9, 'bold'),
+                bg='#ff9800',
+                fg='white',
+                activebackground='#f57c00',
+                activeforeground='white',
+                relief='flat',
+                cursor='hand2',
+                padx=12,
+                pady=4,
+                bd=0
+            ).pack(side='left', padx=4)
+            
+            tk.Button(
+                actions_frame,
+                text="🗑️ Eliminar",
+                command=lambda a=att: self._delete_attendance(a),
+                font=('Segoe UI', 9, 'bold'),
+                bg='#f44336',
+                fg='white',
+                activebackground='#d32f2f',
+                activeforeground='white',
+                relief='flat',
+                cursor='hand2',
+                padx=12,
+                pady=4,
+                bd=0
+            ).pack(side='left', padx=4)
+
+    def _add_load_more_button(self, table_frame, headers, filters, token, loaded):
+        """Agrega al final de la tabla el botón para cargar la página siguiente"""
+        button = tk.Button(
+            table_frame,
+            text=f"⬇️ Cargar más ({loaded} mostrados)",
+            font=('Segoe UI', 9, 'bold'),
+            bg='#eceff1',
+            fg='#37474f',
+            activebackground='#cfd8dc',
+            relief='flat',
+            cursor='hand2',
+            padx=12,
+            pady=6,
+            bd=0
+        )
+        button.config(command=lambda: self._load_more_attendances(table_frame, headers, filters, token, loaded, button))
+        button.pack(pady=10)
+
+    def _load_more_attendances(self, table_frame, headers, filters, token, loaded, button):
+        """Consulta la página siguiente y la agrega a la tabla"""
+        button.config(state='disabled', text="⏳ Cargando...")
+
+        def on_success(page):
+            if not table_frame.winfo_exists():
+                return
+            button.destroy()
+            if page is None:
+                messagebox.showerror("Error", "No se pudo cargar la siguiente página de asistencias")
+                return
+            self._render_attendance_rows(table_frame, headers, page.rows, offset=loaded)
+            total = loaded + len(page.rows)
+            if page.has_more:
+                self._add_load_more_button(table_frame, headers, filters, page.next_token, total)
+
+        def on_error(exc):
+            if button.winfo_exists():
+                button.config(state='normal', text=f"⬇️ Cargar más ({loaded} mostrados)")
+            messagebox.showerror("Error", f"Error al cargar datos: {str(exc)}")
+
+        run_in_background(
+            table_frame,
+            self.executor,
+            lambda: self._fetch_attendances(*filters, token=token),
+            on_success=on_success,
+            on_error=on_error,
+            key='attendance_table',
+        )
     
     def _create_attendance_dialog(self):
         """Diálogo para crear nueva asistencia"""
@@ -891,6 +1027,74 @@ class AttendanceView:
             if self._show_operation_result(result, title='Eliminar asistencia'):
                 self._load_attendance_table()
 
+    def _delete_attendance_range(self):
+        """
+        Elimina las asistencias del rango de fechas filtrado. Si hay un texto
+        de búsqueda se aplica el mismo filtro que la tabla (código o nombre
+        que lo contiene). Primero se muestra cuántas filas se eliminarán y
+        luego el avance de la eliminación.
+        """
+        try:
+            term, start_date, end_date = self._collect_filter_values()
+        except ValueError as exc:
+            messagebox.showwarning('Eliminar rango', str(exc))
+            return
+        if not start_date or not end_date:
+            messagebox.showwarning('Eliminar rango', 'Indique la fecha de inicio y de fin')
+            return
+        assert self.attendance_service is not None
+        service = self.attendance_service
+
+        def confirm(preview):
+            if not preview.ok:
+                messagebox.showerror('Eliminar rango', preview.error)
+                return
+            if preview.matched == 0:
+                messagebox.showinfo('Eliminar rango', 'No hay asistencias en el rango seleccionado')
+                return
+            empleados = f'empleados cuyo código o nombre contiene "{term}"' if term else 'todos los empleados'
+            if not messagebox.askyesno(
+                'Confirmar eliminación',
+                f"Se eliminarán {preview.matched} asistencias entre {start_date} y {end_date}\n"
+                f"({empleados}).\n\nEsta acción no se puede deshacer. ¿Continuar?"
+            ):
+                return
+            dialog = ProgressDialog(self.parent_frame, 'Eliminar rango', '🗑️ Eliminando asistencias')
+
+            def failed(exc):
+                dialog.close()
+                messagebox.showerror('Eliminar rango', f'Error eliminando: {exc}')
+
+            run_in_background(
+                self.parent_frame,
+                self.executor,
+                lambda: service.delete_attendance_range(start_date, end_date, search_term=term,
+                                                        progress=dialog.report),
+                on_success=lambda result: finished(result, dialog),
+                on_error=failed,
+                key='attendance_range_delete',
+            )
+
+        def finished(result, dialog):
+            dialog.close()
+            if result.ok:
+                messagebox.showinfo('Eliminar rango', f'Se eliminaron {result.deleted} asistencias')
+            else:
+                messagebox.showerror(
+                    'Eliminar rango',
+                    f'Se eliminaron {result.deleted} de {result.matched} asistencias.\n{result.error}'
+                )
+            self._apply_filters()
+
+        run_in_background(
+            self.parent_frame,
+            self.executor,
+            lambda: service.delete_attendance_range(start_date, end_date, preview=True, search_term=term),
+            on_success=confirm,
+            on_error=lambda exc: messagebox.showerror('Eliminar rango', f'Error consultando: {exc}'),
+            key='attendance_range_delete',
+        )
+
     def _show_operation_result(self, result: OperationResult, title: str = 'Asistencias') -> bool:
         """Muestra retroalimentación consistente según el estado del resultado."""
         if result.ok:
@@ -0,0 +1,233 @@
+"""
+Ejecutor en segundo plano para llamadas a la base de datos
+Descripción: Ejecuta las llamadas a los servicios en un pool de hilos y entrega
+             los resultados al hilo de Tkinter mediante una cola consultada con
+             after(), de modo que la ventana no se congela mientras MySQL trabaja.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SuccessCallback = Callable[[Any], None]
+ErrorCallback = Callable[[BaseException], None]
+
+
+class BackgroundExecutor:
+    """
+    Pool de hilos con entrega de resultados segura para Tk.
+
+    Las tareas enviadas con la misma ``key`` se reemplazan entre sí: si llega
+    una nueva, la anterior se cancela (o, si ya estaba corriendo, su resultado
+    se descarta sin invocar callbacks).
+    """
+
+    def __init__(self, root: tk.Misc, max_workers: int = 4, poll_interval: int = 50):
+        """
+        Inicializa el ejecutor.
+
+        Args:
+            root: Widget raíz usado para programar la consulta de la cola
+            max_workers: Máximo de llamadas simultáneas a la base de datos
+            poll_interval: Milisegundos entre consultas de la cola de resultados
+        """
+        self.root = root
+        self.max_workers = max(1, int(max_workers))
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='db-worker')
+        self._results: "queue.Queue[Tuple[Future, Optional[str], int, Optional[SuccessCallback], Optional[ErrorCallback]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+        self._pending = 0
+        self._polling = False
+        self._closed = False
+
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               on_success: Optional[SuccessCallback] = None,
+               on_error: Optional[ErrorCallback] = None,
+               key: Optional[str] = None, **kwargs: Any) -> Future:
+        """
+        Envía una función al pool. Debe llamarse desde el hilo de Tk.
+
+        Args:
+            fn: Función a ejecutar en segundo plano (p.ej. un método de servicio)
+            on_success: Callback con el resultado, ejecutado en el hilo de Tk
+            on_error: Callback con la excepción, ejecutado en el hilo de Tk
+            key: Identificador de la petición; una nueva con la misma clave
+                reemplaza a la anterior
+
+        Returns:
+            Future de la tarea
+        """
+        if self._closed:
+            raise RuntimeError("El ejecutor en segundo plano está cerrado")
+
+        generation = 0
+        if key is not None:
+            with self._lock:
+                generation = self._generations.get(key, 0) + 1
+                self._generations[key] = generation
+                previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+
+        future = self._executor.submit(fn, *args, **kwargs)
+        if key is not None:
+            with self._lock:
+                self._futures[key] = future
+
+        self._pending += 1
+        future.add_done_callback(
+            lambda f: self._results.put((f, key, generation, on_success, on_error))
+        )
+        self._ensure_polling()
+        return future
+
+    def cancel(self, key: str) -> None:
+        """Cancela (o invalida) la última petición enviada con esa clave."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Detiene el ejecutor sin esperar las tareas en curso."""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Entrega de resultados en el hilo de Tk
+    # ------------------------------------------------------------------
+    def _ensure_polling(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                future, key, generation, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._dispatch(future, key, generation, on_success, on_error)
+
+        if self._pending > 0 and not self._closed:
+            self.root.after(self.poll_interval, self._drain)
+        else:
+            self._polling = False
+
+    def _dispatch(self, future: Future, key: Optional[str], generation: int,
+                  on_success: Optional[SuccessCallback], on_error: Optional[ErrorCallback]) -> None:
+        if future.cancelled():
+            return
+        if key is not None:
+            with self._lock:
+                if self._generations.get(key) != generation:
+                    return  # Petición reemplazada por otra más reciente
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+        try:
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    logger.error(f"Error en tarea en segundo plano: {str(error)}")
+            elif on_success is not None:
+                on_success(future.result())
+        except Exception as e:
+            logger.error(f"Error en callback de tarea en segundo plano: {str(e)}")
+
+
+def run_in_background(widget: tk.Misc, executor: Optional[BackgroundExecutor],
+                      fn: Callable[[], Any], on_success: SuccessCallback,
+                      on_error: ErrorCallback, key: Optional[str] = None) -> None:
+    """
+    Ejecuta fn con el ejecutor si existe; si no, la difiere con after()
+    en el hilo de Tk (comportamiento anterior).
+    """
+    if executor is not None:
+        executor.submit(fn, on_success=on_success, on_error=on_error, key=key)
+        return
+
+    def _run() -> None:
+        try:
+            result = fn()
+        except Exception as e:
+            on_error(e)
+            return
+        on_success(result)
+
+    widget.after(50, _run)
+
+
+def read_ahead(iterable: Iterable[Any], chunk_size: int = 1000, depth: int = 2) -> Iterator[List[Any]]:
+    """
+    Recorre ``iterable`` en un hilo propio y entrega sus elementos en bloques
+    de ``chunk_size``. Mientras el llamador procesa un bloque (p.ej. lo escribe
+    en la base de datos) el hilo ya prepara los siguientes, hasta ``depth``
+    bloques en espera, de modo que la memoria usada no depende del total.
+
+    Las excepciones del iterable se relanzan en el llamador. Si el llamador
+    deja de consumir (break, excepción o close()), el hilo se detiene antes
+    de que el generador termine.
+    """
+    chunks: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=max(1, int(depth)))
+    stop = threading.Event()
+    chunk_size = max(1, int(chunk_size))
+
+    def _put(item: Tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        iterator = iter(iterable)
+        try:
+            chunk: List[Any] = []
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    if not _put(('chunk', chunk)):
+                        return
+                    chunk = []
+            if chunk and not _put(('chunk', chunk)):
+                return
+            _put(('done', None))
+        except BaseException as e:
+            _put(('error', e))
+        finally:
+            # Un generador abandonado libera sus recursos (archivos, procesos) aquí
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=_produce, name='read-ahead', daemon=True)
+    producer.start()
+    try:
+        while True:
+            kind, payload = chunks.get()
+            if kind == 'chunk':
+                yield payload
+            elif kind == 'error':
+                raise payload
+            else:
+                return
+    finally:
+        stop.set()
+        producer.join()
@@ -154,3 +154,66 @@ class Header(tk.Frame):
             self.status_var.set("Desconectado")
             
         self.info_var.set(details)
+
+
+class ProgressDialog(tk.Toplevel):
+    """
+    Ventana modal con una barra de progreso para tareas en segundo plano.
+    report() puede llamarse desde cualquier hilo (p.ej. como callback de
+    progreso de un servicio); la ventana lee el último valor con after().
+    """
+
+    def __init__(self, parent, title: str, label: str, poll_ms: int = 200):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("420x150")
+        self.resizable(False, False)
+        self.transient(parent.winfo_toplevel())
+        self.grab_set()
+        # La tarea no se puede interrumpir: cerrar la ventana no hace nada
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+
+        self.update_idletasks()
+        x = (self.winfo_screenwidth() // 2) - 210
+        y = (self.winfo_screenheight() // 2) - 75
+        self.geometry(f'420x150+{x}+{y}')
+
+        frame = tk.Frame(self, bg=COLORS['surface'], padx=25, pady=20)
+        frame.pack(fill='both', expand=True)
+        tk.Label(frame, text=label, font=FONTS['body_bold'], bg=COLORS['surface'],
+                 fg=COLORS['text_primary'], anchor='w').pack(fill='x', pady=(0, 10))
+        self._bar = ttk.Progressbar(frame, mode='indeterminate', maximum=100)
+        self._bar.pack(fill='x', pady=(0, 10))
+        self._bar.start(15)
+        self._status = tk.Label(frame, text="Iniciando...", font=FONTS['small'], bg=COLORS['surface'],
+                                fg=COLORS['text_secondary'], anchor='w')
+        self._status.pack(fill='x')
+
+        self._poll_ms = poll_ms
+        self._latest: Tuple[int, int] = (0, 0)
+        self._closed = False
+        self.after(self._poll_ms, self._poll)
+
+    def report(self, done: int, total: int) -> None:
+        """Registra el avance (filas procesadas, total); seguro desde cualquier hilo."""
+        self._latest = (done, total)
+
+    def close(self) -> None:
+        """Cierra la ventana; debe llamarse desde el hilo de Tk."""
+        if self._closed:
+            return
+        self._closed = True
+        self.grab_release()
+        self.destroy()
+
+    def _poll(self) -> None:
+        if self._closed:
+            return
+        done, total = self._latest
+        if total > 0:
+            if str(self._bar['mode']) != 'determinate':
+                self._bar.stop()
+                self._bar.config(mode='determinate')
+            self._bar['value'] = min(100.0, done * 100.0 / total)
+            self._status.config(text=f"{done:,} de {total:,} filas")
+        self.after(self._poll_ms, self._poll)
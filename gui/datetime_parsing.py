@@ -0,0 +1,312 @@
+"""
+Conversión de fechas y horas de los reportes de asistencia
+Descripción: Analizadores por columna para la importación. Cada columna fija
+             el formato del primer valor reconocido y lo prueba primero en
+             los siguientes; los textos habituales ("07:00", "15/03/2025") se
+             reconocen con expresiones regulares precompiladas en lugar de
+             probar datetime.strptime formato por formato, y los valores
+             repetidos se sirven desde una caché acotada (lru_cache).
+             También acepta números de serie de Excel (celdas sin formato).
+
+Los textos que no encajan en ningún patrón rápido pasan por la conversión
+con strptime de siempre, de modo que el resultado es el mismo.
+
+Micro-benchmark del costo por valor:
+    python -m gui.datetime_parsing
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time as _time
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+DAY_NAMES = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+
+# Valores distintos que recuerda cada columna
+MEMO_SIZE = 4096
+
+# Textos que representan una marca vacía
+EMPTY_TIME_VALUES = frozenset({'-', '', 'None', 'nan'})
+
+# Día 0 de los números de serie de Excel (sistema 1900, con el 29/02/1900 ficticio)
+EXCEL_EPOCH = date(1899, 12, 30)
+# Números de serie aceptados como fecha (1927-05-18 a 2173-10-14); fuera de
+# ese rango un número en la columna de fecha se considera un dato inválido
+EXCEL_SERIAL_MIN = 10000
+EXCEL_SERIAL_MAX = 100000
+
+_SECONDS_PER_DAY = 86400
+
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+# Fracción de día escrita como texto ('0.2917'); '7.30' no se toma como fracción
+_DECIMAL_RE = re.compile(r'0?\.\d+')
+
+# Formatos de fecha en el orden en que se probaban con strptime
+_DATE_FORMATS: Tuple[Tuple[str, "re.Pattern[str]", Tuple[int, int, int]], ...] = (
+    # (formato strptime, patrón equivalente, posición de (año, mes, día))
+    ('%d/%m/%Y', re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), (3, 2, 1)),
+    ('%Y-%m-%d', re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'), (1, 2, 3)),
+    ('%d-%m-%Y', re.compile(r'(\d{1,2})-(\d{1,2})-(\d{4})'), (3, 2, 1)),
+    ('%Y/%m/%d', re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})'), (1, 2, 3)),
+)
+
+# Horas de 24 h ('14:30', '14:30:00') y de 12 h ('2:30 pm', '02:30:00 PM',
+# '2:30PM'). Como en strptime, con segundos el sufijo va separado por espacio.
+_TIME_24_RE = re.compile(r'(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?')
+_TIME_12_RE = re.compile(r'(\d{1,2}):(\d{1,2})(?::(\d{1,2})\s+|\s*)([ap])m', re.IGNORECASE)
+_TIME_FORMATS = ('%H:%M:%S', '%H:%M', '%I:%M:%S %p', '%I:%M %p', '%I:%M%p')
+
+
+def day_name(value: date) -> str:
+    """Nombre del día de la semana en español."""
+    return DAY_NAMES[value.weekday()]
+
+
+def excel_serial_to_date(serial: float) -> Optional[date]:
+    """Fecha de un número de serie de Excel, o None si está fuera de rango."""
+    if not EXCEL_SERIAL_MIN <= serial < EXCEL_SERIAL_MAX:
+        return None
+    return EXCEL_EPOCH + timedelta(days=int(serial))
+
+
+def excel_fraction_to_time(serial: float) -> str:
+    """Hora 'HH:MM:SS' de la parte fraccionaria de un número de serie de Excel."""
+    seconds = round((serial % 1) * _SECONDS_PER_DAY) % _SECONDS_PER_DAY
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _ColumnParser:
+    """Base de los analizadores: memoización acotada y formato fijado por columna."""
+
+    FORMAT_COUNT = 0
+
+    def __init__(self, memo_size: int = MEMO_SIZE):
+        """
+        Args:
+            memo_size: Valores distintos que se recuerdan; 0 desactiva la caché
+        """
+        self.locked: Optional[int] = None
+        self._sequence: Tuple[int, ...] = tuple(range(self.FORMAT_COUNT))
+        self._memo = lru_cache(maxsize=memo_size)(self.convert) if memo_size else None
+
+    def parse(self, value: Any) -> Any:
+        """Convierte un valor usando la caché (los valores no hashables se convierten directo)."""
+        if self._memo is None:
+            return self.convert(value)
+        try:
+            return self._memo(value)
+        except TypeError:
+            return self.convert(value)
+
+    def convert(self, value: Any) -> Any:  # pragma: no cover - abstracto
+        raise NotImplementedError
+
+    def _lock(self, index: int) -> None:
+        """Fija el formato de la columna en el primer valor reconocido."""
+        if self.locked is None:
+            self.locked = index
+            self._sequence = (index,) + tuple(i for i in range(self.FORMAT_COUNT) if i != index)
+
+
+class DateColumnParser(_ColumnParser):
+    """
+    Convierte valores de una columna de fecha a ('YYYY-MM-DD', nombre_del_día),
+    o (None, '') si no es una fecha. Acepta datetime/date, números de serie
+    de Excel y textos en los formatos '%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y' y
+    '%Y/%m/%d'.
+    """
+
+    FORMAT_COUNT = len(_DATE_FORMATS)
+
+    def convert(self, value: Any) -> Tuple[Optional[str], str]:
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d'), day_name(value)
+        if isinstance(value, date):
+            return value.isoformat(), day_name(value)
+        if _is_number(value):
+            return self._from_serial(value)
+        if not isinstance(value, str):
+            return None, ""
+
+        text = value.strip()
+        for index in self._sequence:
+            _, pattern, (y, m, d) = _DATE_FORMATS[index]
+            match = pattern.fullmatch(text)
+            if match is None:
+                continue
+            try:
+                parsed = date(int(match.group(y)), int(match.group(m)), int(match.group(d)))
+            except ValueError:
+                continue
+            self._lock(index)
+            return parsed.isoformat(), day_name(parsed)
+
+        if _NUMBER_RE.fullmatch(text):
+            return self._from_serial(float(text))
+        return None, ""
+
+    @staticmethod
+    def _from_serial(serial: float) -> Tuple[Optional[str], str]:
+        parsed = excel_serial_to_date(serial)
+        if parsed is None:
+            return None, ""
+        return parsed.isoformat(), day_name(parsed)
+
+
+class TimeColumnParser(_ColumnParser):
+    """
+    Convierte valores de una columna de marca a 'HH:MM:SS', o None si la
+    marca está vacía ('-', '', 'None', 'nan'). Acepta datetime/time,
+    fracciones de día de Excel y textos de 24 h o 12 h; un texto no
+    reconocido se devuelve limpio, como antes.
+    """
+
+    FORMAT_COUNT = 2
+
+    def convert(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, (datetime, time)):
+            return value.strftime('%H:%M:%S')
+        if _is_number(value):
+            return excel_fraction_to_time(value) if math.isfinite(value) else None
+
+        text = str(value).strip()
+        if text in EMPTY_TIME_VALUES:
+            return None
+
+        for index in self._sequence:
+            result = self._match_24(text) if index == 0 else self._match_12(text)
+            if result is not None:
+                self._lock(index)
+                return result
+
+        if _DECIMAL_RE.fullmatch(text):
+            return excel_fraction_to_time(float(text))
+        return strptime_time(text)
+
+    @staticmethod
+    def _match_24(text: str) -> Optional[str]:
+        match = _TIME_24_RE.fullmatch(text)
+        if match is None:
+            return None
+        h, m, s = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+        # Rangos de %H/%M/%S; '24:00', '07:60' o segundos bisiestos van a strptime
+        if h > 23 or m > 59 or s > 59:
+            return None
+        return f"{h:02d}:{m:02d}:{s:02d}"
+
+    @staticmethod
+    def _match_12(text: str) -> Optional[str]:
+        match = _TIME_12_RE.fullmatch(text)
+        if match is None:
+            return None
+        h, m, s = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+        if not 1 <= h <= 12 or m > 59 or s > 59:
+            return None
+        h = h % 12 + (12 if match.group(4).lower() == 'p' else 0)
+        return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+# -------------------------------------------------------------------------
+# Conversión con strptime (ruta lenta y referencia del benchmark)
+# -------------------------------------------------------------------------
+
+def strptime_time(text: str) -> Optional[str]:
+    """Prueba los formatos de hora uno por uno; si ninguno sirve devuelve el texto."""
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%H:%M:%S')
+        except ValueError:
+            continue
+    return text
+
+
+def strptime_date(text: str) -> Tuple[Optional[str], str]:
+    """Prueba los formatos de fecha uno por uno."""
+    for fmt, _, _ in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(text.strip(), fmt)
+        except ValueError:
+            continue
+        return parsed.strftime('%Y-%m-%d'), day_name(parsed)
+    return None, ""
+
+
+# Analizadores compartidos para conversiones sueltas (p.ej. horarios de turnos)
+_default_date = DateColumnParser()
+_default_time = TimeColumnParser()
+
+
+def parse_date(value: Any) -> Tuple[Optional[str], str]:
+    """('YYYY-MM-DD', nombre_del_día) de un valor de fecha, o (None, '')."""
+    return _default_date.parse(value)
+
+
+def parse_time(value: Any) -> Optional[str]:
+    """'HH:MM:SS' de un valor de hora, None si está vacío."""
+    return _default_time.parse(value)
+
+
+# -------------------------------------------------------------------------
+# Micro-benchmark
+# -------------------------------------------------------------------------
+
+def _sample_values(rows: int) -> Tuple[List[Any], List[Any]]:
+    """Columnas de fecha y hora típicas de un mes de reporte."""
+    fechas = [f"{day % 30 + 1:02d}/03/2025" for day in range(rows)]
+    marcas: List[Any] = []
+    for i in range(rows):
+        kind = i % 5
+        if kind == 0:
+            marcas.append('-')
+        elif kind == 1:
+            marcas.append(f"{i % 3 + 6}:{i * 7 % 60:02d} pm")
+        else:
+            marcas.append(f"{i % 3 + 6:02d}:{i * 7 % 60:02d}")
+    return fechas, marcas
+
+
+def _time_per_value(fn: Callable[[Any], Any], values: Sequence[Any]) -> float:
+    start = _time.perf_counter()
+    for value in values:
+        fn(value)
+    return (_time.perf_counter() - start) / len(values) * 1e6
+
+
+def benchmark(rows: int = 100000) -> None:
+    """Imprime el costo por valor (µs) de cada forma de conversión."""
+    fechas, marcas = _sample_values(rows)
+
+    def legacy_time(value: Any) -> Optional[str]:
+        text = str(value).strip()
+        return None if text in EMPTY_TIME_VALUES else strptime_time(text)
+
+    cases = (
+        ('fecha  strptime', strptime_date, fechas),
+        ('fecha  patrones', DateColumnParser(memo_size=0).convert, fechas),
+        ('fecha  con caché', DateColumnParser().parse, fechas),
+        ('hora   strptime', legacy_time, marcas),
+        ('hora   patrones', TimeColumnParser(memo_size=0).convert, marcas),
+        ('hora   con caché', TimeColumnParser().parse, marcas),
+    )
+    print(f"{rows:,} valores por caso")
+    for label, fn, values in cases:
+        print(f"  {label:<18} {_time_per_value(fn, values):7.2f} µs/valor")
+
+    parsers = (DateColumnParser(memo_size=0).convert, TimeColumnParser(memo_size=0).convert)
+    mismatches = sum(parsers[0](v) != strptime_date(v) for v in fechas[:5000])
+    mismatches += sum(parsers[1](v) != legacy_time(v) for v in marcas[:5000])
+    print(f"  diferencias con strptime: {mismatches}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.employee_service import EmployeeService
 from database.reference_service import ReferenceService
 from database.operation_result import OperationResult, OperationStatus
+from gui.background import BackgroundExecutor, run_in_background
 
 
 class EmployeesView:
@@ -24,7 +25,8 @@ class EmployeesView:
     def __init__(self, parent_frame: tk.Frame, 
                  employee_service: Optional[EmployeeService],
                  reference_service: Optional[ReferenceService],
-                 refresh_callback: Optional[Callable] = None):
+                 refresh_callback: Optional[Callable] = None,
+                 executor: Optional[BackgroundExecutor] = None):
         """
         Inicializa la vista de empleados.
         
@@ -33,11 +35,13 @@ class EmployeesView:
             employee_service: Servicio de empleados
             reference_service: Servicio de referencias
             refresh_callback: Callback para refrescar la vista
+            executor: Ejecutor para consultar la BD sin bloquear la interfaz
         """
         self.parent_frame = parent_frame
         self.employee_service = employee_service
         self.reference_service = reference_service
         self.refresh_callback = refresh_callback
+        self.executor = executor
         self.container = None
         
     def render(self):
@@ -236,12 +240,27 @@ class EmployeesView:
         # Verificar servicio
         assert self.employee_service is not None
         
-        # Ejecutar carga de datos (simulada asíncrona para UI)
-        self.container.after(50, lambda: self._render_table_data(search_term))
+        # Consultar en segundo plano; la tabla se dibuja al llegar los datos
+        run_in_background(
+            self.container,
+            self.executor,
+            lambda: self._fetch_employees(search_term),
+            on_success=lambda data: self._render_table_data(search_term, data),
+            on_error=lambda exc: self._render_table_data(search_term, None, exc),
+            key='employees_table',
+        )
 
-    def _render_table_data(self, search_term):
+    def _fetch_employees(self, search_term):
+        """Obtiene los empleados (se ejecuta fuera del hilo de la interfaz)"""
+        assert self.employee_service is not None
+        if search_term:
+            return self.employee_service.search_employees(search_term)
+        # Réplica local: solo se descargan los empleados que cambiaron
+        return self.employee_service.get_all_employees_synced()
+
+    def _render_table_data(self, search_term, employees, error=None):
         """Renderiza los datos de la tabla después de cargar"""
-        if self.container is None or self.employee_service is None:
+        if self.container is None or not self.container.winfo_exists():
             return
 
         # Limpiar loading
@@ -293,12 +312,10 @@ class EmployeesView:
             ).place(relx=sum([h[1] for h in headers[:headers.index((header_text, width))]]), 
                    rely=0, relwidth=width, relheight=1)
         
-        # Obtener datos
+        # Mostrar datos
         try:
-            if search_term:
-                employees = self.employee_service.search_employees(search_term)
-            else:
-                employees = self.employee_service.get_all_employees()
+            if error is not None:
+                raise error
             
             if not employees:
                 tk.Label(
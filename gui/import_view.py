@@ -7,10 +7,10 @@ Descripción: Importación de datos desde archivos Excel
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-from typing import Optional, Dict, Any
+from typing import Optional, List
 import sys
 import os
-from datetime import datetime, time
+from itertools import chain, islice
 
 # Importar openpyxl para manejo de Excel
 try:
@@ -22,12 +22,25 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.attendance_service import AttendanceService
 from database.employee_service import EmployeeService
+from database.reference_service import ReferenceService
+from gui.attendance_parser import (
+    HEADER_SCAN_ROWS, DelimitedFile, ImportStats, extract_employee_code, find_column_indexes,
+    find_workbooks, is_delimited_file, iter_attendance_rows, iter_delimited_rows,
+    iter_workbooks, parse_excel_time,
+)
+from gui.background import BackgroundExecutor, run_in_background
+from gui.components import ProgressDialog
+from gui.import_worker import AttendanceImportWorker, ImportProgress
+
+# Milisegundos entre actualizaciones de la ventana de progreso
+PROGRESS_POLL_MS = 200
 
 
 class ImportView:
     """Vista para importar datos desde Excel"""
     
-    def __init__(self, parent_frame: tk.Frame, attendance_service: Optional[AttendanceService] = None, employee_service: Optional[EmployeeService] = None):
+    def __init__(self, parent_frame: tk.Frame, attendance_service: Optional[AttendanceService] = None, employee_service: Optional[EmployeeService] = None,
+                 executor: Optional[BackgroundExecutor] = None):
         """
         Inicializa la vista de importación.
         
@@ -35,10 +48,13 @@ class ImportView:
             parent_frame: Frame contenedor principal
             attendance_service: Servicio de asistencias para importar datos
             employee_service: Servicio de empleados (No utilizado actualmente, mantenido por compatibilidad)
+            executor: Ejecutor para las tareas de mantenimiento en segundo plano
         """
         self.parent_frame = parent_frame
         self.attendance_service = attendance_service
         self.employee_service = employee_service
+        self.executor = executor
+        self._import_worker: Optional[AttendanceImportWorker] = None
         
     def render(self):
         """Renderiza la vista completa de importación"""
@@ -113,12 +129,36 @@ class ImportView:
         
         options = [
             {
-                'title': '📝 Importar Asistencias (Excel)',
-                'description': 'Importa registros desde "Reporte_AsistenciaDetallado.xlsx"',
+                'title': '📝 Importar Asistencias (Excel / CSV)',
+                'description': 'Importa registros desde "Reporte_AsistenciaDetallado.xlsx" o un CSV/TSV exportado por el reloj',
                 'columns': 'Hoja: Resumen Detallado (Codigo, Fecha, Turno, Ingreso, Salida)',
                 'example': 'Formato estándar del reporte de asistencia',
                 'command': lambda: self._import_attendance_excel(),
-                'btn_text': '📂 Seleccionar Excel (.xlsx)'
+                'btn_text': '📂 Seleccionar Excel (.xlsx) o CSV'
+            },
+            {
+                'title': '📚 Importar Varios Archivos (Kardex)',
+                'description': 'Importa todos los libros de una carpeta, con todas sus hojas (p.ej. un Kardex por empleado)',
+                'columns': 'Cada hoja: Código en cabecera o columna, Fecha, Turno, Ingreso, Salida',
+                'example': 'Reporte Individual por empleado o Reporte Detallado',
+                'command': lambda: self._import_attendance_batch(from_folder=True),
+                'btn_text': '📁 Seleccionar carpeta'
+            },
+            {
+                'title': '🗂️ Importar Archivos Seleccionados',
+                'description': 'Igual que la importación por carpeta, eligiendo los archivos uno a uno',
+                'columns': 'Cada hoja: Código en cabecera o columna, Fecha, Turno, Ingreso, Salida',
+                'example': 'Selección múltiple con Ctrl / Shift',
+                'command': lambda: self._import_attendance_batch(from_folder=False),
+                'btn_text': '📂 Seleccionar archivos (.xlsx / .csv)'
+            },
+            {
+                'title': '🔄 Recalcular Horas Extras de un Turno',
+                'description': 'Después de corregir el horario de un turno (p.ej. uno creado con 00:00:00 por la importación), vuelve a calcular h25/h35/h100 de sus asistencias',
+                'columns': 'Turno: código existente (M01, T01, ...)',
+                'example': 'Las asistencias se reescriben por bloques para que el trigger recalcule',
+                'command': lambda: self._recompute_shift_overtime(),
+                'btn_text': '🔄 Seleccionar turno'
             }
         ]
         
@@ -243,7 +283,7 @@ class ImportView:
 
     def _import_attendance_excel(self):
         """
-        Importa asistencias analizando un reporte.
+        Importa asistencias analizando un reporte (Excel o CSV/TSV).
         Soporta dos formatos:
         1. Reporte Individual (Kardex): Código en cabecera.
         2. Reporte Detallado (Lista): Código en columna de tabla.
@@ -252,318 +292,382 @@ class ImportView:
             messagebox.showerror("Error", "No hay conexión a la base de datos")
             return
 
-        if openpyxl is None:
-            messagebox.showerror("Error", "La librería 'openpyxl' no está instalada.")
+        if self._import_worker is not None and self._import_worker.is_running():
+            messagebox.showwarning("Importación en curso", "Espere a que termine la importación actual.")
             return
 
         filename = filedialog.askopenfilename(
             title="Seleccionar Reporte de Asistencia",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[("Excel / CSV", "*.xlsx *.csv *.tsv *.txt"), ("Excel files", "*.xlsx"),
+                       ("CSV / TSV", "*.csv *.tsv *.txt"), ("All files", "*.*")]
         )
         
         if not filename:
             return
+
+        if is_delimited_file(filename):
+            self._import_attendance_delimited(filename)
+            return
+
+        if openpyxl is None:
+            messagebox.showerror("Error", "La librería 'openpyxl' no está instalada.")
+            return
         
+        wb = None
         try:
-            wb = openpyxl.load_workbook(filename, data_only=True)
+            # Modo solo lectura: las filas se leen del XML a medida que se
+            # recorren, sin cargar el libro completo como objetos de celda
+            wb = openpyxl.load_workbook(filename, read_only=True, data_only=True)
             sheet = wb.active
 
             if sheet is None:
                 messagebox.showerror("Error", "El archivo Excel no tiene una hoja activa.")
+                wb.close()
                 return
             
             assert sheet is not None
 
-            # 1. DETECTAR ESTRUCTURA (Encabezados)
-            headers_map, start_row = self._find_column_indexes(sheet)
-            
-            if headers_map['fecha'] is None:
-                messagebox.showerror("Error de Formato", "No se encontró la columna 'Fecha' en el archivo.")
+            # 1-2. DETECTAR ESTRUCTURA sobre las primeras filas del stream
+            rows = sheet.iter_rows(values_only=True)
+            head = list(islice(rows, HEADER_SCAN_ROWS))
+            structure = self._detect_structure(head)
+            if structure is None:
+                wb.close()
                 return
-
-            # 2. DETERMINAR ESTRATEGIA DE CÓDIGO
-            # Si hay columna de código, usamos esa. Si no, buscamos en cabecera.
-            col_idx_codigo = headers_map.get('codigo')
-            codigo_header = None
-            
-            if col_idx_codigo is None:
-                codigo_header = self._extract_employee_code(sheet)
-                if not codigo_header:
-                    from tkinter import simpledialog
-                    codigo_header = simpledialog.askstring(
-                        "Código no detectado", 
-                        "No se detectó columna 'Código' ni cabecera.\nIngrese el código único para este archivo:"
-                    )
-                    if not codigo_header:
-                        return
-
-            # 3. PROCESAR FILAS
-            success_count = 0
-            error_count = 0
-            skipped_count = 0
-            errors = []
-            processed_codes = set()
-
-            for idx, row in enumerate(sheet.iter_rows(min_row=start_row + 1, values_only=True), start=start_row + 1):
-                try:
-                    # Determinar Código
-                    if col_idx_codigo is not None:
-                        val_code = row[col_idx_codigo]
-                        current_code = str(val_code).strip() if val_code else None
-                    else:
-                        current_code = codigo_header
-
-                    if not current_code:
-                        continue
-                        
-                    processed_codes.add(current_code)
-
-                    # Validar Fecha
-                    fecha_val = row[headers_map['fecha']]
-                    if not fecha_val:
-                        continue
-
-                    fecha_str, dia_semana = self._parse_excel_date(fecha_val)
-                    if not fecha_str:
-                        continue
-
-                    # Validar Turno
-                    codigo_turno = "GEN"
-                    val_turno_raw = None
-                    if headers_map['turno'] is not None:
-                        val_turno = row[headers_map['turno']]
-                        if val_turno:
-                            val_turno_raw = str(val_turno)
-                            codigo_turno = val_turno_raw.split(' ')[0][:10]
-
-                    # Asegurar que el turno exista
-                    self._ensure_shift_exists(codigo_turno, val_turno_raw)
-
-                    # Validar Marcas
-                    marca_entrada = None
-                    marca_salida = None
-                    
-                    if headers_map['entrada'] is not None:
-                        marca_entrada = self._parse_excel_time(row[headers_map['entrada']])
-                    
-                    if headers_map['salida'] is not None:
-                        marca_salida = self._parse_excel_time(row[headers_map['salida']])
-
-                    # CRITERIO: Solo importar si hay al menos una marca
-                    if not marca_entrada and not marca_salida:
-                        skipped_count += 1
-                        continue
-
-                    # Insertar
-                    result = self.attendance_service.create_attendance(
-                        fecha=fecha_str,
-                        codigo_empleado=current_code,
-                        codigo_turno=codigo_turno,
-                        dia=dia_semana or "",
-                        marca_entrada=marca_entrada,
-                        marca_salida=marca_salida
-                    )
-                    
-                    if result.ok:
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        if len(errors) < 5:
-                            errors.append(f"Fila {idx} ({current_code}): {result.message}")
-
-                except Exception as e:
-                    error_count += 1
-
-            # 4. RESUMEN
-            empleados_str = f"{len(processed_codes)} empleados detectados" if len(processed_codes) > 1 else f"Empleado: {list(processed_codes)[0] if processed_codes else '?'}"
-            
-            msg = (f"Importación Finalizada\n{empleados_str}\n\n"
-                   f"✅ Registros creados: {success_count}\n"
-                   f"⏭️ Omitidos (sin marcas): {skipped_count}\n"
-                   f"❌ Errores: {error_count}")
-            
-            if errors:
-                msg += "\n\nErrores (primeros 5):\n" + "\n".join(errors)
-            
-            messagebox.showinfo("Resultado", msg)
+            headers_map, start_row, codigo_header = structure
+
+            # 3. PROCESAR FILAS en segundo plano: lectura, validación y escritura
+            # en hilos separados, con commit por bloque (ver AttendanceImportWorker)
+            stats = ImportStats()
+            parsed = iter_attendance_rows(chain(head[start_row:], rows), start_row + 1,
+                                          headers_map, codigo_header, stats)
+            # La dimensión de la hoja (si el archivo la trae) estima el total
+            total_rows = sheet.max_row - start_row if sheet.max_row else None
+            self._start_import(parsed, stats, os.path.basename(filename),
+                               total_rows=total_rows, on_finish=wb.close)
 
         except Exception as e:
+            if wb is not None:
+                wb.close()
             messagebox.showerror("Error Crítico", f"Error procesando el archivo:\n{str(e)}")
 
-    def _extract_employee_code(self, sheet):
+    def _import_attendance_delimited(self, filename: str):
         """
-        Busca en las primeras 15 filas alguna celda que diga 'Código', 'Legajo' o 'DNI'
-        y toma el valor de la celda siguiente o adyacente.
+        Importa asistencias desde texto delimitado (CSV/TSV del reloj). Usa la
+        misma detección de encabezados que el Excel, lee el archivo como
+        stream y convierte las columnas por bloques.
         """
-        keywords = ['código', 'codigo', 'legajo', 'trabajador', 'dni', 'id', 'cod.']
-        
-        # Escanear las primeras 15 filas y primeras 10 columnas
-        for row in sheet.iter_rows(min_row=1, max_row=15, max_col=10, values_only=True):
-            for i, cell_value in enumerate(row):
-                if cell_value and isinstance(cell_value, str):
-                    val_lower = cell_value.lower().strip()
-                    
-                    # Caso 1: La celda es exactamente la keyword (o con :)
-                    # Ej: "Código" o "Código:"
-                    clean_val = val_lower.replace(':', '').strip()
-                    if clean_val in keywords:
-                        # El valor está en la celda de la derecha (i+1)
-                        if i + 1 < len(row) and row[i+1]:
-                            return str(row[i+1]).strip()
-                    
-                    # Caso 2: El valor está en la misma celda
-                    # Ej: "Código: E001" o "Legajo 1234"
-                    for k in keywords:
-                        if val_lower.startswith(k):
-                            # Intentar separar por ':'
-                            if ':' in cell_value:
-                                parts = cell_value.split(':')
-                                if len(parts) > 1:
-                                    val = parts[1].strip()
-                                    if val: return val
-                            
-                            # Si no tiene ':', ver si hay algo después de la keyword
-                            # Ej: "Legajo 12345"
-                            # Quitamos la keyword del inicio
-                            remainder = val_lower[len(k):].strip()
-                            if remainder:
-                                # Retornamos la parte correspondiente del string original
-                                # para preservar mayúsculas/minúsculas del código
-                                # Ajuste: buscar la posición de la keyword en el original para cortar bien
-                                start_idx = cell_value.lower().find(k)
-                                if start_idx != -1:
-                                    return cell_value[start_idx + len(k):].strip()
-                            
-        return None
+        source = None
+        try:
+            source = DelimitedFile(filename)
+            rows = source.rows()
+            head = list(islice(rows, HEADER_SCAN_ROWS))
+            structure = self._detect_structure(head)
+            if structure is None:
+                source.close()
+                return
+            headers_map, start_row, codigo_header = structure
 
-    def _find_column_indexes(self, sheet):
-        """
-        Busca la fila de encabezados de la tabla y mapea las columnas.
-        Retorna: (dict_map, row_index)
+            stats = ImportStats()
+            parsed = iter_delimited_rows(chain(head[start_row:], rows), start_row + 1,
+                                         headers_map, codigo_header, stats)
+            self._start_import(parsed, stats, os.path.basename(filename),
+                               total_rows=max(1, source.estimated_rows - start_row),
+                               on_finish=source.close)
+
+        except Exception as e:
+            if source is not None:
+                source.close()
+            messagebox.showerror("Error Crítico", f"Error procesando el archivo:\n{str(e)}")
+
+    def _detect_structure(self, head):
         """
-        map_cols: Dict[str, Any] = {'fecha': None, 'turno': None, 'entrada': None, 'salida': None, 'codigo': None}
-        found_header_row = 0
+        Detecta encabezados y código de empleado en las primeras filas.
+        Si no hay columna ni cabecera con el código se le pide al usuario.
         
-        # Palabras clave para identificar columnas
-        keys_fecha = ['fecha', 'date']
-        keys_turno = ['turno', 'horario']
-        keys_in = ['entrada', 'ingreso', 'inicio', 'in']
-        keys_out = ['salida', 'fin', 'out', 'retiro']
-        keys_code = ['codigo', 'legajo', 'dni', 'trabajador']
+        Returns:
+            (headers_map, start_row, codigo_header), o None si se debe abortar
+        """
+        headers_map, start_row = find_column_indexes(head)
         
-        # Buscar hasta la fila 20
-        for r_idx, row in enumerate(sheet.iter_rows(min_row=1, max_row=20, values_only=True), start=1):
-            row_lower = [str(c).lower().strip() if c else '' for c in row]
-            
-            # Si encontramos "fecha" y ("entrada" o "ingreso"), es la fila de cabecera
-            # Verificamos si alguna celda contiene alguna de las keywords
-            has_fecha = any(any(k in cell for k in keys_fecha) for cell in row_lower)
-            has_in = any(any(k in cell for k in keys_in) for cell in row_lower)
-            has_out = any(any(k in cell for k in keys_out) for cell in row_lower)
-            
-            if has_fecha and (has_in or has_out):
-                found_header_row = r_idx
-                
-                # Mapear índices (Priorizar la primera coincidencia encontrada de izquierda a derecha)
-                for c_idx, val in enumerate(row_lower):
-                    if map_cols['fecha'] is None and any(k in val for k in keys_fecha):
-                        map_cols['fecha'] = c_idx
-                    elif map_cols['turno'] is None and any(k in val for k in keys_turno):
-                        map_cols['turno'] = c_idx
-                    elif map_cols['entrada'] is None and any(k in val for k in keys_in):
-                        map_cols['entrada'] = c_idx
-                    elif map_cols['salida'] is None and any(k in val for k in keys_out):
-                        map_cols['salida'] = c_idx
-                    elif map_cols['codigo'] is None and any(k in val for k in keys_code):
-                        map_cols['codigo'] = c_idx
-                break
+        if headers_map['fecha'] is None:
+            messagebox.showerror("Error de Formato", "No se encontró la columna 'Fecha' en el archivo.")
+            return None
+
+        # Si hay columna de código, usamos esa. Si no, buscamos en cabecera.
+        codigo_header = None
         
-        # Fallback: Si no encuentra cabeceras claras, usar posiciones estándar de un Kardex común
-        # Suponiendo: A=Fecha, B=Turno, C=Entrada, D=Salida
-        if found_header_row == 0:
-            # Asumir que los datos empiezan en fila 2 si no hay cabecera
-            return {'fecha': 0, 'turno': 1, 'entrada': 2, 'salida': 3, 'codigo': None}, 1
-            
-        return map_cols, found_header_row
+        if headers_map.get('codigo') is None:
+            codigo_header = extract_employee_code(head)
+            if not codigo_header:
+                codigo_header = simpledialog.askstring(
+                    "Código no detectado", 
+                    "No se detectó columna 'Código' ni cabecera.\nIngrese el código único para este archivo:"
+                )
+                if not codigo_header:
+                    return None
 
-    def _parse_excel_date(self, val):
-        """Auxiliar para convertir fecha de excel a string YYYY-MM-DD"""
-        fecha_str = None
-        dia_semana = ""
+        return headers_map, start_row, codigo_header
+
+    def _import_attendance_batch(self, from_folder: bool):
+        """
+        Importa varios libros a la vez (p.ej. un Kardex por empleado), con
+        todas sus hojas. Los libros se analizan en paralelo en un
+        ProcessPoolExecutor y sus filas se escriben en una sola importación.
         
-        try:
-            if isinstance(val, datetime):
-                fecha_str = val.strftime('%Y-%m-%d')
-                dia_semana = self._get_day_name(val)
-            elif isinstance(val, str):
-                # Intentar parsear strings comunes
-                for fmt in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y/%m/%d'):
-                    try:
-                        dt = datetime.strptime(val.strip(), fmt)
-                        fecha_str = dt.strftime('%Y-%m-%d')
-                        dia_semana = self._get_day_name(dt)
-                        break
-                    except ValueError:
-                        continue
-        except:
-            pass
-            
-        return fecha_str, dia_semana
+        Args:
+            from_folder: True para elegir una carpeta, False para elegir archivos
+        """
+        if not self.attendance_service:
+            messagebox.showerror("Error", "No hay conexión a la base de datos")
+            return
 
-    def _parse_excel_time(self, val):
-        """Auxiliar para convertir hora de excel a string HH:MM:SS"""
-        if val is None or str(val).strip() in ['-', '', 'None', 'nan']:
-            return None
-        try:
-            # Caso 1: Objetos datetime/time nativos
-            if isinstance(val, (datetime, time)):
-                return val.strftime('%H:%M:%S')
-            
-            # Caso 2: Strings
-            val_str = str(val).strip()
-            
-            # Intentar formatos comunes de 24h y 12h
-            formats = [
-                '%H:%M:%S',     # 14:30:00
-                '%H:%M',        # 14:30
-                '%I:%M:%S %p',  # 02:30:00 PM
-                '%I:%M %p',     # 02:30 PM
-                '%I:%M%p'       # 02:30PM
-            ]
-            
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(val_str, fmt)
-                    return dt.strftime('%H:%M:%S')
-                except ValueError:
-                    continue
-                    
-            # Si no coincide con ninguno, devolver limpio (fallback)
-            return val_str
-        except:
-            return None
+        if self._import_worker is not None and self._import_worker.is_running():
+            messagebox.showwarning("Importación en curso", "Espere a que termine la importación actual.")
+            return
 
-    def _get_day_name(self, dt):
-        days = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-        return days[dt.weekday()]
+        paths: List[str]
+        if from_folder:
+            folder = filedialog.askdirectory(title="Seleccionar carpeta con reportes de asistencia")
+            if not folder:
+                return
+            try:
+                paths = find_workbooks(folder)
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo leer la carpeta:\n{str(e)}")
+                return
+            if not paths:
+                messagebox.showwarning("Sin archivos", "La carpeta no contiene archivos Excel (.xlsx) ni CSV.")
+                return
+        else:
+            paths = list(filedialog.askopenfilenames(
+                title="Seleccionar Reportes de Asistencia",
+                filetypes=[("Excel / CSV", "*.xlsx *.csv *.tsv *.txt"), ("All files", "*.*")]
+            ))
+            if not paths:
+                return
+
+        stats = ImportStats()
+        parsed = iter_workbooks(paths, stats)
+        label = f"{len(paths)} archivos" if len(paths) != 1 else os.path.basename(paths[0])
+        self._start_import(parsed, stats, label)
 
-    def _ensure_shift_exists(self, shift_code, shift_raw_value=None):
+    def _start_import(self, parsed, stats: ImportStats, label: str,
+                      total_rows: Optional[int] = None, on_finish=None):
         """
-        Verifica si el turno existe en la BD. Si no, lo crea.
-        Usa una caché local para evitar consultas repetitivas.
+        Inicia AttendanceImportWorker con las filas analizadas y muestra su avance.
+        on_finish se llama en el hilo de Tk al terminar (p.ej. para cerrar el libro).
+        """
+        worker = AttendanceImportWorker(
+            self.attendance_service, parsed, stats,
+            create_shift=self._create_shift,
+            total_rows=total_rows,
+        )
+        self._import_worker = worker
+        worker.start()
+        self._show_import_progress(worker, label, on_finish)
+
+    def _show_import_progress(self, worker: AttendanceImportWorker, label: str, on_finish=None):
+        """Ventana con el avance de la importación y el botón para cancelarla."""
+        dialog = tk.Toplevel(self.parent_frame)
+        dialog.title("Importando asistencias")
+        dialog.geometry("460x230")
+        dialog.resizable(False, False)
+        dialog.transient(self.parent_frame.winfo_toplevel())
+        dialog.grab_set()
+
+        # Centrar
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - 230
+        y = (dialog.winfo_screenheight() // 2) - 115
+        dialog.geometry(f'460x230+{x}+{y}')
+
+        main_frame = tk.Frame(dialog, bg='white', padx=25, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text=f"📂 {label}",
+            font=('Segoe UI', 11, 'bold'),
+            bg='white',
+            fg='#2c3e50',
+            anchor='w'
+        ).pack(fill='x', pady=(0, 10))
+
+        progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
+        progress_bar.pack(fill='x', pady=(0, 10))
+
+        status_label = tk.Label(main_frame, text="Iniciando...", font=('Segoe UI', 9),
+                                bg='white', fg='#546e7a', anchor='w', justify='left')
+        status_label.pack(fill='x')
+
+        def cancel():
+            worker.cancel()
+            cancel_btn.config(state='disabled', text="Cancelando...")
+
+        cancel_btn = tk.Button(
+            main_frame,
+            text="✖ Cancelar",
+            command=cancel,
+            font=('Segoe UI', 9, 'bold'),
+            bg='#f44336',
+            fg='white',
+            activebackground='#d32f2f',
+            relief='flat',
+            cursor='hand2',
+            padx=20,
+            pady=6
+        )
+        cancel_btn.pack(side='bottom', pady=(10, 0))
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+
+        def poll():
+            progress = worker.progress()
+            if progress.finished:
+                worker.join()
+                if on_finish is not None:
+                    on_finish()
+                dialog.grab_release()
+                dialog.destroy()
+                self._import_worker = None
+                self._show_import_summary(progress)
+                return
+
+            fraction = progress.fraction
+            if fraction is None:
+                if str(progress_bar['mode']) != 'indeterminate':
+                    progress_bar.config(mode='indeterminate')
+                    progress_bar.start(15)
+            else:
+                progress_bar['value'] = fraction * 100
+            status_label.config(text=self._format_import_progress(progress))
+            dialog.after(PROGRESS_POLL_MS, poll)
+
+        dialog.after(PROGRESS_POLL_MS, poll)
+
+    def _format_import_progress(self, progress: ImportProgress) -> str:
+        """Texto de avance: filas leídas, velocidad y tiempo restante."""
+        if progress.total_rows:
+            read = f"{progress.rows_read:,} de ~{progress.total_rows:,} filas"
+        elif progress.files_total:
+            read = f"{progress.files_done} de {progress.files_total} archivos · {progress.rows_read:,} filas"
+        else:
+            read = f"{progress.rows_read:,} filas"
+        eta = progress.eta
+        eta_str = f"{int(eta // 60)}:{int(eta % 60):02d}" if eta is not None else "--:--"
+        return (f"{read} · {progress.rate:,.0f} filas/s · restante {eta_str}\n"
+                f"✅ Creados: {progress.written:,}   🔁 Existentes: {progress.duplicates:,}   "
+                f"❌ Errores: {progress.errors:,}")
+
+    def _show_import_summary(self, progress: ImportProgress):
+        """Resumen final de la importación."""
+        empleados_str = f"{progress.employees} empleados detectados" if progress.employees != 1 else "1 empleado detectado"
+
+        if progress.error:
+            title = "Importación interrumpida"
+            header = f"Importación interrumpida por un error:\n{progress.error}\n\nSe conservaron los bloques ya confirmados."
+        elif progress.cancelled:
+            title = "Importación cancelada"
+            header = "Importación cancelada\nSe conservaron los bloques ya confirmados."
+        else:
+            title = "Resultado"
+            header = "Importación Finalizada"
+
+        msg = (f"{header}\n{empleados_str}\n\n"
+               f"✅ Registros creados: {progress.written}\n"
+               f"⏭️ Omitidos (sin marcas): {progress.skipped}\n"
+               f"🔁 Ya existentes (omitidos): {progress.duplicates}\n"
+               f"❌ Errores: {progress.errors}\n"
+               f"⏱️ {progress.rows_read:,} filas en {progress.elapsed:.1f} s "
+               f"({progress.chunks} bloques confirmados)")
+
+        if progress.error_samples:
+            msg += "\n\nErrores (primeros 5):\n" + "\n".join(progress.error_samples)
+
+        if progress.error:
+            messagebox.showerror(title, msg)
+        else:
+            messagebox.showinfo(title, msg)
+
+    def _recompute_shift_overtime(self):
+        """Pide un turno y recalcula las horas extras de sus asistencias con una ventana de avance."""
+        if not self.attendance_service:
+            messagebox.showerror("Error", "No hay conexión a la base de datos")
+            return
+        # Horarios vigentes (sin la caché de referencia) leídos en segundo plano
+        reference = ReferenceService(self.attendance_service.db)
+        run_in_background(
+            self.parent_frame,
+            self.executor,
+            lambda: reference.get_shifts(force_refresh=True),
+            on_success=self._ask_shift_to_recompute,
+            on_error=lambda exc: messagebox.showerror("Recalcular horas extras", f"Error al listar turnos: {exc}"),
+            key='recompute_shift_list',
+        )
+
+    def _ask_shift_to_recompute(self, shifts):
+        """Confirma el turno a recalcular con su horario actual y lanza el recálculo"""
+        if shifts is None:
+            messagebox.showerror("Recalcular horas extras", "No se pudieron obtener los turnos")
+            return
+        service = self.attendance_service
+        schedule = {str(row['codigo_turno']): (row['hora_entrada'], row['hora_salida']) for row in shifts}
+
+        shift_code = simpledialog.askstring(
+            "Recalcular horas extras",
+            "Código del turno cuyo horario se corrigió:\n" + ", ".join(sorted(schedule)),
+            parent=self.parent_frame
+        )
+        if not shift_code:
+            return
+        shift_code = shift_code.strip()
+        shift_code = next((code for code in schedule if code.lower() == shift_code.lower()), shift_code)
+        if shift_code not in schedule:
+            messagebox.showwarning("Recalcular horas extras", f"No se encontró el turno {shift_code}")
+            return
+        hora_entrada, hora_salida = schedule[shift_code]
+        if not messagebox.askyesno(
+            "Recalcular horas extras",
+            f"Turno {shift_code} ({hora_entrada} - {hora_salida})\n\n"
+            "Se volverán a calcular las horas extras de todas sus asistencias; "
+            "las horas extras corregidas a mano se reemplazarán. ¿Continuar?"
+        ):
+            return
+
+        dialog = ProgressDialog(self.parent_frame, "Recalculando horas extras", f"🔄 Turno {shift_code}")
+
+        def finished(summary):
+            dialog.close()
+            msg = (f"Turno {shift_code}\n\n"
+                   f"✅ Asistencias recalculadas: {summary.updated}\n"
+                   f"❌ Con error: {summary.failed}")
+            if summary.errors:
+                msg += "\n\n" + "\n".join(summary.errors[:5])
+            if summary.ok:
+                messagebox.showinfo("Recalcular horas extras", msg)
+            else:
+                messagebox.showerror("Recalcular horas extras", msg)
+
+        def failed(exc):
+            dialog.close()
+            messagebox.showerror("Recalcular horas extras", f"Error recalculando: {exc}")
+
+        run_in_background(
+            self.parent_frame,
+            self.executor,
+            lambda: service.recompute_overtime_for_shift(shift_code, progress=dialog.report),
+            on_success=finished,
+            on_error=failed,
+            key='recompute_shift_overtime',
+        )
+
+    def _create_shift(self, shift_code, shift_raw_value=None):
+        """
+        Crea en la BD un turno que no existe, con el horario que se pueda
+        leer del texto original de la celda (00:00:00 si no se reconoce).
+        La llama AttendanceImportWorker desde su hilo de escritura, dentro de
+        la transacción del bloque; los turnos ya existentes los filtra el worker.
         """
-        if not hasattr(self, '_shift_cache'):
-            self._shift_cache = set()
-            # Cargar turnos existentes
-            if self.attendance_service and self.attendance_service.db:
-                success, _, results = self.attendance_service.db.execute_procedure("sp_listar_turnos")
-                if success:
-                    self._shift_cache = {r['codigo_turno'] for r in results}
-        
-        if shift_code in self._shift_cache:
-            return True
-            
-        # Si no está en caché, intentar insertarlo
         start_time = '00:00:00'
         end_time = '00:00:00'
         
@@ -580,8 +684,8 @@ class ImportView:
                     if '-' in times:
                         parts = times.split('-')
                         if len(parts) == 2:
-                            start_time = self._parse_excel_time(parts[0]) or '00:00:00'
-                            end_time = self._parse_excel_time(parts[1]) or '00:00:00'
+                            start_time = parse_excel_time(parts[0]) or '00:00:00'
+                            end_time = parse_excel_time(parts[1]) or '00:00:00'
                             
                 # Estrategia 2: Separador " a " (7:00 a 3:00 pm)
                 elif ' a ' in raw:
@@ -606,8 +710,8 @@ class ImportView:
                         t2_candidate = right_part
                         
                         # Convertir a 24h
-                        st = self._parse_excel_time(t1_candidate)
-                        et = self._parse_excel_time(t2_candidate)
+                        st = parse_excel_time(t1_candidate)
+                        et = parse_excel_time(t2_candidate)
                         
                         if st: start_time = st
                         if et: end_time = et
@@ -620,10 +724,5 @@ class ImportView:
         if self.attendance_service and self.attendance_service.db:
             query = "INSERT INTO turnos (codigo_turno, hora_entrada, hora_salida) VALUES (%s, %s, %s)"
             success, msg, _ = self.attendance_service.db.execute_insert(query, (shift_code, start_time, end_time))
-            
-            if success:
-                self._shift_cache.add(shift_code)
-                return True
-            else:
-                return False
+            return success
         return False
@@ -0,0 +1,322 @@
+"""
+Importación de asistencias en segundo plano
+Descripción: Canal de tres etapas (lectura, validación y escritura) conectadas
+             por colas acotadas. La escritura confirma cada bloque en su propia
+             transacción, de modo que una cancelación se detiene entre bloques
+             y conserva lo ya confirmado. Con LOAD DATA LOCAL INFILE habilitado
+             cada bloque se carga y fusiona en el servidor (carga por tabla de
+             paso). La vista consulta progress() desde el hilo de Tk para
+             mostrar el avance.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+from database.attendance_service import AttendanceService
+from database.batch_result import RowStatus
+from gui.attendance_parser import ImportStats, ParsedRow
+from gui.background import read_ahead
+
+logger = logging.getLogger(__name__)
+
+# Asistencias por bloque (y por transacción) entre las etapas
+IMPORT_CHUNK_SIZE = 2000
+# Asistencias por bloque en la carga por tabla de paso (un LOAD DATA por bloque)
+STAGED_CHUNK_SIZE = 20000
+# Bloques en espera entre una etapa y la siguiente
+IMPORT_QUEUE_DEPTH = 4
+# Errores de ejemplo que se conservan para el resumen
+MAX_ERROR_SAMPLES = 5
+
+# Crea un turno que no existe a partir del código y el texto original de la celda
+ShiftCreator = Callable[[str, Optional[str]], bool]
+
+
+@dataclass
+class ImportProgress:
+    """Foto del avance de una importación."""
+
+    rows_read: int = 0
+    total_rows: Optional[int] = None
+    written: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    errors: int = 0
+    chunks: int = 0
+    employees: int = 0
+    files_done: int = 0
+    files_total: int = 0
+    elapsed: float = 0.0
+    finished: bool = False
+    cancelled: bool = False
+    error: Optional[str] = None
+    error_samples: List[str] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        """Filas leídas por segundo."""
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Avance entre 0 y 1 (por filas, o por libros si son varios); None si no se conoce."""
+        if self.total_rows:
+            return min(1.0, self.rows_read / self.total_rows)
+        if self.files_total:
+            return self.files_done / self.files_total
+        return None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados, o None si no se pueden estimar."""
+        fraction = self.fraction
+        if not fraction or self.elapsed <= 0:
+            return None
+        return max(0.0, self.elapsed * (1.0 - fraction) / fraction)
+
+
+class AttendanceImportWorker:
+    """
+    Importa asistencias ya analizadas en tres etapas:
+
+    1. Lectura: recorre ``parsed`` en el hilo de read_ahead() y arma bloques.
+    2. Validación: descarta empleados desconocidos (sin consultar la base).
+    3. Escritura: crea los turnos faltantes y escribe el bloque con
+       bulk_upsert_attendance, o load_attendance_staged si la conexión admite
+       LOAD DATA LOCAL INFILE, todo en una transacción por bloque.
+
+    Todas las llamadas a la base se hacen desde el hilo de escritura y dentro
+    de una transacción, que usa su propia conexión también sin pool.
+
+    Entre etapas hay colas de ``queue_depth`` bloques, por lo que la memoria
+    no depende del tamaño del archivo. cancel() detiene la escritura antes
+    del siguiente bloque; los bloques ya confirmados se conservan.
+    """
+
+    def __init__(self, attendance_service: AttendanceService, parsed: Iterable[ParsedRow],
+                 stats: ImportStats, create_shift: Optional[ShiftCreator] = None,
+                 total_rows: Optional[int] = None, chunk_size: Optional[int] = None,
+                 queue_depth: int = IMPORT_QUEUE_DEPTH, staged: Optional[bool] = None):
+        """
+        Args:
+            attendance_service: Servicio usado para escribir los bloques
+            parsed: Filas analizadas (ver ParsedRow); se consumen en otro hilo
+            stats: Contadores que actualiza ``parsed`` mientras se recorre
+            create_shift: Crea un turno que no existe; False si no se pudo crear.
+                Se llama desde el hilo de escritura, dentro de la transacción del bloque
+            total_rows: Filas de datos estimadas del archivo, para el avance
+            chunk_size: Asistencias por bloque y por transacción; por defecto
+                IMPORT_CHUNK_SIZE, o STAGED_CHUNK_SIZE en la carga por tabla de paso
+            queue_depth: Bloques en espera entre etapas
+            staged: Cargar por tabla de paso en el servidor; por defecto si la
+                conexión lo admite (ver DatabaseConnection.supports_local_infile)
+        """
+        self.attendance_service = attendance_service
+        self._parsed = parsed
+        self._stats = stats
+        self._create_shift = create_shift
+        self._employee_codes: Optional[Set[str]] = None
+        self._known_shifts: Set[str] = set()
+        self._total_rows = total_rows
+        self.staged = attendance_service.db.supports_local_infile if staged is None else bool(staged)
+        if chunk_size is None:
+            chunk_size = STAGED_CHUNK_SIZE if self.staged else IMPORT_CHUNK_SIZE
+        self.chunk_size = max(1, int(chunk_size))
+        self.queue_depth = max(1, int(queue_depth))
+
+        self._validated: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=self.queue_depth)
+        self._cancel = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._progress = ImportProgress(total_rows=total_rows)
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Control (desde el hilo de Tk)
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Inicia la importación en un hilo propio."""
+        if self._thread is not None:
+            raise RuntimeError("La importación ya fue iniciada")
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='import-writer', daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Solicita detener la importación en el siguiente límite de bloque."""
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def progress(self) -> ImportProgress:
+        """Copia del avance actual, segura para leer desde cualquier hilo."""
+        with self._lock:
+            snapshot = replace(self._progress, error_samples=list(self._progress.error_samples))
+        end = self._finished_at if self._finished_at is not None else time.monotonic()
+        snapshot.elapsed = end - self._started_at if self._started_at is not None else 0.0
+        snapshot.rows_read = self._stats.rows
+        snapshot.skipped = self._stats.skipped
+        snapshot.errors += self._stats.errors
+        snapshot.employees = len(self._stats.codes)
+        snapshot.files_done = self._stats.files_done
+        snapshot.files_total = self._stats.files_total
+        # Hojas o libros que no se pudieron leer van antes que los errores de fila
+        messages = list(self._stats.messages)
+        snapshot.errors += len(messages)
+        snapshot.error_samples = (messages + snapshot.error_samples)[:MAX_ERROR_SAMPLES]
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        validator: Optional[threading.Thread] = None
+        error: Optional[str] = None
+        try:
+            self._load_reference_codes()
+            validator = threading.Thread(target=self._validate_stage, name='import-validate', daemon=True)
+            validator.start()
+            self._write_stage()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Importación de asistencias interrumpida: {error}")
+        finally:
+            self._stop.set()
+            self._drain_validated()
+            if validator is not None:
+                validator.join()
+            self._finished_at = time.monotonic()
+            with self._lock:
+                self._progress.error = error
+                self._progress.finished = True
+
+    def _validate_stage(self) -> None:
+        """Etapa 2: filtra cada bloque leído y lo pasa a la escritura."""
+        chunks = read_ahead(self._parsed, chunk_size=self.chunk_size, depth=self.queue_depth)
+        employee_codes = self._employee_codes
+        try:
+            for chunk in chunks:
+                if self._stop.is_set():
+                    return
+                valid: List[Tuple[int, Tuple[Any, ...], Optional[str]]] = []
+                for idx, record, turno_raw in chunk:
+                    if employee_codes is not None and record[1] not in employee_codes:
+                        self._record_error(idx, record[1], f"No se encontró el empleado {record[1]}")
+                        continue
+                    valid.append((idx, record, turno_raw))
+                if valid and not self._put(('chunk', valid)):
+                    return
+            self._put(('done', None))
+        except BaseException as e:
+            self._put(('error', e))
+        finally:
+            chunks.close()
+
+    def _write_stage(self) -> None:
+        """Etapa 3: escribe y confirma bloque por bloque."""
+        db = self.attendance_service.db
+        while True:
+            kind, payload = self._validated.get()
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise payload
+            if self._cancel.is_set():
+                logger.info("Importación de asistencias cancelada por el usuario")
+                with self._lock:
+                    self._progress.cancelled = True
+                return
+
+            employee_codes = self._employee_codes
+            with db.transaction() as tx:
+                created, failed_shifts = self._create_missing_shifts(payload)
+                valid = [(idx, record) for idx, record, _ in payload if record[2] not in failed_shifts]
+                records = [record for _, record in valid]
+                if self.staged:
+                    summary = self.attendance_service.load_attendance_staged(
+                        records, employee_codes=employee_codes
+                    )
+                else:
+                    summary = self.attendance_service.bulk_upsert_attendance(
+                        records, on_conflict='skip', employee_codes=employee_codes
+                    )
+            # Los turnos creados en un bloque revertido no existen
+            if tx.committed:
+                self._known_shifts |= created
+            for idx, record, _ in payload:
+                if record[2] in failed_shifts:
+                    self._record_error(idx, record[1], f"No se pudo registrar el turno {record[2]}")
+
+            failed = [(position, status) for position, status in enumerate(summary.statuses)
+                      if status not in (RowStatus.INSERTED, RowStatus.UPDATED, RowStatus.SKIPPED)]
+            with self._lock:
+                self._progress.written += summary.written
+                self._progress.duplicates += summary.count(RowStatus.SKIPPED)
+                self._progress.chunks += 1
+            for position, status in failed:
+                message = summary.messages.get(position, RowStatus(status).name.lower())
+                self._record_error(valid[position][0], records[position][1], message)
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+    def _load_reference_codes(self) -> None:
+        """Empleados y turnos existentes, leídos una vez desde el hilo de escritura."""
+        with self.attendance_service.db.transaction():
+            self._employee_codes = self.attendance_service.get_employee_codes()
+            if self._create_shift is not None:
+                self._known_shifts = self.attendance_service.get_shift_codes() or set()
+
+    def _create_missing_shifts(self, chunk: List[Tuple[int, Tuple[Any, ...], Optional[str]]]
+                               ) -> Tuple[Set[str], Set[str]]:
+        """Crea los turnos del bloque que no existen; retorna (creados, fallidos)."""
+        created: Set[str] = set()
+        failed: Set[str] = set()
+        if self._create_shift is None:
+            return created, failed
+        for _, record, turno_raw in chunk:
+            code = record[2]
+            if not code or code in self._known_shifts or code in created or code in failed:
+                continue
+            (created if self._create_shift(code, turno_raw) else failed).add(code)
+        return created, failed
+
+    def _put(self, item: Tuple[str, Any]) -> bool:
+        """Encola hacia la escritura; False si la importación se detuvo."""
+        while not self._stop.is_set():
+            try:
+                self._validated.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _drain_validated(self) -> None:
+        while True:
+            try:
+                self._validated.get_nowait()
+            except queue.Empty:
+                return
+
+    def _record_error(self, idx: int, codigo: Any, message: str) -> None:
+        with self._lock:
+            self._progress.errors += 1
+            if len(self._progress.error_samples) < MAX_ERROR_SAMPLES:
+                self._progress.error_samples.append(f"Fila {idx} ({codigo}): {message}")
@@ -27,6 +27,7 @@ from gui.reports_view import ReportsView
 from gui.import_view import ImportView
 from gui.styles import configure_styles, COLORS
 from gui.components import Sidebar, Header
+from gui.background import BackgroundExecutor
 
 class MainWindow:
     """
@@ -53,6 +54,7 @@ class MainWindow:
         self.attendance_service: Optional[AttendanceService] = None
         self.report_service: Optional[ReportService] = None
         self.reference_service: Optional[ReferenceService] = None
+        self.db_executor: Optional[BackgroundExecutor] = None
         
         # Interfaz
         self._init_ui()
@@ -99,7 +101,7 @@ class MainWindow:
             self.db_config = get_db_config()
             if self.db_connection:
                 try:
-                    self.db_connection.disconnect()
+                    self.db_connection.close()
                 except: pass
 
             self.db_connection = DatabaseConnection(self.db_config)
@@ -147,6 +149,9 @@ class MainWindow:
         self.attendance_service = None
         self.report_service = None
         self.reference_service = None
+        if self.db_executor:
+            self.db_executor.shutdown()
+            self.db_executor = None
 
     def _initialize_services(self):
         if not self.db_connection: return
@@ -154,6 +159,13 @@ class MainWindow:
         self.attendance_service = AttendanceService(self.db_connection)
         self.report_service = ReportService(self.db_connection)
         self.reference_service = ReferenceService(self.db_connection)
+        # Sin pool, la conexión directa no admite llamadas concurrentes
+        workers = self.db_connection.pool_size if self.db_connection.pool_enabled else 1
+        if self.db_executor:
+            self.db_executor.shutdown()
+        self.db_executor = BackgroundExecutor(self.root, max_workers=workers)
+        # Registro de eliminaciones de la sincronización incremental: purgar las antiguas
+        self.db_executor.submit(self.employee_service.purge_deleted_log, key='purge_deleted_log')
 
     def _refresh_current_view(self):
         if self.current_view_name == "employees": self._show_employees()
@@ -234,25 +246,28 @@ class MainWindow:
         self._clear_content()
         self.current_view_name = "employees"
         self.sidebar.set_active(1)
-        EmployeesView(self.content_area, self.employee_service, self.reference_service, self._show_employees).render()
+        EmployeesView(self.content_area, self.employee_service, self.reference_service, self._show_employees,
+                      executor=self.db_executor).render()
 
     def _show_attendance(self):
         self._clear_content()
         self.current_view_name = "attendance"
         self.sidebar.set_active(2)
-        AttendanceView(self.content_area, self.attendance_service, self.employee_service, self.reference_service).render()
+        AttendanceView(self.content_area, self.attendance_service, self.employee_service, self.reference_service,
+                       executor=self.db_executor).render()
 
     def _show_reports(self):
         self._clear_content()
         self.current_view_name = "reports"
         self.sidebar.set_active(3)
-        ReportsView(self.content_area, self.report_service, self.employee_service).render()
+        ReportsView(self.content_area, self.report_service, self.employee_service, executor=self.db_executor).render()
 
     def _import_data(self):
         self._clear_content()
         self.current_view_name = "import"
         self.sidebar.set_active(4)
-        ImportView(self.content_area, self.attendance_service, self.employee_service).render()
+        ImportView(self.content_area, self.attendance_service, self.employee_service,
+                   executor=self.db_executor).render()
 
     def _test_connection(self):
         ConnectionTestWindow(self.root, on_config_saved=self._on_config_saved)
@@ -263,8 +278,10 @@ class MainWindow:
 
     def _on_closing(self):
         if messagebox.askokcancel("Salir", "¿Desea cerrar el sistema?"):
+            if self.db_executor:
+                self.db_executor.shutdown()
             if self.db_connection:
-                try: self.db_connection.disconnect()
+                try: self.db_connection.close()
                 except: pass
             self.root.destroy()
 
@@ -23,6 +23,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.report_service import ReportService
 from database.employee_service import EmployeeService
+from gui.background import BackgroundExecutor, run_in_background
 
 
 class ReportsView:
@@ -30,7 +31,8 @@ class ReportsView:
     
     def __init__(self, parent_frame: tk.Frame,
                  report_service: Optional[ReportService],
-                 employee_service: Optional[EmployeeService]):
+                 employee_service: Optional[EmployeeService],
+                 executor: Optional[BackgroundExecutor] = None):
         """
         Inicializa la vista de reportes.
         
@@ -38,10 +40,12 @@ class ReportsView:
             parent_frame: Frame contenedor principal
             report_service: Servicio de reportes
             employee_service: Servicio de empleados
+            executor: Ejecutor para consultar la BD sin bloquear la interfaz
         """
         self.parent_frame = parent_frame
         self.report_service = report_service
         self.employee_service = employee_service
+        self.executor = executor
         
     def render(self):
         """Renderiza la vista completa de reportes"""
@@ -236,14 +240,44 @@ class ReportsView:
         fecha_fin = self.fecha_fin_entry.get().strip()
         tipo = self.tipo_reporte.get()
         
+        report_service = self.report_service
+        if tipo == "empleado":
+            empleado = self.empleado_combo.get()
+            codigo_emp = None if empleado == "Todos" else empleado.split(' - ')[0]
+            fetch = lambda: report_service.get_overtime_by_employee(fecha_inicio, fecha_fin, codigo_emp)
+        else:
+            fetch = lambda: report_service.get_overtime_by_cost_center(fecha_inicio, fecha_fin)
+
+        loading_label = tk.Label(
+            self.results_container,
+            text="⏳ Generando reporte...",
+            font=('Segoe UI', 12),
+            bg='#f5f5f5',
+            fg='#546e7a'
+        )
+        loading_label.pack(pady=50)
+
+        def on_error(exc):
+            if loading_label.winfo_exists():
+                loading_label.destroy()
+            messagebox.showerror("Error", f"Error al generar reporte:\n{str(exc)}")
+
+        run_in_background(
+            self.results_container,
+            self.executor,
+            fetch,
+            on_success=lambda data: self._show_report_data(data, tipo, loading_label),
+            on_error=on_error,
+            key='report',
+        )
+
+    def _show_report_data(self, data, tipo, loading_label):
+        """Muestra el reporte una vez que llegan los datos"""
+        if not self.results_container.winfo_exists():
+            return
+        loading_label.destroy()
+
         try:
-            if tipo == "empleado":
-                empleado = self.empleado_combo.get()
-                codigo_emp = None if empleado == "Todos" else empleado.split(' - ')[0]
-                data = self.report_service.get_overtime_by_employee(fecha_inicio, fecha_fin, codigo_emp)
-            else:
-                data = self.report_service.get_overtime_by_cost_center(fecha_inicio, fecha_fin)
-            
             if not data:
                 tk.Label(
                     self.results_container,
@@ -9,6 +9,7 @@ Descripción: Punto de entrada principal del aplicativo.
 
 import sys
 import os
+import multiprocessing
 
 # Agregar el directorio actual al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -38,4 +39,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos de la
+    # importación de varios archivos (ProcessPoolExecutor)
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,19 @@
+"""Configuración común de las pruebas: raíz del proyecto en sys.path."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_db():
+    """DatabaseConnection sobre el backend SQLite en memoria, con datos de ejemplo."""
+    from database.database import DatabaseConnection
+
+    db = DatabaseConnection({'backend': 'sqlite', 'sqlite_path': ':memory:', 'slow_query_log': ''})
+    db.backend.populate(20, 30)
+    yield db
+    db.close()
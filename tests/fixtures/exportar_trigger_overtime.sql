@@ -0,0 +1,38 @@
+-- Exporta las horas extras que calcula el trigger del servidor para un
+-- conjunto de casos de prueba, sin dejar cambios (la transacción se revierte).
+-- Uso (salida separada por tabuladores con encabezado):
+--   mysql -B -u <usuario> -p sobretiempos < tests/fixtures/exportar_trigger_overtime.sql \
+--       > tests/fixtures/trigger_overtime.tsv
+-- Requiere los turnos M01 (07:00-15:00), T01 (15:00-23:00) y N01 (22:00-06:00)
+-- y al menos un empleado. Las fechas de 2099 no chocan con datos reales.
+
+START TRANSACTION;
+
+SELECT codigo INTO @empleado FROM empleados ORDER BY codigo LIMIT 1;
+
+INSERT INTO reporte_asistencia (fecha, codigo_empleado, codigo_turno, dia, marca_entrada, marca_salida) VALUES
+    ('2099-01-05', @empleado, 'M01', 'Lunes', '07:00:00', '15:00:00'),
+    ('2099-01-06', @empleado, 'M01', 'Martes', '07:00:00', '16:30:00'),
+    ('2099-01-07', @empleado, 'M01', 'Miércoles', '06:45:00', '19:10:00'),
+    ('2099-01-08', @empleado, 'M01', 'Jueves', '07:00:00', NULL),
+    ('2099-01-09', @empleado, 'M01', 'Viernes', '08:00:00', '14:00:00'),
+    ('2099-01-04', @empleado, 'M01', 'Domingo', '07:00:00', '15:20:00'),
+    ('2099-01-11', @empleado, 'M01', '', '07:00:00', '15:00:00'),
+    ('2099-01-12', @empleado, 'N01', 'Lunes', '22:00:00', '07:30:00'),
+    ('2099-01-13', @empleado, 'N01', 'Martes', '21:00:00', '09:00:00'),
+    ('2099-01-14', @empleado, 'T01', 'Miércoles', '15:00:00', '23:59:59'),
+    ('2099-01-15', @empleado, 'T01', 'Jueves', '14:59:31', '23:00:50'),
+    ('2099-01-16', @empleado, 'M01', 'Viernes', '07:00:00', '09:00:18'),
+    ('2099-01-17', @empleado, 'M01', 'Sábado', '07:00:00', '17:00:00'),
+    ('2099-01-18', @empleado, 'N01', 'Domingo', '22:00:00', '06:00:00'),
+    ('2099-01-19', @empleado, 'M01', 'Lunes', '23:00:00', '07:00:00'),
+    ('2099-01-20', @empleado, 'M01', 'Martes', '07:00:00', '07:00:00');
+
+SELECT ra.fecha, ra.dia, t.hora_entrada AS turno_entrada, t.hora_salida AS turno_salida,
+       ra.marca_entrada, ra.marca_salida, ra.h25, ra.h35, ra.h100
+FROM reporte_asistencia ra
+JOIN turnos t ON t.codigo_turno = ra.codigo_turno
+WHERE ra.codigo_empleado = @empleado AND ra.fecha BETWEEN '2099-01-01' AND '2099-01-31'
+ORDER BY ra.fecha;
+
+ROLLBACK;
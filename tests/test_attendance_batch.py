@@ -0,0 +1,25 @@
+"""Lote columnar de asistencias: carga por columnas frente a carga por filas."""
+
+from database.attendance_batch import AttendanceBatch
+from database.row_format import ColumnBatch, RowFormat
+
+
+def test_extend_columns_matches_rows(sqlite_db):
+    success, _, rows = sqlite_db.execute_procedure("sp_filtrar_asistencias", (None, None, None, None))
+    assert success and rows
+    batch = AttendanceBatch()
+    for columns in sqlite_db.iter_procedure("sp_filtrar_asistencias", (None, None, None, None),
+                                            batch_size=97, row_format=RowFormat.COLUMNS):
+        batch.extend_columns(columns)
+
+    assert batch.to_dicts() == AttendanceBatch.from_rows(rows).to_dicts()
+
+
+def test_extend_columns_fills_missing_columns():
+    batch = AttendanceBatch()
+    batch.extend_columns(ColumnBatch(('codigo_empleado', 'h25'), [['E00001', 'E00002'], [1.5, None]]))
+
+    assert batch.column('codigo_empleado') == ['E00001', 'E00002']
+    assert batch.column('h25') == [1.5, 0.0]
+    assert batch.column('marca_entrada') == [None, None]
+    assert batch.column('fecha_asistencia') == [None, None]
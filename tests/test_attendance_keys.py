@@ -0,0 +1,46 @@
+"""Conjunto compacto de claves (fecha, codigo_empleado)."""
+
+from datetime import date, datetime
+
+from database.attendance_keys import AttendanceKeySet, date_ordinal
+
+
+def test_date_ordinal_accepts_dates_datetimes_and_text():
+    ordinal = date(2025, 3, 15).toordinal()
+    assert date_ordinal(date(2025, 3, 15)) == ordinal
+    assert date_ordinal(datetime(2025, 3, 15, 7, 30)) == ordinal
+    assert date_ordinal('2025-03-15') == ordinal
+    assert date_ordinal('2025-03-15 07:30:00') == ordinal
+    assert date_ordinal('15/03/2025') is None
+    assert date_ordinal(None) is None
+
+
+def test_keys_match_regardless_of_date_type():
+    keys = AttendanceKeySet([('2025-03-15', 'E00001'), (date(2025, 3, 16), 'E00002')])
+    assert len(keys) == 2
+    assert keys.contains(date(2025, 3, 15), 'E00001')
+    assert ('2025-03-16', 'E00002') in keys
+    assert (datetime(2025, 3, 15, 8, 0), 'E00001') in keys
+    assert ('2025-03-15', 'E00002') not in keys
+    assert ('2025-03-17', 'E00001') not in keys
+
+
+def test_add_reports_duplicates_and_invalid_dates():
+    keys = AttendanceKeySet()
+    assert keys.add('2025-03-15', 'E00001')
+    assert not keys.add(date(2025, 3, 15), 'E00001')
+    assert not keys.add('fecha', 'E00001')
+    assert len(keys) == 1
+
+
+def test_unknown_code_is_not_registered_by_lookups():
+    keys = AttendanceKeySet([('2025-03-15', 'E00001')])
+    assert ('2025-03-15', 'E99999') not in keys
+    assert keys.pack('2025-03-15', 'E99999') is None
+    assert keys.add('2025-03-15', 'E99999')
+    assert len(keys) == 2
+
+
+def test_iteration_returns_original_keys():
+    pairs = {('2025-03-15', 'E00001'), ('2025-03-15', 'E00002'), ('2024-12-31', 'E00001')}
+    assert set(AttendanceKeySet(pairs)) == pairs
@@ -0,0 +1,56 @@
+"""Paginación por clave del listado de asistencias sobre el backend SQLite."""
+
+import pytest
+
+from database.attendance_service import AttendanceService
+from database.row_format import RowFormat
+
+
+def _keys(db, where="", params=()):
+    success, _, rows = db.execute_query(
+        f"SELECT fecha, codigo_empleado FROM reporte_asistencia {where}", params,
+        row_format=RowFormat.TUPLE, use_cache=False,
+    )
+    assert success
+    return [(str(fecha), codigo) for fecha, codigo in rows]
+
+
+def _date_range(db):
+    keys = _keys(db)
+    return min(key[0] for key in keys), max(key[0] for key in keys)
+
+
+def _read_all_pages(service, page_size, **filters):
+    keys, token, pages = [], None, 0
+    while True:
+        page = service.get_attendance_page(page_size=page_size, token=token, **filters)
+        assert page is not None
+        keys.extend((str(row['fecha_asistencia']), row['codigo_empleado']) for row in page.rows)
+        pages += 1
+        token = page.next_token
+        if token is None:
+            return keys, pages
+
+
+# -------------------------------------------------------------------------
+# Paginación por clave
+# -------------------------------------------------------------------------
+
+@pytest.mark.parametrize('page_size', [1, 37, 600, 1000])
+def test_keyset_pages_have_no_gaps_or_duplicates(sqlite_db, page_size):
+    service = AttendanceService(sqlite_db)
+    keys, pages = _read_all_pages(service, page_size)
+
+    expected = sorted(_keys(sqlite_db), reverse=True)  # Clave (fecha, código) descendente
+    assert keys == expected
+    assert pages == max(1, -(-len(expected) // page_size))
+
+
+def test_keyset_pages_follow_filters(sqlite_db):
+    service = AttendanceService(sqlite_db)
+    fecha_inicio, fecha_fin = _date_range(sqlite_db)
+    keys, _ = _read_all_pages(service, 25, search_term='Empleado 1', fecha_fin=fecha_fin)
+
+    filtered = service.filter_attendance('Empleado 1', fecha_inicio, fecha_fin)
+    assert len(keys) == len(set(keys)) == len(filtered)
+    assert set(keys) == {(str(row['fecha_asistencia']), row['codigo_empleado']) for row in filtered}
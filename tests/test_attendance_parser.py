@@ -0,0 +1,51 @@
+"""Lectura de reportes: conversión por bloques de texto frente a la lectura fila por fila."""
+
+import pytest
+
+from gui.attendance_parser import (
+    ImportStats, find_column_indexes, iter_attendance_rows, iter_delimited_rows,
+)
+
+HEADER = ['Codigo', 'Fecha', 'Turno', 'Entrada', 'Salida']
+
+ROWS = [
+    ['E00001', '15/03/2025', 'M01 07:00-15:00', '07:02', '15:10'],
+    ['E00001', '16/03/2025', 'M01 07:00-15:00', '07:00', ''],
+    ['E00001', '17/03/2025', '', '-', '15:00'],
+    ['E00002', '17/03/2025', 'T01', '-', '-'],                       # Sin marcas
+    ['E00002', '2025-03-18', 'TURNO_NOCHE_LARGO 22:00', '10:00 pm', '6:00 am'],
+    ['E00002', 'fecha', 'M01', '07:00', '15:00'],                   # Fecha inválida
+    ['', '19/03/2025', 'M01', '07:00', '15:00'],                    # Sin código
+    ['E00003', '', 'M01', '07:00', '15:00'],                        # Sin fecha
+    [' E00003 ', '45736', 'N01', '0.9166666667', '0.25'],            # Números de serie en texto
+    ['E00003', '21/03/2025', 'M02', '7h00', '15:00'],               # Marca no reconocida
+    ['E00004', '22/03/2025', 'M01', '07:00'],                       # Fila corta
+    ['E00004', '23/03/2025', 'M01', '07:00', '15:00:00', 'extra'],
+]
+
+
+def _read(reader, rows, headers_map, codigo_header=None, **kwargs):
+    stats = ImportStats()
+    parsed = list(reader(rows, 2, headers_map, codigo_header, stats, **kwargs))
+    return parsed, (stats.rows, stats.skipped, stats.errors, stats.codes)
+
+
+@pytest.mark.parametrize('block_size', [1, 4, 1000])
+def test_delimited_rows_match_row_by_row_reader(block_size):
+    headers_map, start_row = find_column_indexes([HEADER] + ROWS)
+    assert start_row == 1
+    rows = ROWS * 3
+
+    expected = _read(iter_attendance_rows, rows, headers_map)
+    assert _read(iter_delimited_rows, rows, headers_map, block_size=block_size) == expected
+    assert len(expected[0]) == 8 * 3
+
+
+def test_delimited_rows_use_header_code_without_code_column():
+    headers_map, _ = find_column_indexes([HEADER[1:]] + [row[1:] for row in ROWS])
+    assert headers_map['codigo'] is None
+    rows = [row[1:] for row in ROWS]
+
+    expected = _read(iter_attendance_rows, rows, headers_map, 'E00009')
+    assert _read(iter_delimited_rows, rows, headers_map, 'E00009', block_size=5) == expected
+    assert {record[1] for _, record, _ in expected[0]} == {'E00009'}
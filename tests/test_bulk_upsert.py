@@ -0,0 +1,95 @@
+"""Carga masiva de asistencias (bulk_upsert_attendance) sobre el backend SQLite."""
+
+import pytest
+
+from database.attendance_service import AttendanceService
+from database.batch_result import RowStatus
+from database.row_format import RowFormat
+
+
+def _keys(db, where="", params=()):
+    success, _, rows = db.execute_query(
+        f"SELECT fecha, codigo_empleado FROM reporte_asistencia {where}", params,
+        row_format=RowFormat.TUPLE, use_cache=False,
+    )
+    assert success
+    return [(str(fecha), codigo) for fecha, codigo in rows]
+
+
+def _upsert_records(db):
+    fecha, codigo = _keys(db, "ORDER BY fecha, codigo_empleado LIMIT 1")[0]
+    return [
+        (fecha, codigo, 'T01', 'Lunes', '15:00:00', '23:30:00'),           # Ya existe
+        ('2001-01-01', codigo, 'M01', 'Lunes', '07:00:00', '15:00:00'),    # Nueva
+        ('2001-01-01', 'X99999', 'M01', 'Lunes', '07:00:00', '15:00:00'),  # Empleado inexistente
+        ('2001-01-02', codigo, '', 'Martes', '07:00:00', '15:00:00'),      # Sin turno
+        ('2001-01-01', codigo, 'M01', 'Lunes', '07:05:00', '15:00:00'),    # Repetida en la carga
+    ]
+
+
+def _stored(db, fecha, codigo):
+    success, _, rows = db.execute_query(
+        "SELECT codigo_turno, marca_salida FROM reporte_asistencia WHERE fecha = %s AND codigo_empleado = %s",
+        (fecha, codigo), use_cache=False,
+    )
+    assert success and len(rows) == 1
+    return rows[0]['codigo_turno'], str(rows[0]['marca_salida'])
+
+
+def test_bulk_upsert_skip_keeps_existing_rows(sqlite_db):
+    records = _upsert_records(sqlite_db)
+    before = _stored(sqlite_db, *records[0][:2])
+    summary = AttendanceService(sqlite_db).bulk_upsert_attendance(records, on_conflict='skip', chunk_size=2)
+
+    assert [summary.status(i) for i in range(len(records))] == [
+        RowStatus.SKIPPED, RowStatus.INSERTED, RowStatus.INVALID, RowStatus.INVALID, RowStatus.SKIPPED,
+    ]
+    assert _stored(sqlite_db, *records[0][:2]) == before
+    assert _stored(sqlite_db, '2001-01-01', records[1][1]) == ('M01', '15:00:00')
+
+
+def test_bulk_upsert_update_replaces_existing_rows(sqlite_db):
+    records = _upsert_records(sqlite_db)
+    total = len(_keys(sqlite_db))
+    summary = AttendanceService(sqlite_db).bulk_upsert_attendance(records, on_conflict='update')
+
+    assert [summary.status(i) for i in range(len(records))] == [
+        RowStatus.UPDATED, RowStatus.SKIPPED, RowStatus.INVALID, RowStatus.INVALID, RowStatus.INSERTED,
+    ]
+    assert _stored(sqlite_db, *records[0][:2]) == ('T01', '23:30:00')
+    assert len(_keys(sqlite_db)) == total + 1
+
+
+def test_bulk_upsert_error_reports_duplicates(sqlite_db):
+    records = _upsert_records(sqlite_db)
+    summary = AttendanceService(sqlite_db).bulk_upsert_attendance(records, on_conflict='error')
+
+    assert [summary.status(i) for i in range(len(records))] == [
+        RowStatus.DUPLICATE, RowStatus.INSERTED, RowStatus.INVALID, RowStatus.INVALID, RowStatus.DUPLICATE,
+    ]
+    assert not summary.ok
+    assert set(summary.messages) == {0, 2, 3, 4}
+
+
+def test_bulk_upsert_rejects_unknown_mode(sqlite_db):
+    with pytest.raises(ValueError):
+        AttendanceService(sqlite_db).bulk_upsert_attendance([], on_conflict='merge')
+
+
+def test_bulk_upsert_marks_rows_failed_when_prefetch_fails(sqlite_db, monkeypatch):
+    service = AttendanceService(sqlite_db)
+    records = _upsert_records(sqlite_db)
+    total = len(_keys(sqlite_db))
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("conexión perdida")
+
+    # La consulta de claves existentes de prefetch_attendance_keys falla
+    monkeypatch.setattr(sqlite_db, 'iter_query', fail)
+    summary = service.bulk_upsert_attendance(records, on_conflict='update')
+
+    assert [summary.status(i) for i in range(len(records))] == [
+        RowStatus.FAILED, RowStatus.SKIPPED, RowStatus.INVALID, RowStatus.INVALID, RowStatus.FAILED,
+    ]
+    assert 'conexión perdida' in summary.messages[0]
+    assert len(_keys(sqlite_db)) == total
@@ -0,0 +1,52 @@
+"""Sincronización incremental de empleados: centros de coste, retención y purga."""
+
+from database.change_sync import retention_cutoff
+from database.employee_service import EmployeeService
+
+_OLD_STAMP = '2020-01-01 00:00:00.000'
+
+
+def _backdate(db):
+    # Marcas antiguas para que el solapamiento no devuelva todas las filas
+    db.execute_update("UPDATE empleados SET actualizado_en = %s", (_OLD_STAMP,))
+    db.execute_update("UPDATE centros_coste SET actualizado_en = %s", (_OLD_STAMP,))
+
+
+def test_cost_center_rename_reaches_replica(sqlite_db):
+    _backdate(sqlite_db)
+    service = EmployeeService(sqlite_db)
+    service.replica.refresh()
+    service.replica.watermark = retention_cutoff(0)  # Réplica al día, dentro de la retención
+
+    employee = next(row for row in service.get_all_employees() if row['codigo_centro_coste'])
+    codigo_cc = employee['codigo_centro_coste']
+    sqlite_db.execute_update("UPDATE centros_coste SET nombre = %s WHERE codigo = %s", ('Renombrado', codigo_cc))
+
+    rows = service.get_all_employees_synced()
+    changed = [row for row in rows if row['codigo_centro_coste'] == codigo_cc]
+    assert changed and all(row['centro_coste'] == 'Renombrado' for row in changed)
+    assert service.replica.last_changes == len(changed)
+
+
+def test_watermark_older_than_retention_reloads_table(sqlite_db):
+    service = EmployeeService(sqlite_db)
+    total = len(service.get_all_employees_synced())
+    service.replica.watermark = _OLD_STAMP
+
+    assert len(service.get_all_employees_synced()) == total
+    assert service.replica.last_changes == total
+
+
+def test_purge_deleted_log_keeps_recent_tombstones(sqlite_db):
+    sqlite_db.execute_insert(
+        "INSERT INTO registro_eliminaciones (tabla, codigo, fecha, eliminado_en) VALUES (%s, %s, NULL, %s)",
+        ('empleados', 'E99999', _OLD_STAMP),
+    )
+    sqlite_db.execute_insert(
+        "INSERT INTO registro_eliminaciones (tabla, codigo, fecha) VALUES (%s, %s, NULL)", ('empleados', 'E99998'),
+    )
+    service = EmployeeService(sqlite_db)
+
+    assert service.purge_deleted_log() == 1
+    success, _, rows = sqlite_db.execute_query("SELECT codigo FROM registro_eliminaciones")
+    assert success and [row['codigo'] for row in rows] == ['E99998']
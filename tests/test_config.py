@@ -0,0 +1,24 @@
+"""Normalización de db_config.json."""
+
+import pytest
+
+from config.config import DEFAULT_DB_CONFIG, _normalize_config
+
+
+@pytest.mark.parametrize('value, expected', [
+    (True, True), (False, False), (1, True), (0, False),
+    ('true', True), ('TRUE', True), ('1', True), ('yes', True), ('si', True), ('Sí', True),
+    ('false', False), ('False', False), ('0', False), ('no', False), (' no ', False),
+])
+def test_boolean_settings_parse_explicit_values(value, expected):
+    config = _normalize_config({key: value for key in ('pool_enabled', 'cache_enabled', 'local_infile')})
+    assert config['pool_enabled'] is expected
+    assert config['cache_enabled'] is expected
+    assert config['local_infile'] is expected
+
+
+@pytest.mark.parametrize('value', ['', 'off?', 'verdadero', 2, None, [], {}])
+def test_unrecognized_boolean_keeps_default(value):
+    config = _normalize_config({'pool_enabled': value, 'local_infile': value})
+    assert config['pool_enabled'] is DEFAULT_DB_CONFIG['pool_enabled']
+    assert config['local_infile'] is DEFAULT_DB_CONFIG['local_infile']
@@ -0,0 +1,61 @@
+"""Analizadores de fecha y hora por columna frente a la conversión con strptime."""
+
+from datetime import date, datetime, time
+
+import pytest
+
+from gui.datetime_parsing import (
+    DateColumnParser, EMPTY_TIME_VALUES, TimeColumnParser, strptime_date, strptime_time,
+)
+
+DATE_TEXTS = [
+    '15/03/2025', '1/3/2025', '2025-03-15', '2025-3-1', '15-03-2025', '2025/03/15',
+    ' 15/03/2025 ', '29/02/2024', '29/02/2025', '31/04/2025', '2025-13-01', '00/01/2025',
+    '15.03.2025', 'fecha', '', 'Lunes 15/03/2025',
+]
+
+TIME_TEXTS = [
+    '07:00', '7:00', '07:00:00', '23:59:59', '00:00', '7:5', '07:05:9',
+    '24:00', '07:60', '07:00:60', '25:00',
+    '2:30 pm', '02:30 PM', '2:30PM', '12:00 am', '12:00 pm', '02:30:15 PM', '13:00 pm', '0:30 am',
+    '-', '', 'None', 'nan', ' 07:00 ', 'sin marca', '7', '7h00',
+]
+
+
+def _legacy_time(value):
+    text = str(value).strip()
+    return None if text in EMPTY_TIME_VALUES else strptime_time(text)
+
+
+@pytest.mark.parametrize('text', DATE_TEXTS)
+def test_date_parser_matches_strptime(text):
+    assert DateColumnParser(memo_size=0).convert(text) == strptime_date(text)
+
+
+@pytest.mark.parametrize('text', TIME_TEXTS)
+def test_time_parser_matches_strptime(text):
+    assert TimeColumnParser(memo_size=0).convert(text) == _legacy_time(text)
+
+
+def test_locked_format_does_not_change_results():
+    # La columna fija el primer formato reconocido; los demás siguen funcionando
+    dates, times = DateColumnParser(), TimeColumnParser()
+    for text in ['2025/03/15'] + DATE_TEXTS * 2:
+        assert dates.parse(text) == strptime_date(text)
+    for text in ['2:30 pm'] + TIME_TEXTS * 2:
+        assert times.parse(text) == _legacy_time(text)
+
+
+def test_native_and_excel_values():
+    dates, times = DateColumnParser(), TimeColumnParser()
+    assert dates.parse(datetime(2025, 3, 15, 7, 0)) == ('2025-03-15', 'Sábado')
+    assert dates.parse(date(2025, 3, 17)) == ('2025-03-17', 'Lunes')
+    assert dates.parse(45731) == ('2025-03-15', 'Sábado')
+    assert dates.parse('45731') == ('2025-03-15', 'Sábado')
+    assert dates.parse(3.5) == (None, '')
+    assert times.parse(time(7, 30)) == '07:30:00'
+    assert times.parse(datetime(2025, 3, 15, 22, 5, 9)) == '22:05:09'
+    assert times.parse(0.3125) == '07:30:00'
+    assert times.parse('.75') == '18:00:00'
+    assert times.parse(None) is None
+    assert times.parse(float('nan')) is None
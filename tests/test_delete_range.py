@@ -0,0 +1,58 @@
+"""Eliminación de asistencias por rango de fechas sobre el backend SQLite."""
+
+from database.attendance_service import AttendanceService
+from database.row_format import RowFormat
+
+
+def _keys(db, where="", params=()):
+    success, _, rows = db.execute_query(
+        f"SELECT fecha, codigo_empleado FROM reporte_asistencia {where}", params,
+        row_format=RowFormat.TUPLE, use_cache=False,
+    )
+    assert success
+    return [(str(fecha), codigo) for fecha, codigo in rows]
+
+
+def _date_range(db):
+    keys = _keys(db)
+    return min(key[0] for key in keys), max(key[0] for key in keys)
+
+
+def test_delete_range_preview_counts_without_deleting(sqlite_db):
+    service = AttendanceService(sqlite_db)
+    fecha_inicio, fecha_fin = _date_range(sqlite_db)
+    total = len(_keys(sqlite_db))
+
+    summary = service.delete_attendance_range(fecha_inicio, fecha_fin, preview=True)
+    assert summary.preview and summary.matched == total and summary.deleted == 0
+    assert len(_keys(sqlite_db)) == total
+
+    by_code = service.delete_attendance_range(fecha_inicio, fecha_fin, ['E00001', 'E00002'], preview=True)
+    by_name = service.delete_attendance_range(fecha_inicio, fecha_fin, preview=True, search_term='Empleado 1')
+    assert by_code.matched == len(_keys(sqlite_db, "WHERE codigo_empleado IN ('E00001', 'E00002')"))
+    assert by_name.matched == len(service.filter_attendance('Empleado 1', fecha_inicio, fecha_fin))
+
+
+def test_delete_range_deletes_in_chunks(sqlite_db):
+    service = AttendanceService(sqlite_db)
+    fecha_inicio, fecha_fin = _date_range(sqlite_db)
+    codes = ('E00003', 'E00004')
+    kept = _keys(sqlite_db, "WHERE codigo_empleado NOT IN (%s, %s)", codes)
+    expected = len(_keys(sqlite_db, "WHERE codigo_empleado IN (%s, %s)", codes))
+    calls = []
+
+    summary = service.delete_attendance_range(fecha_inicio, fecha_fin, list(codes), chunk_size=7,
+                                              progress=lambda done, total: calls.append((done, total)))
+
+    assert summary.error is None
+    assert summary.deleted == summary.matched == expected
+    assert summary.chunks == -(-summary.matched // 7)
+    assert calls[0] == (0, summary.matched)
+    assert calls[-1] == (summary.matched, summary.matched)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+    assert _keys(sqlite_db) == kept
+
+
+def test_delete_range_requires_both_dates(sqlite_db):
+    summary = AttendanceService(sqlite_db).delete_attendance_range('', '2026-01-31')
+    assert summary.error and summary.deleted == 0
@@ -0,0 +1,59 @@
+"""
+Regla de horas extras de database/overtime.py frente al trigger del servidor.
+
+Los valores esperados salen del trigger real de MySQL, exportados con
+tests/fixtures/exportar_trigger_overtime.sql a trigger_overtime.tsv. Mientras
+el archivo no tenga filas la prueba se omite: comparar con el backend SQLite
+no sirve, porque este usa la misma regla.
+"""
+
+import csv
+import os
+
+import pytest
+
+from database.overtime import compute_overtime, overtime_hours
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'trigger_overtime.tsv')
+
+
+def _value(raw):
+    return None if raw in ('', 'NULL') else raw
+
+
+def _load_cases():
+    with open(FIXTURE, encoding='utf-8', newline='') as handle:
+        return [{key: _value(value) for key, value in row.items()}
+                for row in csv.DictReader(handle, delimiter='\t')]
+
+
+CASES = _load_cases()
+
+pytestmark = pytest.mark.skipif(
+    not CASES, reason="Sin valores del trigger real: ejecutar tests/fixtures/exportar_trigger_overtime.sql"
+)
+
+
+def _expected(case):
+    return tuple(round(float(case[name]), 2) for name in ('h25', 'h35', 'h100'))
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['fecha'] for case in CASES])
+def test_overtime_hours_matches_trigger(case):
+    result = overtime_hours(case['dia'], case['turno_entrada'], case['turno_salida'],
+                            case['marca_entrada'], case['marca_salida'], fecha=case['fecha'])
+    assert result == _expected(case)
+
+
+@pytest.mark.parametrize('use_numpy', [False, None])
+def test_compute_overtime_matches_trigger(use_numpy):
+    batch = compute_overtime(
+        [case['turno_entrada'] for case in CASES],
+        [case['turno_salida'] for case in CASES],
+        [case['marca_entrada'] for case in CASES],
+        [case['marca_salida'] for case in CASES],
+        dias=[case['dia'] for case in CASES],
+        fechas=[case['fecha'] for case in CASES],
+        use_numpy=use_numpy,
+    )
+    assert [batch.row(index) for index in range(len(CASES))] == [_expected(case) for case in CASES]
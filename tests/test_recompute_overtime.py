@@ -0,0 +1,54 @@
+"""Recálculo de horas extras de un turno sobre el backend SQLite."""
+
+from database.attendance_service import AttendanceService
+from database.row_format import RowFormat
+
+
+def _count(db, query, params=()):
+    success, _, rows = db.execute_query(query, params, row_format=RowFormat.TUPLE, use_cache=False)
+    assert success
+    return rows[0][0]
+
+
+def _tombstones(db):
+    return _count(db, "SELECT COUNT(*) FROM registro_eliminaciones WHERE tabla = 'reporte_asistencia'")
+
+
+def test_recompute_applies_new_shift_hours(sqlite_db):
+    shift_rows = _count(sqlite_db, "SELECT COUNT(*) FROM reporte_asistencia WHERE codigo_turno = 'M01'")
+    before = _count(sqlite_db, "SELECT SUM(h25 + h35 + h100) FROM reporte_asistencia WHERE codigo_turno = 'M01'")
+    sqlite_db.execute_update("UPDATE turnos SET hora_salida = %s WHERE codigo_turno = 'M01'", ('13:00:00',))
+    calls = []
+
+    summary = AttendanceService(sqlite_db).recompute_overtime_for_shift(
+        'M01', batch_size=7, progress=lambda done, total: calls.append((done, total)))
+
+    assert summary.total == summary.scanned == summary.updated == shift_rows > 0
+    assert summary.failed == 0 and not summary.errors
+    assert calls[-1] == (shift_rows, shift_rows)
+    after = _count(sqlite_db, "SELECT SUM(h25 + h35 + h100) FROM reporte_asistencia WHERE codigo_turno = 'M01'")
+    assert after > before
+
+
+def test_recompute_leaves_no_tombstones(sqlite_db):
+    service = AttendanceService(sqlite_db)
+    total = _count(sqlite_db, "SELECT COUNT(*) FROM reporte_asistencia")
+    baseline = service.changes_since(None)
+
+    service.recompute_overtime_for_shift('M01', batch_size=50)
+
+    assert _tombstones(sqlite_db) == 0
+    changes = service.changes_since(baseline.watermark)
+    assert changes.deleted == []
+    assert _count(sqlite_db, "SELECT COUNT(*) FROM reporte_asistencia") == total
+
+
+def test_real_deletes_still_leave_tombstones(sqlite_db):
+    service = AttendanceService(sqlite_db)
+    fecha, codigo = sqlite_db.execute_query(
+        "SELECT fecha, codigo_empleado FROM reporte_asistencia LIMIT 1", row_format=RowFormat.TUPLE, use_cache=False
+    )[2][0]
+    baseline = service.changes_since(None)
+
+    assert service.delete_attendance(fecha, codigo).ok
+    assert [key for key, _ in service.changes_since(baseline.watermark).deleted] == [(str(fecha), codigo)]
@@ -0,0 +1,71 @@
+"""Caché de lecturas: invalidación por etiquetas y lecturas concurrentes con escrituras."""
+
+import threading
+
+from database.result_cache import ResultCache
+
+
+def test_invalidate_removes_tagged_entries():
+    cache = ResultCache()
+    cache.put('a', 1, 10, {'asistencias'})
+    cache.put('b', 2, 10, {'empleados'})
+    assert cache.invalidate({'asistencias'}) == 1
+    assert cache.get('a') == (False, None)
+    assert cache.get('b') == (True, 2)
+
+
+def test_put_skips_result_read_before_invalidation():
+    cache = ResultCache()
+    generation = cache.generation({'asistencias'})
+    cache.invalidate({'asistencias'})  # Escritura confirmada mientras la lectura corría
+    cache.put('a', 'viejo', 10, {'asistencias'}, generation=generation)
+    assert cache.get('a') == (False, None)
+    assert cache.stats()['stale'] == 1
+
+
+def test_put_keeps_result_when_other_tags_change():
+    cache = ResultCache()
+    generation = cache.generation({'asistencias'})
+    cache.invalidate({'empleados'})
+    cache.put('a', 'vigente', 10, {'asistencias'}, generation=generation)
+    assert cache.get('a') == (True, 'vigente')
+
+
+def test_put_skips_result_read_before_clear():
+    cache = ResultCache()
+    generation = cache.generation({'asistencias'})
+    cache.clear()
+    cache.put('a', 'viejo', 10, {'asistencias'}, generation=generation)
+    assert cache.get('a') == (False, None)
+
+
+def test_cached_read_racing_a_commit_is_not_stored(sqlite_db):
+    from database.row_format import RowFormat
+
+    query = "SELECT COUNT(*) FROM reporte_asistencia"
+    read_started = threading.Event()
+    write_done = threading.Event()
+    original = sqlite_db._execute_query_once
+
+    def slow_read(*args, **kwargs):
+        result = original(*args, **kwargs)
+        if threading.current_thread().name == 'lector':
+            read_started.set()
+            write_done.wait(5)
+        return result
+
+    sqlite_db._execute_query_once = slow_read
+    before = {}
+
+    def reader():
+        before['rows'] = sqlite_db.execute_query(query, row_format=RowFormat.TUPLE)[2]
+
+    thread = threading.Thread(target=reader, name='lector')
+    thread.start()
+    read_started.wait(5)
+    sqlite_db.execute_delete("DELETE FROM reporte_asistencia WHERE codigo_empleado = %s", ('E00001',))
+    write_done.set()
+    thread.join()
+
+    after = sqlite_db.execute_query(query, row_format=RowFormat.TUPLE)[2]
+    assert after[0][0] < before['rows'][0][0]